@@ -0,0 +1,159 @@
+"""
+Page fixtures for the offline benchmarks.
+
+A recorded page in benchmarks/fixtures/<page_type>.html is used when present.
+Otherwise a synthetic page is generated with the markup the scraper reads,
+wrapped in enough site chrome (navigation, SVG icons, embedded JSON payload)
+to be roughly the size of the real github.com page.
+"""
+import json
+import os
+from typing import Dict, Callable
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+_ICON = '<svg aria-hidden="true" height="16" viewBox="0 0 16 16" width="16" class="octicon"><path d="M8 .25a.75.75 0 0 1 .673.418l1.882 3.815 4.21.612a.75.75 0 0 1 .416 1.279l-3.046 2.97.719 4.192a.751.751 0 0 1-1.088.791L8 12.347l-3.766 1.98a.75.75 0 0 1-1.088-.79l.72-4.194L.818 6.374a.75.75 0 0 1 .416-1.28l4.21-.611L7.327.668A.75.75 0 0 1 8 .25Z"></path></svg>'
+
+def _chrome(body: str, payload_items: int = 400) -> str:
+    nav = ''.join(
+        f'<li class="HeaderMenu-item"><a class="HeaderMenu-link" href="/features/{i}">{_ICON}<span>Feature {i}</span></a></li>'
+        for i in range(120)
+    )
+    payload = json.dumps({
+        'payload': {
+            'repo': {'defaultBranch': 'main', 'currentOid': 'a' * 40},
+            'items': [{'id': i, 'path': f'src/module_{i}.py', 'contentType': 'file'} for i in range(payload_items)]
+        }
+    }, separators=(',', ':'))
+    footer = ''.join(f'<li class="mr-3"><a class="Link--secondary" href="/site/{i}">Footer link {i}</a></li>' for i in range(60))
+    return (
+        '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>GitHub</title>'
+        + ''.join(f'<link rel="stylesheet" href="/assets/style-{i}.css">' for i in range(30))
+        + f'</head><body><header class="Header"><nav><ul>{nav}</ul></nav></header>'
+        + f'<main>{body}</main>'
+        + f'<script type="application/json" data-target="react-app.embeddedData">{payload}</script>'
+        + f'<footer><ul>{footer}</ul></footer></body></html>'
+    )
+
+def _profile() -> str:
+    body = (
+        '<div class="js-profile-editable-area"><img class="avatar avatar-user" src="https://avatars.githubusercontent.com/u/583231">'
+        '<h1><span class="p-name vcard-fullname">The Octocat</span></h1>'
+        '<div class="p-note user-profile-bio"><div>GitHub mascot</div></div>'
+        '<span class="p-org"><div>@github</div></span><span class="p-label">San Francisco</span>'
+        '<a class="Link--secondary no-underline" href="?tab=followers"><span class="text-bold">12.4k</span> followers</a>'
+        '<a class="Link--secondary no-underline" href="?tab=following"><span class="text-bold">9</span> following</a></div>'
+        '<nav><a data-tab-item="repositories" href="?tab=repositories">Repositories <span class="Counter">8</span></a></nav>'
+        + ''.join(f'<div class="ContributionCalendar-day" data-date="2024-01-{i % 28 + 1:02d}" data-level="{i % 5}"></div>' for i in range(370))
+    )
+    return _chrome(body)
+
+def _repositories() -> str:
+    rows = ''.join(
+        f'<li class="col-12 d-flex flex-justify-between width-full py-4 border-bottom"><div class="col-10 col-lg-9 d-inline-block">'
+        f'<h3><a href="/octocat/repo-{i}" itemprop="name codeRepository">repo-{i}</a></h3>'
+        f'<p class="col-9 d-inline-block color-fg-muted mb-2 pr-4" itemprop="description about">Repository number {i} description text</p>'
+        f'<div class="f6 color-fg-muted mt-2"><span itemprop="programmingLanguage">Python</span>'
+        f'<a class="Link--muted mr-3" href="/octocat/repo-{i}/stargazers">{_ICON}{i * 37 % 2000}</a>'
+        f'<a class="Link--muted mr-3" href="/octocat/repo-{i}/forks">{_ICON}{i * 7 % 300}</a>'
+        f'Updated <relative-time datetime="2024-01-01T00:00:00Z">Jan 1</relative-time></div></div></li>'
+        for i in range(30)
+    )
+    return _chrome(f'<ul data-filterable-for="your-repos-filter">{rows}</ul>')
+
+def _repository() -> str:
+    files = ''.join(
+        f'<tr class="react-directory-row"><td>{_ICON}<a class="Link--primary" href="/octocat/repo/blob/main/src/module_{i}.py">module_{i}.py</a></td>'
+        f'<td><a class="Link--secondary" href="/octocat/repo/commit/{i:040x}">Commit message {i}</a></td></tr>'
+        for i in range(150)
+    )
+    languages = ''.join(
+        f'<li class="d-inline"><a class="d-inline-flex flex-items-center" href="/octocat/repo/search?l={name}">'
+        f'<span class="color-fg-default text-bold mr-1">{name}</span><span class="percent">{pct}%</span></a></li>'
+        for name, pct in (('Python', '71.3'), ('C', '20.1'), ('Shell', '5.2'), ('Makefile', '3.4'))
+    )
+    body = (
+        '<div id="repo-stats-counter">'
+        f'<a href="/octocat/repo/stargazers">{_ICON}<span class="Counter">12.3k</span></a>'
+        f'<a href="/octocat/repo/forks">{_ICON}<span class="Counter">1.5k</span></a></div>'
+        f'<table>{files}</table>'
+        '<p class="f4 my-3">A repository used to benchmark the scraper</p>'
+        '<div class="BorderGrid"><div class="BorderGrid-row"><div class="BorderGrid-cell"><h2>Languages</h2>'
+        f'<ul>{languages}</ul></div></div><div class="BorderGrid-row"><div class="BorderGrid-cell">'
+        + ''.join(f'<a class="topic-tag topic-tag-link" href="/topics/topic-{i}">topic-{i}</a>' for i in range(10))
+        + '</div></div></div>'
+        + '<article class="markdown-body">' + ''.join(f'<p>README paragraph {i} with <code>code</code> and <a href="#x">links</a>.</p>' for i in range(300)) + '</article>'
+    )
+    return _chrome(body, payload_items=1500)
+
+def _commits() -> str:
+    groups = ''.join(
+        '<div class="TimelineItem"><div class="TimelineItem-body"><h2>Commits on Jan ' + str(day) + '</h2><ol>'
+        + ''.join(
+            f'<li class="Box-row"><p><a class="Link--primary text-bold" href="/octocat/repo/commit/{day * 100 + i:040x}">Fix issue {i} on day {day}</a></p>'
+            f'<a class="commit-author user-mention" href="/octocat">octocat</a> committed '
+            f'<relative-time datetime="2024-01-{day:02d}T12:00:00Z">Jan {day}</relative-time>{_ICON}{_ICON}</li>'
+            for i in range(5)
+        )
+        + '</ol></div></div>'
+        for day in range(1, 8)
+    )
+    return _chrome(groups)
+
+def _issues() -> str:
+    rows = ''.join(
+        f'<div class="Box-row"><div class="d-flex">{_ICON}<a class="Link--primary v-align-middle no-underline h4" href="/octocat/repo/issues/{1000 + i}">Issue title {i}</a>'
+        f'<a class="IssueLabel hx_IssueLabel" href="/octocat/repo/labels/bug">bug</a>'
+        f'<span class="opened-by">#{1000 + i} opened by <a class="Link--muted" href="/issues?q=author%3Auser{i}">user{i}</a></span></div></div>'
+        for i in range(25)
+    )
+    return _chrome(f'<div class="js-navigation-container">{rows}</div>')
+
+def _organization() -> str:
+    body = (
+        '<img class="avatar flex-shrink-0" src="https://avatars.githubusercontent.com/u/9919">'
+        '<h1 class="h2 lh-condensed">GitHub</h1><div class="f4 color-fg-muted">How people build software.</div>'
+        '<span class="p-label">San Francisco, CA</span><a class="Link--primary" href="https://github.com/about">https://github.com/about</a>'
+        + ''.join(f'<li class="Box-row"><a href="/github/repo-{i}">repo-{i}</a>{_ICON}</li>' for i in range(30))
+    )
+    return _chrome(body)
+
+def _search() -> str:
+    rows = ''.join(
+        f'<div class="search-title"><div class="f4 text-normal"><a href="/owner{i}/project-{i}">owner{i}/project-{i}</a></div>'
+        f'<p class="mb-1">Search result {i}</p>{_ICON}</div>'
+        for i in range(10)
+    )
+    return _chrome(rows)
+
+def _trending() -> str:
+    rows = ''.join(
+        f'<article class="Box-row"><h2 class="h3 lh-condensed"><a href="/owner{i}/trend-{i}">{_ICON}owner{i} / trend-{i}</a></h2>'
+        f'<p class="col-9 color-fg-muted my-1 pr-4">Trending project {i}</p>'
+        f'<div class="f6 color-fg-muted mt-2"><span itemprop="programmingLanguage">Rust</span>'
+        f'<a class="Link--muted d-inline-block mr-3" href="/owner{i}/trend-{i}/stargazers">{_ICON}{i * 311},{i:03d}</a>'
+        f'<span class="d-inline-block float-sm-right">{_ICON}{i * 13} stars today</span></div></article>'
+        for i in range(25)
+    )
+    return _chrome(rows)
+
+GENERATORS: Dict[str, Callable[[], str]] = {
+    'profile': _profile,
+    'repositories': _repositories,
+    'repository': _repository,
+    'commits': _commits,
+    'issues': _issues,
+    'organization': _organization,
+    'search': _search,
+    'trending': _trending,
+}
+
+PAGE_TYPES = list(GENERATORS)
+
+def load_fixture(page_type: str) -> str:
+    """Recorded page for page_type if one was saved, else a generated one"""
+    path = os.path.join(FIXTURES_DIR, f'{page_type}.html')
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            return f.read()
+    return GENERATORS[page_type]()
@@ -0,0 +1,201 @@
+"""
+Load-test every API route against the local stub upstream, fully offline.
+
+Starts benchmarks.stub_server and the service itself (uvicorn main:app) as
+subprocesses, then sends --requests requests to each route in routes/*.py
+with --concurrency in flight and reports throughput, p50/p99 latency, errors
+and the service's resident memory.
+
+    python -m benchmarks.load_benchmark [--concurrency 20] [--requests 200] [--latency 0.05] [--error-rate 0.01] [--cold]
+"""
+import argparse
+import asyncio
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.stub_server import stub_urls
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Values for path and required query parameters; they match the replay fixtures
+SAMPLE_PARAMS = {
+    'username': 'octocat',
+    'repo_name': 'Hello-World',
+    'org_name': 'github',
+    'q': 'fastapi',
+}
+
+SAMPLE_BODIES = {
+    '/api/batch/repos': {'repositories': ['octocat/Hello-World', 'octocat/Spoon-Knife', 'github/docs']},
+    '/api/batch/users': {'usernames': ['octocat', 'defunkt', 'mojombo']},
+}
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def route_targets() -> List[Tuple[str, str, Optional[Dict[str, Any]]]]:
+    """(method, url path, JSON body) for every route defined in routes/*.py"""
+    from main import app
+
+    targets = []
+    for route in app.routes:
+        endpoint = getattr(route, 'endpoint', None)
+        if endpoint is None or not endpoint.__module__.startswith('routes.'):
+            continue
+        path = re.sub(r'{(\w+)}', lambda match: SAMPLE_PARAMS[match.group(1)], route.path)
+        required = [param.name for param in route.dependant.query_params if param.required]
+        if required:
+            path += '?' + '&'.join(f"{name}={SAMPLE_PARAMS[name]}" for name in required)
+        for method in sorted(route.methods):
+            targets.append((method, path, SAMPLE_BODIES.get(route.path)))
+    return targets
+
+def rss_kb(pid: int) -> Dict[str, int]:
+    """Current and peak resident memory of pid in KB (Linux /proc; empty elsewhere)"""
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            status = dict(line.split(':', 1) for line in f if ':' in line)
+    except OSError:
+        return {}
+    return {name: int(status[key].split()[0]) for name, key in (('rss', 'VmRSS'), ('peak', 'VmHWM')) if key in status}
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+async def wait_until_up(url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while True:
+            try:
+                await client.get(url)
+                return
+            except httpx.TransportError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"{url} did not come up within {timeout:.0f}s")
+                await asyncio.sleep(0.2)
+
+async def drive(client: httpx.AsyncClient, method: str, path: str, body, requests: int, concurrency: int) -> Dict[str, Any]:
+    """Send requests to one route with concurrency in flight; latencies in ms"""
+    latencies: List[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                # A stream is only done once its last line has arrived
+                await response.aread()
+                failed = response.status_code >= 400
+                if not failed and response.headers.get('content-type', '').startswith('application/json'):
+                    failed = response.json().get('success') is False
+            except httpx.HTTPError:
+                failed = True
+            latencies.append((time.perf_counter() - start) * 1000)
+            errors += failed
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {
+        'rps': requests / elapsed,
+        'p50': statistics.median(latencies),
+        'p99': percentile(latencies, 99),
+        'errors': errors,
+    }
+
+async def run(args, targets, base_url: str, service_pid: int):
+    await wait_until_up(f"{base_url}/health")
+    before = rss_kb(service_pid)
+
+    print(f"{'route':<52}{'req/s':>9}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    totals = {'requests': 0, 'errors': 0, 'elapsed': 0.0}
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+        for method, path, body in targets:
+            result = await drive(client, method, path, body, args.requests, args.concurrency)
+            totals['requests'] += args.requests
+            totals['errors'] += result['errors']
+            totals['elapsed'] += args.requests / result['rps']
+            print(f"{method + ' ' + path:<52}{result['rps']:>9.1f}{result['p50']:>10.1f}{result['p99']:>10.1f}{result['errors']:>8}")
+
+    after = rss_kb(service_pid)
+    print(f"{'total':<52}{totals['requests'] / totals['elapsed']:>9.1f}{'':>20}{totals['errors']:>8}")
+    if after:
+        print(f"service RSS: {before.get('rss', 0) / 1024:.1f} MB at start, {after['rss'] / 1024:.1f} MB at end, "
+              f"{after.get('peak', 0) / 1024:.1f} MB peak")
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--concurrency', type=int, default=20)
+    arg_parser.add_argument('--requests', type=int, default=200, help='Requests per route')
+    arg_parser.add_argument('--latency', type=float, default=0.05, help='Upstream latency in seconds')
+    arg_parser.add_argument('--jitter', type=float, default=0.0)
+    arg_parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of upstream requests failed with a 503')
+    arg_parser.add_argument('--cold', action='store_true', help='Disable the response cache so every request scrapes')
+    arg_parser.add_argument('--routes', help='Only routes whose path matches this regular expression')
+    arg_parser.add_argument(
+        '--upstream-rate', type=float,
+        help='Rate limit in requests per second, shared by every upstream host (they are all the stub); unlimited by default'
+    )
+    args = arg_parser.parse_args()
+
+    targets = route_targets()
+    if args.routes:
+        targets = [target for target in targets if re.search(args.routes, target[1])]
+
+    stub_port, service_port = _free_port(), _free_port()
+    env = {
+        **os.environ,
+        **stub_urls(stub_port),
+        # Anonymous scraping only, no background work competing with the load
+        'GITHUB_TOKEN': '',
+        'GITHUB_TOKENS': '',
+        'TRENDING_SNAPSHOT_INTERVAL': '0',
+        'REFRESH_INTERVAL': '0',
+        # Every upstream request goes to one local host, so lift the per-host
+        # limits unless --upstream-rate asks for one
+        'UPSTREAM_RATE': str(args.upstream_rate or 100000),
+        'UPSTREAM_BURST': '20' if args.upstream_rate else '100000',
+        'SCRAPER_MAX_PER_HOST': '1000',
+        'HTTP2': 'false',
+        'CACHE_DB_PATH': '',
+        # Scraped entities are written through, so the /api/store routes have data to read
+        'ENTITY_DB_PATH': ':memory:',
+        'ENTITY_SYNC_INTERVAL': '0',
+    }
+    if args.cold:
+        env['CACHE_MAX_BYTES'] = '0'
+
+    stub = subprocess.Popen(
+        [sys.executable, '-m', 'benchmarks.stub_server', '--port', str(stub_port),
+         '--latency', str(args.latency), '--jitter', str(args.jitter), '--error-rate', str(args.error_rate)],
+        cwd=ROOT_DIR, env=env
+    )
+    service = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'main:app', '--port', str(service_port), '--log-level', 'warning'],
+        cwd=ROOT_DIR, env=env, stdout=subprocess.DEVNULL
+    )
+    try:
+        asyncio.run(wait_until_up(f"http://127.0.0.1:{stub_port}/_stats"))
+        asyncio.run(run(args, targets, f"http://127.0.0.1:{service_port}", service.pid))
+    finally:
+        for process in (service, stub):
+            process.terminate()
+            process.wait()
+
+if __name__ == '__main__':
+    main()
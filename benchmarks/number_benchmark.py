@@ -0,0 +1,95 @@
+"""
+Per-call cost of the number and text helpers in services/text_parsing.py.
+
+Parses a large corpus of counts in the formats GitHub pages show ('7',
+'12,345', '1.2k', '4.35m', '1.2k stars', ...) with parse_number and with the
+implementation it replaced, reporting nanoseconds per call and the inputs on
+which the two disagree.
+
+    python -m benchmarks.number_benchmark [--size N] [--repeat N]
+"""
+import argparse
+import random
+import re
+import time
+from typing import Callable, List
+
+from services.text_parsing import normalize_whitespace, parse_number
+
+def legacy_parse_number(text: str) -> int:
+    """parse_number as it was in services/extractors.py"""
+    if not text:
+        return 0
+    text = text.strip().lower()
+    if 'k' in text:
+        return int(float(text.replace('k', '')) * 1000)
+    elif 'm' in text:
+        return int(float(text.replace('m', '')) * 1000000)
+    else:
+        return int(re.sub(r'[^\d]', '', text) or 0)
+
+def legacy_normalize_whitespace(text: str) -> str:
+    return re.sub(r'\s+', ' ', text).strip()
+
+def count_corpus(size: int, seed: int = 0) -> List[str]:
+    """Counts as scraped: mostly small plain numbers, then grouped and suffixed ones"""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        value = int(rng.paretovariate(0.6))
+        shape = rng.random()
+        if value < 1000 or shape < 0.3:
+            text = str(value)
+        elif value < 10000 and shape < 0.6:
+            text = f"{value:,}"
+        elif value < 1000000:
+            text = f"{value / 1000:.1f}k".replace('.0k', 'k')
+        else:
+            text = f"{value / 1000000:.2f}m".rstrip('0').rstrip('.').replace('.m', 'm')
+        if rng.random() < 0.2:
+            text = f"\n      {text}\n    "
+        corpus.append(text)
+    return corpus
+
+def text_corpus(size: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    words = ['A', 'fast', 'web', 'framework', 'for', 'building', 'APIs', 'with', 'Python', 'types']
+    return [
+        '\n        ' + ' '.join(rng.choice(words) for _ in range(rng.randint(3, 15))) + ('\n' if rng.random() < 0.5 else '') + '      '
+        for _ in range(size)
+    ]
+
+def ns_per_call(function: Callable, corpus: List[str], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in corpus:
+            function(text)
+        best = min(best, time.perf_counter() - start)
+    return best / len(corpus) * 1e9
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--size', type=int, default=200000)
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    args = arg_parser.parse_args()
+
+    counts = count_corpus(args.size)
+    texts = text_corpus(args.size)
+
+    print(f"{'helper':<24}{'before ns':>11}{'after ns':>10}{'speedup':>9}")
+    for name, before, after, corpus in (
+        ('parse_number', legacy_parse_number, parse_number, counts),
+        ('normalize_whitespace', legacy_normalize_whitespace, normalize_whitespace, texts),
+    ):
+        before_ns = ns_per_call(before, corpus, args.repeat)
+        after_ns = ns_per_call(after, corpus, args.repeat)
+        print(f"{name:<24}{before_ns:>11.0f}{after_ns:>10.0f}{before_ns / after_ns:>8.2f}x")
+
+    disagreements = sorted({text.strip() for text in counts if legacy_parse_number(text) != parse_number(text)})
+    print(f"\nparse_number disagreements: {len(disagreements)} distinct inputs")
+    for text in disagreements[:10]:
+        print(f"  {text!r}: before {legacy_parse_number(text)}, after {parse_number(text)}")
+
+if __name__ == '__main__':
+    main()
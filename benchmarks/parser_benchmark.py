@@ -0,0 +1,67 @@
+"""
+Compare HTML parser backends on every page type the scraper handles.
+
+Runs each scrape method's parse step over the page fixtures and reports the
+median milliseconds per page and the peak Python memory per parse.
+
+    python -m benchmarks.parser_benchmark [--iterations N] [--backends lxml html.parser]
+"""
+import argparse
+import statistics
+import time
+import tracemalloc
+
+from benchmarks.fixtures import PAGE_TYPES, load_fixture
+from services.github_scraper import BaseGitHubScraper
+from services.html_parser import available_backends
+
+def page_parsers(scraper: BaseGitHubScraper):
+    """The parse step of each scrape method, keyed by page type"""
+    return {
+        'profile': lambda html: scraper._parse_user_profile(html, 'octocat'),
+        'repositories': lambda html: scraper._parse_user_repositories(html, 'octocat'),
+        'repository': scraper._parse_repository_page,
+        'commits': scraper._parse_repository_commits,
+        'issues': lambda html: scraper._parse_repository_issues(html, 'open'),
+        'organization': lambda html: scraper._parse_organization_info(html, 'github'),
+        'search': scraper._parse_search_results,
+        'trending': scraper._parse_trending_repositories,
+    }
+
+def measure(parse, html: str, iterations: int):
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        parse(html)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    parse(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return statistics.median(timings), peak / 1024
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--iterations', type=int, default=20)
+    arg_parser.add_argument('--backends', nargs='+', default=available_backends())
+    args = arg_parser.parse_args()
+
+    pages = {page_type: load_fixture(page_type) for page_type in PAGE_TYPES}
+
+    print(f"{'page':<14}{'size KB':>9}" + ''.join(f"{backend + ' ms':>16}{'peak KB':>10}" for backend in args.backends))
+    totals = {backend: 0.0 for backend in args.backends}
+    for page_type, html in pages.items():
+        row = f"{page_type:<14}{len(html) / 1024:>9.0f}"
+        for backend in args.backends:
+            parse = page_parsers(BaseGitHubScraper(parser=backend))[page_type]
+            ms, peak_kb = measure(parse, html, args.iterations)
+            totals[backend] += ms
+            row += f"{ms:>16.2f}{peak_kb:>10.0f}"
+        print(row)
+
+    print(f"{'total':<14}{'':>9}" + ''.join(f"{totals[backend]:>16.2f}{'':>10}" for backend in args.backends))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,250 @@
+"""
+Record and replay upstream responses for the offline benchmarks.
+
+RecordingTransport wraps a real httpx transport and saves every response to
+benchmarks/fixtures/responses/; ReplayTransport answers from those files
+without touching the network, optionally with injected latency and errors.
+URLs that were never recorded fall back to the generated pages of
+benchmarks.fixtures, so replay works offline even with no recordings at all.
+
+Record the pages the load benchmark requests:
+
+    python -m benchmarks.replay [--users octocat] [--repos octocat/Hello-World] [--orgs github]
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from benchmarks.fixtures import FIXTURES_DIR, GENERATORS, load_fixture
+
+RESPONSES_DIR = os.path.join(FIXTURES_DIR, 'responses')
+
+# Response headers worth replaying; the rest (cookies, CSP, request ids) only add bulk
+KEPT_HEADERS = ('content-type', 'etag', 'last-modified', 'location', 'retry-after')
+
+# One-segment github.com paths that get the generated organization page
+# instead of a profile when nothing was recorded for them
+SYNTHETIC_ORGANIZATIONS = {'github'}
+
+def _readme() -> str:
+    sections = ''.join(
+        f"## Section {i}\n\nParagraph {i} of the README, with `code`, **bold** text and a [link](https://example.com/{i}).\n\n"
+        for i in range(60)
+    )
+    return f"# Benchmark repository\n\n{sections}"
+
+def synthetic_page_type(url: str) -> Optional[str]:
+    """Generated page type that stands in for url, or None if there is none"""
+    url = httpx.URL(url)
+    if url.host == 'raw.githubusercontent.com':
+        return 'readme' if url.path.endswith('/README.md') else None
+    if url.host != 'github.com':
+        # API responses are only ever replayed from recordings
+        return None
+
+    parts = [part for part in url.path.split('/') if part]
+    if parts[:1] == ['search']:
+        return 'search'
+    if parts[:1] == ['trending']:
+        return 'trending'
+    if len(parts) == 1:
+        if url.params.get('tab') == 'repositories':
+            return 'repositories'
+        return 'organization' if parts[0] in SYNTHETIC_ORGANIZATIONS else 'profile'
+    if len(parts) == 2:
+        return 'repository'
+    if len(parts) == 3 and parts[2] in ('commits', 'issues'):
+        return parts[2]
+    return None
+
+class ResponseFixtures:
+    """Recorded responses on disk, keyed by method and URL, with generated pages as the fallback"""
+
+    def __init__(self, directory: str = RESPONSES_DIR, synthetic: bool = True):
+        self.directory = directory
+        self.synthetic = synthetic
+        self._pages: Dict[str, str] = {}
+        self.recorded = 0
+        self.generated = 0
+        self.missing = 0
+
+    def path(self, method: str, url: str) -> str:
+        digest = hashlib.sha1(f"{method.upper()} {url}".encode()).hexdigest()[:16]
+        return os.path.join(self.directory, httpx.URL(url).host or 'local', f"{digest}.json")
+
+    def save(self, method: str, url: str, response: httpx.Response):
+        """Save a response whose body has already been read"""
+        path = self.path(method, url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'method': method.upper(),
+                'url': url,
+                'status': response.status_code,
+                'headers': {name: response.headers[name] for name in KEPT_HEADERS if name in response.headers},
+                'body': response.text,
+            }, f, indent=1)
+
+    def load(self, method: str, url: str) -> Optional[Dict]:
+        path = self.path(method, url)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _page(self, page_type: str) -> str:
+        if page_type not in self._pages:
+            self._pages[page_type] = _readme() if page_type == 'readme' else load_fixture(page_type)
+        return self._pages[page_type]
+
+    def lookup(self, method: str, url: str, request_headers: Optional[Dict[str, str]] = None) -> Tuple[int, Dict[str, str], bytes]:
+        """Status, headers and body to answer method / url with"""
+        recorded = self.load(method, url)
+        if recorded is not None:
+            self.recorded += 1
+            etag = recorded['headers'].get('etag')
+            if etag and request_headers and request_headers.get('if-none-match') == etag:
+                return 304, {'etag': etag}, b''
+            return recorded['status'], recorded['headers'], recorded['body'].encode('utf-8')
+
+        page_type = synthetic_page_type(url) if self.synthetic and method.upper() == 'GET' else None
+        if page_type is None:
+            self.missing += 1
+            return 404, {'content-type': 'text/plain'}, b'Not recorded'
+
+        self.generated += 1
+        content_type = 'text/plain; charset=utf-8' if page_type == 'readme' else 'text/html; charset=utf-8'
+        return 200, {'content-type': content_type}, self._page(page_type).encode('utf-8')
+
+    def stats(self) -> Dict[str, int]:
+        return {'recorded': self.recorded, 'generated': self.generated, 'missing': self.missing}
+
+class FaultInjector:
+    """Latency and error rate of a simulated upstream"""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, seed: Optional[int] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.errors = 0
+
+    async def delay(self):
+        if self.latency or self.jitter:
+            await asyncio.sleep(self.latency + self.random.uniform(0, self.jitter))
+
+    def fail(self) -> bool:
+        """Whether this request gets an injected 503"""
+        if self.error_rate and self.random.random() < self.error_rate:
+            self.errors += 1
+            return True
+        return False
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Pass requests to a real transport and save every response"""
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None, fixtures: Optional[ResponseFixtures] = None):
+        self.transport = transport or httpx.AsyncHTTPTransport()
+        self.fixtures = fixtures or ResponseFixtures()
+        self.saved = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.transport.handle_async_request(request)
+        body = await response.aread()
+        await response.aclose()
+        # The decoded body is what gets saved and passed on, so drop the transfer encodings
+        headers = [
+            (name, value) for name, value in response.headers.multi_items()
+            if name.lower() not in ('content-encoding', 'content-length', 'transfer-encoding')
+        ]
+        response = httpx.Response(response.status_code, headers=headers, content=body, request=request)
+        self.fixtures.save(request.method, str(request.url), response)
+        self.saved += 1
+        return response
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Answer every request from the fixtures, without the network"""
+
+    def __init__(self, fixtures: Optional[ResponseFixtures] = None, faults: Optional[FaultInjector] = None):
+        self.fixtures = fixtures or ResponseFixtures()
+        self.faults = faults or FaultInjector()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await self.faults.delay()
+        if self.faults.fail():
+            return httpx.Response(503, text='Injected upstream error', request=request)
+        status, headers, body = self.fixtures.lookup(request.method, str(request.url), request.headers)
+        return httpx.Response(status, headers=headers, content=body, request=request)
+
+def save_page_fixtures(fixtures: ResponseFixtures, directory: str = FIXTURES_DIR) -> int:
+    """
+    Copy one recorded page per page type to <page_type>.html, where the parser
+    benchmark picks it up; existing page fixtures are left alone.
+    """
+    saved = 0
+    for root, _, files in os.walk(fixtures.directory):
+        for name in sorted(files):
+            with open(os.path.join(root, name), encoding='utf-8') as f:
+                recorded = json.load(f)
+            page_type = synthetic_page_type(recorded['url'])
+            path = os.path.join(directory, f'{page_type}.html')
+            if page_type in GENERATORS and recorded['status'] == 200 and not os.path.exists(path):
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(recorded['body'])
+                saved += 1
+    return saved
+
+async def record(users, repos, orgs, languages) -> RecordingTransport:
+    """Fetch everything the load benchmark requests through a RecordingTransport"""
+    from services.cache import ResponseCache
+    from services.github_scraper import AsyncGitHubScraper
+
+    transport = RecordingTransport()
+    client = httpx.AsyncClient(transport=transport, follow_redirects=True, timeout=30)
+    # No cache: every call goes upstream and gets recorded
+    scraper = AsyncGitHubScraper(client=client, cache=ResponseCache(max_bytes=0))
+    calls = []
+    for username in users:
+        calls += [scraper.get_user_profile(username), scraper.get_user_repositories(username)]
+    for full_name in repos:
+        username, repo_name = full_name.split('/', 1)
+        calls += [
+            scraper.get_repository_info(username, repo_name),
+            scraper.get_repository_commits(username, repo_name),
+            scraper.get_repository_issues(username, repo_name),
+        ]
+    for org_name in orgs:
+        calls += [scraper.get_organization_info(org_name), scraper.get_user_repositories(org_name)]
+    for language in languages:
+        calls.append(scraper.get_trending_repositories(language))
+    calls.append(scraper.search_repositories('fastapi'))
+
+    try:
+        await asyncio.gather(*calls, return_exceptions=True)
+    finally:
+        await scraper.aclose()
+    return transport
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--users', nargs='*', default=['octocat'])
+    arg_parser.add_argument('--repos', nargs='*', default=['octocat/Hello-World'])
+    arg_parser.add_argument('--orgs', nargs='*', default=['github'])
+    arg_parser.add_argument('--languages', nargs='*', default=['', 'python'])
+    args = arg_parser.parse_args()
+
+    transport = asyncio.run(record(args.users, args.repos, args.orgs, args.languages))
+    pages = save_page_fixtures(transport.fixtures)
+    print(f"Recorded {transport.saved} responses to {transport.fixtures.directory}; {pages} new page fixtures")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,387 @@
+"""
+Compare the compiled extraction specs with the hand-written find/find_all
+chains they replaced.
+
+Runs both over the page fixtures of every page type the specs cover, checks
+that they extract the same data (fields the chains never had, such as a
+listed repository's updated_at, are left out of the comparison), and reports
+the median milliseconds per page.
+
+    python -m benchmarks.spec_benchmark [--iterations N] [--backend lxml]
+"""
+import argparse
+import json
+import re
+from typing import Any, Dict, List
+from urllib.parse import urljoin
+
+from benchmarks.fixtures import load_fixture
+from benchmarks.parser_benchmark import measure, page_parsers
+from services.extraction_specs import DEFAULT_SPECS
+from services.github_scraper import BaseGitHubScraper
+from services.html_parser import strainer
+
+# Elements each page's parser reads; everything else is skipped while building the tree
+PROFILE_ELEMENTS = strainer(
+    ('span', 'class', 'p-name'),
+    ('div', 'class', 'p-note'),
+    ('span', 'class', 'p-label'),
+    ('span', 'class', 'p-org'),
+    ('img', 'class', 'avatar'),
+    ('a', 'class', 'Link--secondary'),
+    ('a', 'data-tab-item', 'repositories')
+)
+REPOSITORY_LIST_ELEMENTS = strainer(('div', 'class', 'col-10'))
+REPOSITORY_ELEMENTS = strainer(
+    ('p', 'class', 'f4'),
+    ('div', 'id', 'repo-stats-counter'),
+    ('div', 'class', 'BorderGrid-row'),
+    ('a', 'class', 'topic-tag')
+)
+COMMIT_ELEMENTS = strainer(('div', 'class', 'TimelineItem-body'))
+ISSUE_ELEMENTS = strainer(('div', 'class', 'Box-row'))
+ORGANIZATION_ELEMENTS = strainer(
+    ('h1', 'class', 'h2'),
+    ('div', 'class', 'f4'),
+    ('span', 'class', 'p-label'),
+    ('a', 'class', 'Link--primary'),
+    ('img', 'class', 'avatar')
+)
+SEARCH_RESULT_ELEMENTS = strainer(('div', 'class', 'f4'))
+TRENDING_ELEMENTS = strainer(('article', 'class', 'Box-row'))
+
+class LegacyParsers(BaseGitHubScraper):
+    """The parse methods as they were before extraction specs, for comparison"""
+
+    def _parse_user_profile(self, html: str, username: str) -> Dict[str, Any]:
+        soup = self._soup(html, PROFILE_ELEMENTS)
+
+        # Extract user information
+        user_data = {"username": username}
+
+        # Name
+        name_elem = soup.find('span', class_='p-name')
+        if name_elem:
+            user_data['name'] = name_elem.text.strip()
+
+        # Bio
+        bio_elem = soup.find('div', class_='p-note')
+        if bio_elem:
+            user_data['bio'] = bio_elem.text.strip()
+
+        # Location
+        location_elem = soup.find('span', class_='p-label')
+        if location_elem:
+            user_data['location'] = location_elem.text.strip()
+
+        # Company
+        company_elem = soup.find('span', class_='p-org')
+        if company_elem:
+            user_data['company'] = company_elem.text.strip()
+
+        # Avatar
+        avatar_elem = soup.find('img', class_='avatar')
+        if avatar_elem:
+            user_data['avatar_url'] = avatar_elem.get('src')
+
+        # Stats
+        stats = soup.find_all('a', class_='Link--secondary')
+        for stat in stats:
+            text = stat.text.strip()
+            if 'followers' in text.lower():
+                user_data['followers'] = self._parse_number(text.split()[0])
+            elif 'following' in text.lower():
+                user_data['following'] = self._parse_number(text.split()[0])
+
+        # Repository count
+        repo_tab = soup.find('a', {'data-tab-item': 'repositories'})
+        if repo_tab:
+            repo_text = repo_tab.text.strip()
+            user_data['public_repos'] = self._parse_number(re.findall(r'\d+', repo_text)[0] if re.findall(r'\d+', repo_text) else '0')
+
+        return user_data
+
+    def _parse_user_repositories(self, html: str, username: str) -> List[Dict[str, Any]]:
+        """Parse a repositories tab page, leaving readme_content unset"""
+        soup = self._soup(html, REPOSITORY_LIST_ELEMENTS)
+        repositories = []
+
+        repo_list = soup.find_all('div', class_='col-10')
+        for repo_div in repo_list:
+            repo_link = repo_div.find('a', {'itemprop': 'name codeRepository'})
+            if not repo_link:
+                continue
+
+            repo_name = repo_link.text.strip()
+            repo_url = urljoin(self.base_url, repo_link['href'])
+
+            # Description
+            desc_elem = repo_div.find('p', {'itemprop': 'about'})
+            description = desc_elem.text.strip() if desc_elem else None
+
+            # Language
+            lang_elem = repo_div.find('span', {'itemprop': 'programmingLanguage'})
+            language = lang_elem.text.strip() if lang_elem else None
+
+            # Stars, forks, etc.
+            stars = 0
+            forks = 0
+
+            star_elem = repo_div.find('a', href=lambda x: x and 'stargazers' in x)
+            if star_elem:
+                stars = self._parse_number(star_elem.text.strip())
+
+            fork_elem = repo_div.find('a', href=lambda x: x and 'forks' in x)
+            if fork_elem:
+                forks = self._parse_number(fork_elem.text.strip())
+
+            repositories.append({
+                'name': repo_name,
+                'full_name': f"{username}/{repo_name}",
+                'description': description,
+                'url': repo_url,
+                'language': language,
+                'stargazers_count': stars,
+                'forks_count': forks,
+                'readme_content': None
+            })
+
+        return repositories
+
+    def _parse_repository_page(self, html: str) -> Dict[str, Any]:
+        soup = self._soup(html, REPOSITORY_ELEMENTS)
+        repo_data = {}
+
+        # Description
+        desc_elem = soup.find('p', class_='f4')
+        if desc_elem:
+            repo_data['description'] = desc_elem.text.strip()
+
+        # Stars and forks
+        stats_elem = soup.find('div', id='repo-stats-counter')
+        if stats_elem:
+            star_elem = stats_elem.find('a', href=lambda x: x and 'stargazers' in x)
+            if star_elem:
+                repo_data['stargazers_count'] = self._parse_number(star_elem.text.strip())
+
+            fork_elem = stats_elem.find('a', href=lambda x: x and 'forks' in x)
+            if fork_elem:
+                repo_data['forks_count'] = self._parse_number(fork_elem.text.strip())
+
+        # Primary language and language stats
+        languages = {}
+        lang_section = soup.find('div', class_='BorderGrid-row')
+        if lang_section:
+            lang_elem = lang_section.find('span', class_='color-fg-default')
+            if lang_elem:
+                repo_data['language'] = lang_elem.text.strip()
+
+            for link in lang_section.find_all('a', class_='d-inline-flex'):
+                lang_name = link.find('span', class_='color-fg-default')
+                lang_percent = link.find('span', class_='percent')
+                if lang_name and lang_percent:
+                    languages[lang_name.text.strip()] = float(lang_percent.text.strip().replace('%', ''))
+
+        # Topics
+        repo_data['topics'] = [topic.text.strip() for topic in soup.find_all('a', class_='topic-tag')]
+        repo_data['languages'] = languages
+
+        # Default branch and its head, from the embedded page payload
+        branch_match = re.search(r'"defaultBranch":"([^"]+)"', html)
+        if branch_match:
+            repo_data['default_branch'] = branch_match.group(1)
+        commit_match = re.search(r'"currentOid":"([0-9a-f]{40})"', html)
+        if commit_match:
+            repo_data['latest_commit'] = commit_match.group(1)
+
+        return repo_data
+
+    def _parse_repository_commits(self, html: str) -> List[Dict[str, Any]]:
+        soup = self._soup(html, COMMIT_ELEMENTS)
+        commits = []
+
+        commit_groups = soup.find_all('div', class_='TimelineItem-body')
+        for group in commit_groups:
+            commit_links = group.find_all('a', class_='Link--primary')
+            for link in commit_links:
+                commit_url = urljoin(self.base_url, link['href'])
+                commit_sha = link['href'].split('/')[-1]
+                commit_message = link.text.strip()
+
+                # Get author and date
+                author_elem = group.find('a', class_='commit-author')
+                author = author_elem.text.strip() if author_elem else None
+
+                date_elem = group.find('relative-time')
+                date = date_elem.get('datetime') if date_elem else None
+
+                commits.append({
+                    'sha': commit_sha,
+                    'message': commit_message,
+                    'author': author,
+                    'date': date,
+                    'url': commit_url
+                })
+
+        return commits
+
+    def _parse_repository_issues(self, html: str, state: str) -> List[Dict[str, Any]]:
+        soup = self._soup(html, ISSUE_ELEMENTS)
+        issues = []
+
+        issue_items = soup.find_all('div', class_='Box-row')
+        for item in issue_items:
+            title_elem = item.find('a', class_='Link--primary')
+            if not title_elem:
+                continue
+
+            title = title_elem.text.strip()
+            issue_url = urljoin(self.base_url, title_elem['href'])
+            issue_number = int(title_elem['href'].split('/')[-1])
+
+            # Get author
+            author_elem = item.find('a', class_='Link--muted')
+            author = author_elem.text.strip() if author_elem else None
+
+            # Get labels
+            labels = []
+            label_elems = item.find_all('a', class_='IssueLabel')
+            for label in label_elems:
+                labels.append(label.text.strip())
+
+            issues.append({
+                'number': issue_number,
+                'title': title,
+                'state': state,
+                'author': author,
+                'labels': labels,
+                'url': issue_url
+            })
+
+        return issues
+
+    def _parse_organization_info(self, html: str, org_name: str) -> Dict[str, Any]:
+        soup = self._soup(html, ORGANIZATION_ELEMENTS)
+
+        org_data = {"name": org_name}
+
+        # Display name
+        name_elem = soup.find('h1', class_='h2')
+        if name_elem:
+            org_data['display_name'] = name_elem.text.strip()
+
+        # Description
+        desc_elem = soup.find('div', class_='f4')
+        if desc_elem:
+            org_data['description'] = desc_elem.text.strip()
+
+        # Location
+        location_elem = soup.find('span', class_='p-label')
+        if location_elem:
+            org_data['location'] = location_elem.text.strip()
+
+        # Website
+        website_elem = soup.find('a', class_='Link--primary')
+        if website_elem:
+            org_data['blog'] = website_elem.get('href')
+
+        # Avatar
+        avatar_elem = soup.find('img', class_='avatar')
+        if avatar_elem:
+            org_data['avatar_url'] = avatar_elem.get('src')
+
+        return org_data
+
+    def _parse_search_results(self, html: str) -> List[Dict[str, Any]]:
+        soup = self._soup(html, SEARCH_RESULT_ELEMENTS)
+        repositories = []
+
+        repo_items = soup.find_all('div', class_='f4')
+        for item in repo_items:
+            repo_link = item.find('a')
+            if not repo_link:
+                continue
+
+            repo_url = urljoin(self.base_url, repo_link['href'])
+            repo_parts = repo_link['href'].strip('/').split('/')
+
+            if len(repo_parts) >= 2:
+                username, repo_name = repo_parts[0], repo_parts[1]
+
+                repositories.append({
+                    'name': repo_name,
+                    'full_name': f"{username}/{repo_name}",
+                    'url': repo_url,
+                    'owner': username
+                })
+
+        return repositories
+
+    def _parse_trending_repositories(self, html: str) -> List[Dict[str, Any]]:
+        soup = self._soup(html, TRENDING_ELEMENTS)
+        repositories = []
+
+        repo_items = soup.find_all('article', class_='Box-row')
+        for item in repo_items:
+            repo_link = item.find('h2').find('a')
+            if not repo_link:
+                continue
+
+            repo_url = urljoin(self.base_url, repo_link['href'])
+            repo_full_name = repo_link['href'].strip('/')
+            username, repo_name = repo_full_name.split('/')
+
+            # Description
+            desc_elem = item.find('p', class_='col-9')
+            description = desc_elem.text.strip() if desc_elem else None
+
+            # Language
+            lang_elem = item.find('span', {'itemprop': 'programmingLanguage'})
+            language = lang_elem.text.strip() if lang_elem else None
+
+            # Stars today
+            stars_today = 0
+            stars_elem = item.find('span', class_='d-inline-block')
+            if stars_elem and 'stars today' in stars_elem.text:
+                stars_today = self._parse_number(stars_elem.text.split()[0])
+
+            repositories.append({
+                'name': repo_name,
+                'full_name': repo_full_name,
+                'description': description,
+                'url': repo_url,
+                'language': language,
+                'stars_today': stars_today,
+                'owner': username
+            })
+
+        return repositories
+
+def restrict(value: Any, like: Any) -> Any:
+    """value with only the dict keys like has, so fields added to the specs later are not compared"""
+    if isinstance(value, dict) and isinstance(like, dict):
+        return {key: restrict(value[key], like[key]) for key in like if key in value}
+    if isinstance(value, list) and isinstance(like, list) and len(value) == len(like):
+        return [restrict(item, like_item) for item, like_item in zip(value, like)]
+    return value
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--iterations', type=int, default=20)
+    arg_parser.add_argument('--backend', default=None)
+    args = arg_parser.parse_args()
+
+    legacy = page_parsers(LegacyParsers(parser=args.backend))
+    specs = page_parsers(BaseGitHubScraper(parser=args.backend))
+
+    print(f"{'page':<14}{'chains ms':>11}{'specs ms':>10}{'speedup':>9}  same output")
+    for page_type in DEFAULT_SPECS:
+        html = load_fixture(page_type)
+        expected = legacy[page_type](html)
+        same = json.dumps(expected) == json.dumps(restrict(specs[page_type](html), expected))
+        legacy_ms, _ = measure(legacy[page_type], html, args.iterations)
+        specs_ms, _ = measure(specs[page_type], html, args.iterations)
+        print(f"{page_type:<14}{legacy_ms:>11.2f}{specs_ms:>10.2f}{legacy_ms / specs_ms:>8.2f}x  {'yes' if same else 'NO'}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Local stand-in for github.com, raw.githubusercontent.com and api.github.com.
+
+Serves the replay fixtures (see benchmarks.replay) over HTTP with configurable
+latency and error rate. The upstream host is the first path segment, so
+http://127.0.0.1:9000/github.com/octocat answers for https://github.com/octocat.
+Point the service at it with:
+
+    GITHUB_BASE_URL=http://127.0.0.1:9000/github.com
+    GITHUB_RAW_URL=http://127.0.0.1:9000/raw.githubusercontent.com
+    GITHUB_API_URL=http://127.0.0.1:9000/api.github.com
+
+    python -m benchmarks.stub_server [--port 9000] [--latency 0.05] [--jitter 0.02] [--error-rate 0.01]
+"""
+import argparse
+
+import uvicorn
+from fastapi import FastAPI, Request, Response
+
+from benchmarks.replay import FaultInjector, ResponseFixtures
+
+def stub_urls(port: int, host: str = '127.0.0.1') -> dict:
+    """Environment that points the service at a stub server on port"""
+    origin = f"http://{host}:{port}"
+    return {
+        'GITHUB_BASE_URL': f"{origin}/github.com",
+        'GITHUB_RAW_URL': f"{origin}/raw.githubusercontent.com",
+        'GITHUB_API_URL': f"{origin}/api.github.com",
+        'GITHUB_GRAPHQL_URL': f"{origin}/api.github.com/graphql",
+    }
+
+def create_app(fixtures: ResponseFixtures = None, faults: FaultInjector = None) -> FastAPI:
+    fixtures = fixtures or ResponseFixtures()
+    faults = faults or FaultInjector()
+    app = FastAPI(docs_url=None, redoc_url=None, openapi_url=None)
+
+    @app.get("/_stats")
+    async def stats():
+        return {**fixtures.stats(), 'injected_errors': faults.errors}
+
+    @app.api_route("/{host}/{path:path}", methods=["GET", "POST"])
+    async def upstream(host: str, path: str, request: Request):
+        await faults.delay()
+        if faults.fail():
+            return Response('Injected upstream error', status_code=503, media_type='text/plain')
+        url = f"https://{host}/{path}"
+        if request.url.query:
+            url += f"?{request.url.query}"
+        status, headers, body = fixtures.lookup(request.method, url, request.headers)
+        return Response(body, status_code=status, headers=headers)
+
+    return app
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--port', type=int, default=9000)
+    arg_parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    arg_parser.add_argument('--jitter', type=float, default=0.0, help='Up to this many more seconds, uniformly random')
+    arg_parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with a 503')
+    arg_parser.add_argument('--seed', type=int, default=None)
+    args = arg_parser.parse_args()
+
+    faults = FaultInjector(args.latency, args.jitter, args.error_rate, args.seed)
+    uvicorn.run(create_app(faults=faults), host='127.0.0.1', port=args.port, log_level='warning')
+
+if __name__ == '__main__':
+    main()
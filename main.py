@@ -1,11 +1,13 @@
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse, HTMLResponse
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, HTMLResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import uvicorn
 import os
 import asyncio
+import time
 import httpx
+from contextlib import asynccontextmanager
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -18,9 +20,80 @@ from routes import (
     repositories_router,
     search_router,
     trending_router,
-    organizations_router
+    organizations_router,
+    batch_router,
+    entities_router
 )
 from models.github_models import APIResponse
+from services.github_scraper import AsyncGitHubScraper
+from services.http_client import create_http_client
+from services.cache import ResponseCache
+from services.trending import TrendingSnapshots
+from services.entity_store import EntitySync
+from services import metrics, tracing
+import json
+
+# Keep-alive service to prevent Render free tier shutdown
+async def keep_alive_ping(client: httpx.AsyncClient):
+    """Ping self every 1 minutes to prevent Render free tier shutdown"""
+    while True:
+        try:
+            await asyncio.sleep(60)  # 1 minutes = 60 seconds
+            
+            # Get the service URL from environment or use localhost for local dev
+            service_url = os.getenv('RENDER_EXTERNAL_URL', 'http://localhost:8000')
+            
+            # Ping the health endpoint
+            response = await client.get(f"{service_url}/health", timeout=30.0)
+            current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            print(f"🏓 Keep-alive ping at {current_time} - Status: {response.status_code}")
+                
+        except Exception as e:
+            current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            print(f"❌ Keep-alive ping failed at {current_time}: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create the shared upstream client and scraper, and start background services"""
+    http_client = create_http_client()
+    cache = ResponseCache.from_env()
+    app.state.http_client = http_client
+    app.state.scraper = AsyncGitHubScraper(client=http_client, cache=cache)
+
+    # Deletes expired entries from the on-disk cache tier (CACHE_PURGE_INTERVAL)
+    cache_purge_task = asyncio.create_task(cache.run())
+    # Keeps hot cache keys (trending, popular profiles, ...) refreshed ahead of expiry
+    refresh_task = asyncio.create_task(app.state.scraper.refresher.run())
+    # Scrapes trending for every configured language and period on a schedule
+    app.state.trending = TrendingSnapshots.from_env(app.state.scraper)
+    trending_task = asyncio.create_task(app.state.trending.run())
+    # Re-fetches stored entities that changed upstream (needs ENTITY_DB_PATH)
+    app.state.entity_sync = EntitySync.from_env(app.state.scraper)
+    entity_sync_task = asyncio.create_task(app.state.entity_sync.run())
+
+    # Only run keep-alive if we're on Render (detected by RENDER_EXTERNAL_URL)
+    keep_alive_task = None
+    if os.getenv('RENDER_EXTERNAL_URL'):
+        print("🚀 Starting keep-alive service for Render deployment...")
+        keep_alive_task = asyncio.create_task(keep_alive_ping(http_client))
+    else:
+        print("🏠 Local development mode - keep-alive service disabled")
+
+    yield
+
+    if keep_alive_task:
+        keep_alive_task.cancel()
+    cache_purge_task.cancel()
+    refresh_task.cancel()
+    trending_task.cancel()
+    entity_sync_task.cancel()
+    app.state.trending.close()
+    app.state.scraper.refresher.close()
+    app.state.scraper.parse_pool.close()
+    await http_client.aclose()
+    cache.close()
+    if app.state.scraper.entities:
+        app.state.scraper.entities.close()
 
 # Create FastAPI app
 app = FastAPI(
@@ -28,7 +101,8 @@ app = FastAPI(
     description="A comprehensive GitHub API scraper with web scraping capabilities",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -43,42 +117,55 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_latency(request: Request, call_next):
+    """End-to-end latency per route template (e.g. /api/repos/{username}/{repo_name})"""
+    start = time.perf_counter()
+    with metrics.HTTP_REQUESTS_IN_FLIGHT.track():
+        response = await call_next(request)
+    route = request.scope.get("route")
+    metrics.HTTP_REQUEST_DURATION.observe(
+        time.perf_counter() - start,
+        method=request.method,
+        route=route.path if route else "unmatched",
+        status=response.status_code
+    )
+    return response
+
+@app.middleware("http")
+async def trace_request(request: Request, call_next):
+    """
+    Trace the upstream fetches, parsing and cache lookups behind each request.
+
+    The per-stage totals go in a Server-Timing header; with ?debug=timing the
+    full span list is also added to the JSON body as debug.timing.
+    """
+    trace = tracing.start()
+    response = await call_next(request)
+    response.headers["Server-Timing"] = trace.server_timing()
+
+    wants_timing = request.query_params.get("debug") == "timing"
+    if not wants_timing or not response.headers.get("content-type", "").startswith("application/json"):
+        return response
+
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    payload = json.loads(body)
+    payload["debug"] = {"timing": trace.breakdown()}
+    headers = {
+        name: value for name, value in response.headers.items()
+        if name.lower() not in ("content-length", "content-type", "server-timing")
+    }
+    headers["Server-Timing"] = trace.server_timing()
+    return JSONResponse(payload, status_code=response.status_code, headers=headers)
+
 # Include routers
 app.include_router(users_router)
 app.include_router(repositories_router)
 app.include_router(search_router)
 app.include_router(trending_router)
 app.include_router(organizations_router)
-
-# Keep-alive service to prevent Render free tier shutdown
-async def keep_alive_ping():
-    """Ping self every 1 minutes to prevent Render free tier shutdown"""
-    while True:
-        try:
-            await asyncio.sleep(60)  # 1 minutes = 60 seconds
-            
-            # Get the service URL from environment or use localhost for local dev
-            service_url = os.getenv('RENDER_EXTERNAL_URL', 'http://localhost:8000')
-            
-            # Ping the health endpoint
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(f"{service_url}/health")
-                current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                print(f"🏓 Keep-alive ping at {current_time} - Status: {response.status_code}")
-                
-        except Exception as e:
-            current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            print(f"❌ Keep-alive ping failed at {current_time}: {e}")
-
-@app.on_event("startup")
-async def startup_event():
-    """Start the keep-alive service on app startup"""
-    # Only run keep-alive if we're on Render (detected by RENDER_EXTERNAL_URL)
-    if os.getenv('RENDER_EXTERNAL_URL'):
-        print("🚀 Starting keep-alive service for Render deployment...")
-        asyncio.create_task(keep_alive_ping())
-    else:
-        print("🏠 Local development mode - keep-alive service disabled")
+app.include_router(batch_router)
+app.include_router(entities_router)
 
 @app.get("/", response_class=HTMLResponse)
 async def root():
@@ -170,6 +257,30 @@ async def root():
                 <div class="description">Get organization repositories</div>
             </div>
 
+            <h3>📦 Batch</h3>
+            <div class="endpoint">
+                <span class="method">POST</span> <strong>/api/batch/repos</strong>
+                <div class="description">Get many repositories in one call</div>
+            </div>
+            <div class="endpoint">
+                <span class="method">POST</span> <strong>/api/batch/users</strong>
+                <div class="description">Get many user profiles in one call</div>
+            </div>
+
+            <h3>🗄️ Local store</h3>
+            <div class="endpoint">
+                <span class="method">GET</span> <strong>/api/store/repos</strong>
+                <div class="description">Query stored repositories by owner, language and stars</div>
+            </div>
+            <div class="endpoint">
+                <span class="method">GET</span> <strong>/api/store/users/{username}</strong>
+                <div class="description">Stored user profile, read without contacting GitHub</div>
+            </div>
+            <div class="endpoint">
+                <span class="method">GET</span> <strong>/api/store/repos/{username}/{repo_name}</strong>
+                <div class="description">Stored repository, with /commits and /issues</div>
+            </div>
+
             <h2>🌟 Features</h2>
             <div class="feature">
                 <strong>✅ Web Scraping:</strong> Advanced scraping with Beautiful Soup for comprehensive data extraction
@@ -215,16 +326,32 @@ async def api_status():
         data={
             "api_version": "1.0.0",
             "endpoints_available": [
-                "users", "repositories", "search", "trending", "organizations"
+                "users", "repositories", "search", "trending", "organizations", "batch", "store"
             ],
             "features": [
                 "User profiles", "Repository details", "README scraping",
                 "Language detection", "Trending repositories", "Organization info"
-            ]
+            ],
+            "cache": app.state.scraper.cache.stats(),
+            "single_flight": app.state.scraper.single_flight.stats(),
+            "refresh": app.state.scraper.refresher.stats(),
+            "parse_pool": app.state.scraper.parse_pool.stats(),
+            "extraction_specs": app.state.scraper.specs.stats(),
+            "trending_snapshots": app.state.trending.stats(),
+            "entity_sync": app.state.entity_sync.stats(),
+            "rate_limits": app.state.scraper.rate_limiter.stats(),
+            "data_source": "api" if app.state.scraper.api else "scraping",
+            "token_pool": app.state.scraper.token_pool.stats()
         },
         message="GitHub API Scraper is operational"
     )
 
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def prometheus_metrics():
+    """Metrics in the Prometheus text exposition format"""
+    app.state.scraper.collect_metrics()
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
 # Legacy endpoint for backward compatibility
 @app.get("/api/readme")
 async def legacy_readme(repo: str):
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
@@ -42,6 +42,7 @@ class GitHubRepository(BaseModel):
     is_archived: Optional[bool] = None
     topics: Optional[List[str]] = None
     readme_content: Optional[str] = None
+    readme_url: Optional[str] = None
 
 class GitHubCommit(BaseModel):
     sha: str
@@ -122,3 +123,15 @@ class APIResponse(BaseModel):
     data: Optional[Any] = None
     message: Optional[str] = None
     error: Optional[str] = None
+
+class BatchRepositoriesRequest(BaseModel):
+    repositories: List[str] = Field(..., min_length=1, max_length=100, description="Repositories as owner/name")
+
+class BatchUsersRequest(BaseModel):
+    usernames: List[str] = Field(..., min_length=1, max_length=100)
+
+class BatchItem(BaseModel):
+    id: str
+    success: bool
+    data: Optional[Any] = None
+    error: Optional[str] = None
@@ -3,3 +3,5 @@ from .repositories import router as repositories_router
 from .search import router as search_router
 from .trending import router as trending_router
 from .organizations import router as organizations_router
+from .batch import router as batch_router
+from .entities import router as entities_router
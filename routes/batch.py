@@ -0,0 +1,55 @@
+from fastapi import APIRouter, Depends
+from typing import Any, Dict, List
+from models.github_models import APIResponse, BatchItem, BatchRepositoriesRequest, BatchUsersRequest
+from services.github_scraper import AsyncGitHubScraper
+from routes.dependencies import get_scraper
+
+router = APIRouter(prefix="/api/batch", tags=["Batch"])
+
+def batch_response(results: Dict[str, Dict[str, Any]], what: str) -> APIResponse:
+    """One APIResponse carrying a success / error entry per requested item"""
+    items: List[BatchItem] = [
+        BatchItem(id=key, success=False, error=result["error"]) if "error" in result
+        else BatchItem(id=key, success=True, data=result)
+        for key, result in results.items()
+    ]
+    succeeded = sum(item.success for item in items)
+    return APIResponse(
+        success=True,
+        data={"results": items, "succeeded": succeeded, "failed": len(items) - succeeded},
+        message=f"Fetched {succeeded} of {len(items)} {what}"
+    )
+
+@router.post("/repos", response_model=APIResponse)
+async def get_repositories(request: BatchRepositoriesRequest, scraper: AsyncGitHubScraper = Depends(get_scraper)):
+    """
+    Get detailed information for many repositories in one call
+
+    - **repositories**: Up to 100 repositories as owner/name; duplicates are fetched once
+    """
+    try:
+        results = await scraper.get_repositories_info(request.repositories)
+        return batch_response(results, "repositories")
+    except Exception as e:
+        return APIResponse(
+            success=False,
+            error=str(e),
+            message="Failed to fetch repositories"
+        )
+
+@router.post("/users", response_model=APIResponse)
+async def get_users(request: BatchUsersRequest, scraper: AsyncGitHubScraper = Depends(get_scraper)):
+    """
+    Get profiles for many users in one call
+
+    - **usernames**: Up to 100 GitHub usernames; duplicates are fetched once
+    """
+    try:
+        results = await scraper.get_user_profiles(request.usernames)
+        return batch_response(results, "users")
+    except Exception as e:
+        return APIResponse(
+            success=False,
+            error=str(e),
+            message="Failed to fetch user profiles"
+        )
@@ -0,0 +1,17 @@
+from fastapi import Request
+from services.github_scraper import AsyncGitHubScraper
+from typing import Optional
+from services.trending import TrendingSnapshots
+from services.entity_store import EntityStore
+
+def get_scraper(request: Request) -> AsyncGitHubScraper:
+    """Application-scoped scraper created in the lifespan handler in main.py"""
+    return request.app.state.scraper
+
+def get_trending_snapshots(request: Request) -> TrendingSnapshots:
+    """Trending snapshot job created in the lifespan handler in main.py"""
+    return request.app.state.trending
+
+def get_entity_store(request: Request) -> Optional[EntityStore]:
+    """The scraper's entity store, or None when ENTITY_DB_PATH is unset"""
+    return request.app.state.scraper.entities
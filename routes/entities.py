@@ -0,0 +1,153 @@
+import asyncio
+from fastapi import APIRouter, Depends, Query
+from typing import Optional
+from models.github_models import APIResponse
+from services.entity_store import EntityStore
+from routes.dependencies import get_entity_store
+
+router = APIRouter(prefix="/api/store", tags=["Local store"])
+
+def _require(store: Optional[EntityStore]) -> EntityStore:
+    if store is None:
+        raise RuntimeError("The entity store is disabled; set ENTITY_DB_PATH to enable it")
+    return store
+
+@router.get("/users/{username}", response_model=APIResponse)
+async def get_stored_user(username: str, store: Optional[EntityStore] = Depends(get_entity_store)):
+    """
+    Get a user profile from the local store, without contacting GitHub
+
+    - **username**: GitHub username
+    """
+    try:
+        user_data = await asyncio.to_thread(_require(store).get_user, username)
+
+        if user_data is None:
+            raise LookupError(f"No stored profile for {username}")
+
+        return APIResponse(
+            success=True,
+            data=user_data,
+            message=f"Stored profile for {username}"
+        )
+    except Exception as e:
+        return APIResponse(
+            success=False,
+            error=str(e),
+            message="Failed to read stored user profile"
+        )
+
+@router.get("/repos", response_model=APIResponse)
+async def list_stored_repositories(
+    owner: Optional[str] = Query(None, description="Only this user's or organization's repositories"),
+    language: Optional[str] = Query(None, description="Only repositories in this language"),
+    min_stars: int = Query(0, ge=0, description="Only repositories with at least this many stars"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of repositories"),
+    store: Optional[EntityStore] = Depends(get_entity_store)
+):
+    """
+    Query stored repositories across owners, most starred first
+
+    - **owner** / **language** / **min_stars**: Filters, combined
+    - **limit**: Maximum number of repositories
+    """
+    try:
+        repos = await asyncio.to_thread(_require(store).repositories, owner, language, min_stars, limit)
+
+        return APIResponse(
+            success=True,
+            data=repos,
+            message=f"Found {len(repos)} stored repositories"
+        )
+    except Exception as e:
+        return APIResponse(
+            success=False,
+            error=str(e),
+            message="Failed to query stored repositories"
+        )
+
+@router.get("/repos/{username}/{repo_name}", response_model=APIResponse)
+async def get_stored_repository(username: str, repo_name: str, store: Optional[EntityStore] = Depends(get_entity_store)):
+    """
+    Get repository information from the local store, without contacting GitHub
+
+    - **username**: Repository owner's username
+    - **repo_name**: Repository name
+    """
+    try:
+        repo_data = await asyncio.to_thread(_require(store).get_repository, f"{username}/{repo_name}")
+
+        if repo_data is None:
+            raise LookupError(f"No stored repository {username}/{repo_name}")
+
+        return APIResponse(
+            success=True,
+            data=repo_data,
+            message=f"Stored repository {username}/{repo_name}"
+        )
+    except Exception as e:
+        return APIResponse(
+            success=False,
+            error=str(e),
+            message="Failed to read stored repository"
+        )
+
+@router.get("/repos/{username}/{repo_name}/commits", response_model=APIResponse)
+async def get_stored_commits(
+    username: str,
+    repo_name: str,
+    author: Optional[str] = Query(None, description="Only commits by this author"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of commits"),
+    store: Optional[EntityStore] = Depends(get_entity_store)
+):
+    """
+    Get stored commits of a repository, newest first
+
+    - **username**: Repository owner's username
+    - **repo_name**: Repository name
+    - **author**: Only commits by this author (optional)
+    """
+    try:
+        commits = await asyncio.to_thread(_require(store).commits, f"{username}/{repo_name}", author, limit)
+
+        return APIResponse(
+            success=True,
+            data=commits,
+            message=f"Found {len(commits)} stored commits"
+        )
+    except Exception as e:
+        return APIResponse(
+            success=False,
+            error=str(e),
+            message="Failed to read stored commits"
+        )
+
+@router.get("/repos/{username}/{repo_name}/issues", response_model=APIResponse)
+async def get_stored_issues(
+    username: str,
+    repo_name: str,
+    state: str = Query("all", regex="^(open|closed|all)$", description="Issue state"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of issues"),
+    store: Optional[EntityStore] = Depends(get_entity_store)
+):
+    """
+    Get stored issues of a repository, newest first
+
+    - **username**: Repository owner's username
+    - **repo_name**: Repository name
+    - **state**: Issue state (open, closed, all)
+    """
+    try:
+        issues = await asyncio.to_thread(_require(store).issues, f"{username}/{repo_name}", None if state == "all" else state, limit)
+
+        return APIResponse(
+            success=True,
+            data=issues,
+            message=f"Found {len(issues)} stored issues"
+        )
+    except Exception as e:
+        return APIResponse(
+            success=False,
+            error=str(e),
+            message="Failed to read stored issues"
+        )
@@ -1,20 +1,21 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from typing import Optional, List
 from models.github_models import APIResponse
-from services.github_scraper import GitHubScraper
+from services.github_scraper import AsyncGitHubScraper
+from routes.dependencies import get_scraper
+from routes.streaming import stream_format, stream_response
 
 router = APIRouter(prefix="/api/organizations", tags=["Organizations"])
-scraper = GitHubScraper()
 
 @router.get("/{org_name}", response_model=APIResponse)
-async def get_organization_info(org_name: str):
+async def get_organization_info(org_name: str, scraper: AsyncGitHubScraper = Depends(get_scraper)):
     """
     Get GitHub organization information
     
     - **org_name**: Organization name
     """
     try:
-        org_data = scraper.get_organization_info(org_name)
+        org_data = await scraper.get_organization_info(org_name)
         
         if "error" in org_data:
             raise HTTPException(status_code=404, detail=org_data["error"])
@@ -33,17 +34,33 @@ async def get_organization_info(org_name: str):
 
 @router.get("/{org_name}/repos", response_model=APIResponse)
 async def get_organization_repositories(
+    request: Request,
     org_name: str,
-    page: int = Query(1, ge=1, description="Page number")
+    page: int = Query(1, ge=1, description="Page number"),
+    include_readme: str = Query("full", regex="^(false|lazy|full)$", description="README handling (false, lazy, full)"),
+    all_pages: bool = Query(False, description="Fetch every page"),
+    max_pages: Optional[int] = Query(None, ge=1, description="Fetch pages 1..max_pages"),
+    scraper: AsyncGitHubScraper = Depends(get_scraper)
 ):
     """
     Get organization repositories
     
     - **org_name**: Organization name
     - **page**: Page number for pagination
+    - **include_readme**: Skip READMEs (false), link to the README endpoint (lazy) or inline them (full)
+    - **all_pages** / **max_pages**: Fetch every page (or the first max_pages) concurrently and merge them, ignoring page
+
+    With `Accept: application/x-ndjson` or `text/event-stream` every page is streamed instead.
     """
+    if stream_format(request):
+        return stream_response(scraper.iter_user_repositories(org_name, include_readme, max_pages), request)
+
     try:
-        repos = scraper.get_user_repositories(org_name, page)  # Same method works for orgs
+        # Same methods work for orgs
+        if all_pages or max_pages:
+            repos = await scraper.get_all_user_repositories(org_name, include_readme, max_pages)
+        else:
+            repos = await scraper.get_user_repositories(org_name, page, include_readme)
         
         return APIResponse(
             success=True,
@@ -57,6 +74,23 @@ async def get_organization_repositories(
             message="Failed to fetch organization repositories"
         )
 
+@router.get("/{org_name}/repos/stream")
+async def stream_organization_repositories(
+    request: Request,
+    org_name: str,
+    include_readme: str = Query("lazy", regex="^(false|lazy|full)$", description="README handling (false, lazy, full)"),
+    max_pages: Optional[int] = Query(None, ge=1, description="Stop after this many pages"),
+    scraper: AsyncGitHubScraper = Depends(get_scraper)
+):
+    """
+    Stream all of an organization's repositories as NDJSON (or SSE with `Accept: text/event-stream`)
+
+    - **org_name**: Organization name
+    - **include_readme**: Skip READMEs (false), link to the README endpoint (lazy) or inline them (full)
+    - **max_pages**: Stop after this many pages
+    """
+    return stream_response(scraper.iter_user_repositories(org_name, include_readme, max_pages), request)
+
 @router.get("/{org_name}/members", response_model=APIResponse)
 async def get_organization_members(org_name: str):
     """
@@ -1,13 +1,14 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from typing import Optional, List
 from models.github_models import APIResponse, GitHubRepository
-from services.github_scraper import GitHubScraper
+from services.github_scraper import AsyncGitHubScraper
+from routes.dependencies import get_scraper
+from routes.streaming import stream_format, stream_response
 
 router = APIRouter(prefix="/api/repos", tags=["Repositories"])
-scraper = GitHubScraper()
 
 @router.get("/{username}/{repo_name}", response_model=APIResponse)
-async def get_repository_info(username: str, repo_name: str):
+async def get_repository_info(username: str, repo_name: str, scraper: AsyncGitHubScraper = Depends(get_scraper)):
     """
     Get detailed repository information
     
@@ -15,7 +16,7 @@ async def get_repository_info(username: str, repo_name: str):
     - **repo_name**: Repository name
     """
     try:
-        repo_data = scraper.get_repository_info(username, repo_name)
+        repo_data = await scraper.get_repository_info(username, repo_name)
         
         if "error" in repo_data:
             raise HTTPException(status_code=404, detail=repo_data["error"])
@@ -33,15 +34,21 @@ async def get_repository_info(username: str, repo_name: str):
         )
 
 @router.get("/{username}/{repo_name}/readme", response_model=APIResponse)
-async def get_repository_readme(username: str, repo_name: str):
+async def get_repository_readme(
+    username: str,
+    repo_name: str,
+    branch: Optional[str] = Query(None, description="Branch to read the README from (defaults to main/master)"),
+    scraper: AsyncGitHubScraper = Depends(get_scraper)
+):
     """
     Get repository README content
     
     - **username**: Repository owner's username
     - **repo_name**: Repository name
+    - **branch**: Branch to read the README from (optional)
     """
     try:
-        readme_content = scraper.get_repository_readme(username, repo_name)
+        readme_content = await scraper.get_repository_readme(username, repo_name, branch)
         
         if not readme_content:
             raise HTTPException(status_code=404, detail="README not found")
@@ -59,7 +66,7 @@ async def get_repository_readme(username: str, repo_name: str):
         )
 
 @router.get("/{username}/{repo_name}/languages", response_model=APIResponse)
-async def get_repository_languages(username: str, repo_name: str):
+async def get_repository_languages(username: str, repo_name: str, scraper: AsyncGitHubScraper = Depends(get_scraper)):
     """
     Get repository programming languages
     
@@ -67,7 +74,7 @@ async def get_repository_languages(username: str, repo_name: str):
     - **repo_name**: Repository name
     """
     try:
-        languages = scraper.get_repository_languages(username, repo_name)
+        languages = await scraper.get_repository_languages(username, repo_name)
         
         return APIResponse(
             success=True,
@@ -83,9 +90,13 @@ async def get_repository_languages(username: str, repo_name: str):
 
 @router.get("/{username}/{repo_name}/commits", response_model=APIResponse)
 async def get_repository_commits(
+    request: Request,
     username: str, 
     repo_name: str,
-    page: int = Query(1, ge=1, description="Page number")
+    page: int = Query(1, ge=1, description="Page number"),
+    all_pages: bool = Query(False, description="Fetch every page"),
+    max_pages: Optional[int] = Query(None, ge=1, description="Fetch pages 1..max_pages"),
+    scraper: AsyncGitHubScraper = Depends(get_scraper)
 ):
     """
     Get repository commits
@@ -93,9 +104,18 @@ async def get_repository_commits(
     - **username**: Repository owner's username
     - **repo_name**: Repository name
     - **page**: Page number for pagination
+    - **all_pages** / **max_pages**: Fetch every page (or the first max_pages) concurrently and merge them, ignoring page
+
+    With `Accept: application/x-ndjson` or `text/event-stream` every page is streamed instead.
     """
+    if stream_format(request):
+        return stream_response(scraper.iter_repository_commits(username, repo_name, max_pages), request)
+
     try:
-        commits = scraper.get_repository_commits(username, repo_name, page)
+        if all_pages or max_pages:
+            commits = await scraper.get_all_repository_commits(username, repo_name, max_pages)
+        else:
+            commits = await scraper.get_repository_commits(username, repo_name, page)
         
         return APIResponse(
             success=True,
@@ -109,11 +129,29 @@ async def get_repository_commits(
             message="Failed to fetch commits"
         )
 
+@router.get("/{username}/{repo_name}/commits/stream")
+async def stream_repository_commits(
+    request: Request,
+    username: str,
+    repo_name: str,
+    max_pages: Optional[int] = Query(None, ge=1, description="Stop after this many pages"),
+    scraper: AsyncGitHubScraper = Depends(get_scraper)
+):
+    """
+    Stream all repository commits as NDJSON (or SSE with `Accept: text/event-stream`)
+
+    - **username**: Repository owner's username
+    - **repo_name**: Repository name
+    - **max_pages**: Stop after this many pages
+    """
+    return stream_response(scraper.iter_repository_commits(username, repo_name, max_pages), request)
+
 @router.get("/{username}/{repo_name}/issues", response_model=APIResponse)
 async def get_repository_issues(
     username: str, 
     repo_name: str,
-    state: str = Query("open", regex="^(open|closed|all)$", description="Issue state")
+    state: str = Query("open", regex="^(open|closed|all)$", description="Issue state"),
+    scraper: AsyncGitHubScraper = Depends(get_scraper)
 ):
     """
     Get repository issues
@@ -123,7 +161,7 @@ async def get_repository_issues(
     - **state**: Issue state (open, closed, all)
     """
     try:
-        issues = scraper.get_repository_issues(username, repo_name, state)
+        issues = await scraper.get_repository_issues(username, repo_name, state)
         
         return APIResponse(
             success=True,
@@ -1,16 +1,17 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import Optional, List
 from models.github_models import APIResponse
-from services.github_scraper import GitHubScraper
+from services.github_scraper import AsyncGitHubScraper
+from routes.dependencies import get_scraper
 
 router = APIRouter(prefix="/api/search", tags=["Search"])
-scraper = GitHubScraper()
 
 @router.get("/repositories", response_model=APIResponse)
 async def search_repositories(
     q: str = Query(..., description="Search query"),
     sort: str = Query("stars", regex="^(stars|forks|updated)$", description="Sort by"),
-    order: str = Query("desc", regex="^(asc|desc)$", description="Sort order")
+    order: str = Query("desc", regex="^(asc|desc)$", description="Sort order"),
+    scraper: AsyncGitHubScraper = Depends(get_scraper)
 ):
     """
     Search GitHub repositories
@@ -20,7 +21,7 @@ async def search_repositories(
     - **order**: Sort order (asc, desc)
     """
     try:
-        repositories = scraper.search_repositories(q, sort, order)
+        repositories = await scraper.search_repositories(q, sort, order)
         
         return APIResponse(
             success=True,
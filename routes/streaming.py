@@ -0,0 +1,44 @@
+import json
+from typing import Any, AsyncIterator, Optional
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+NDJSON = "application/x-ndjson"
+SSE = "text/event-stream"
+
+def stream_format(request: Request) -> Optional[str]:
+    """Streaming media type the client asked for in its Accept header, if any"""
+    accept = request.headers.get("accept", "")
+    for media_type in (NDJSON, SSE):
+        if media_type in accept:
+            return media_type
+    return None
+
+async def _encode(items: AsyncIterator[Any], media_type: str) -> AsyncIterator[str]:
+    sse = media_type == SSE
+    try:
+        async for item in items:
+            line = json.dumps(item, default=str)
+            yield f"data: {line}\n\n" if sse else f"{line}\n"
+    except Exception as e:
+        # Headers are already sent, so the failure goes in-band as the last message
+        error = json.dumps({"error": str(e)})
+        yield f"event: error\ndata: {error}\n\n" if sse else f"{error}\n"
+    else:
+        if sse:
+            yield "event: end\ndata: {}\n\n"
+
+def stream_response(items: AsyncIterator[Any], request: Request) -> StreamingResponse:
+    """
+    Send items one JSON document at a time as they are produced.
+
+    NDJSON (one object per line) unless the client accepts text/event-stream,
+    in which case every item is an SSE data message and an 'end' event closes
+    the stream.
+    """
+    media_type = stream_format(request) or NDJSON
+    return StreamingResponse(
+        _encode(items, media_type),
+        media_type=media_type,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
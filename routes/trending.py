@@ -1,29 +1,55 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import Optional, List
+from datetime import datetime, timezone
 from models.github_models import APIResponse
-from services.github_scraper import GitHubScraper
+from services.github_scraper import AsyncGitHubScraper
+from services.trending import TrendingSnapshots, parse_timestamp
+from routes.dependencies import get_scraper, get_trending_snapshots
 
 router = APIRouter(prefix="/api/trending", tags=["Trending"])
-scraper = GitHubScraper()
 
 @router.get("/repositories", response_model=APIResponse)
 async def get_trending_repositories(
     language: str = Query("", description="Programming language filter"),
-    since: str = Query("daily", regex="^(daily|weekly|monthly)$", description="Time period")
+    since: str = Query("daily", regex="^(daily|weekly|monthly)$", description="Time period"),
+    at: Optional[str] = Query(None, description="Trending as of this time (unix seconds or ISO 8601)"),
+    scraper: AsyncGitHubScraper = Depends(get_scraper),
+    snapshots: TrendingSnapshots = Depends(get_trending_snapshots)
 ):
     """
     Get trending GitHub repositories
     
     - **language**: Programming language filter (optional)
     - **since**: Time period (daily, weekly, monthly)
+    - **at**: Serve the snapshot that was current at this time (optional)
+
+    Snapshotted languages are served from the newest snapshot; others are scraped on demand.
     """
     try:
-        repositories = scraper.get_trending_repositories(language, since)
-        
+        snapshot = None
+        if at is not None:
+            snapshot = await snapshots.get(language, since, parse_timestamp(at))
+            if snapshot is None:
+                return APIResponse(
+                    success=False,
+                    error=f"No trending snapshot for '{language}' ({since}) at {at}",
+                    message="Failed to fetch trending repositories"
+                )
+        elif snapshots.covers(language):
+            snapshot = await snapshots.get(language, since)
+
+        if snapshot is None:
+            repositories = await scraper.get_trending_repositories(language, since)
+            message = f"Found {len(repositories)} trending repositories"
+        else:
+            repositories = snapshot["repositories"]
+            taken_at = datetime.fromtimestamp(snapshot["taken_at"], timezone.utc).isoformat()
+            message = f"Found {len(repositories)} trending repositories (snapshot from {taken_at})"
+
         return APIResponse(
             success=True,
             data=repositories,
-            message=f"Found {len(repositories)} trending repositories"
+            message=message
         )
     except Exception as e:
         return APIResponse(
@@ -58,16 +84,25 @@ async def get_trending_developers(
         )
 
 @router.get("/languages", response_model=APIResponse)
-async def get_trending_languages():
+async def get_trending_languages(
+    since: str = Query("daily", regex="^(daily|weekly|monthly)$", description="Time period"),
+    days: float = Query(7, gt=0, le=90, description="How many days of snapshots to aggregate"),
+    snapshots: TrendingSnapshots = Depends(get_trending_snapshots)
+):
     """
     Get trending programming languages
+
+    - **since**: Time period of the trending pages aggregated (daily, weekly, monthly)
+    - **days**: How many days of snapshots to aggregate
+
+    Languages are ranked by the stars gained by their trending repositories.
     """
     try:
-        # Placeholder for trending languages
+        report = await snapshots.languages_report(since, days)
         return APIResponse(
             success=True,
-            data={"message": "Trending languages endpoint - requires enhanced scraping"},
-            message="Trending languages requires additional scraping implementation"
+            data=report,
+            message=f"Ranked {len(report['languages'])} languages from {report['snapshots']} trending snapshots"
         )
     except Exception as e:
         return APIResponse(
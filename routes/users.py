@@ -2,23 +2,24 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from typing import Optional, List
 from models.github_models import APIResponse, GitHubUser
-from services.github_scraper import GitHubScraper
+from services.github_scraper import AsyncGitHubScraper
+from routes.dependencies import get_scraper
+from routes.streaming import stream_format, stream_response
 
 router = APIRouter(prefix="/api/users", tags=["Users"])
-scraper = GitHubScraper()
 
 @router.get("/{username}", response_model=APIResponse)
-async def get_user_profile(username: str):
+async def get_user_profile(username: str, scraper: AsyncGitHubScraper = Depends(get_scraper)):
     """
     Get GitHub user profile information
     
     - **username**: GitHub username
     """
     try:
-        user_data = scraper.get_user_profile(username)
+        user_data = await scraper.get_user_profile(username)
         
         if "error" in user_data:
             raise HTTPException(status_code=404, detail=user_data["error"])
@@ -37,17 +38,32 @@ async def get_user_profile(username: str):
 
 @router.get("/{username}/repos", response_model=APIResponse)
 async def get_user_repositories(
+    request: Request,
     username: str,
-    page: int = Query(1, ge=1, description="Page number")
+    page: int = Query(1, ge=1, description="Page number"),
+    include_readme: str = Query("full", regex="^(false|lazy|full)$", description="README handling (false, lazy, full)"),
+    all_pages: bool = Query(False, description="Fetch every page"),
+    max_pages: Optional[int] = Query(None, ge=1, description="Fetch pages 1..max_pages"),
+    scraper: AsyncGitHubScraper = Depends(get_scraper)
 ):
     """
     Get user's public repositories
     
     - **username**: GitHub username
     - **page**: Page number for pagination
+    - **include_readme**: Skip READMEs (false), link to the README endpoint (lazy) or inline them (full)
+    - **all_pages** / **max_pages**: Fetch every page (or the first max_pages) concurrently and merge them, ignoring page
+
+    With `Accept: application/x-ndjson` or `text/event-stream` every page is streamed instead.
     """
+    if stream_format(request):
+        return stream_response(scraper.iter_user_repositories(username, include_readme, max_pages), request)
+
     try:
-        repos = scraper.get_user_repositories(username, page)
+        if all_pages or max_pages:
+            repos = await scraper.get_all_user_repositories(username, include_readme, max_pages)
+        else:
+            repos = await scraper.get_user_repositories(username, page, include_readme)
         
         return APIResponse(
             success=True,
@@ -61,6 +77,23 @@ async def get_user_repositories(
             message="Failed to fetch user repositories"
         )
 
+@router.get("/{username}/repos/stream")
+async def stream_user_repositories(
+    request: Request,
+    username: str,
+    include_readme: str = Query("lazy", regex="^(false|lazy|full)$", description="README handling (false, lazy, full)"),
+    max_pages: Optional[int] = Query(None, ge=1, description="Stop after this many pages"),
+    scraper: AsyncGitHubScraper = Depends(get_scraper)
+):
+    """
+    Stream all of a user's public repositories as NDJSON (or SSE with `Accept: text/event-stream`)
+
+    - **username**: GitHub username
+    - **include_readme**: Skip READMEs (false), link to the README endpoint (lazy) or inline them (full)
+    - **max_pages**: Stop after this many pages
+    """
+    return stream_response(scraper.iter_user_repositories(username, include_readme, max_pages), request)
+
 @router.get("/{username}/followers", response_model=APIResponse)
 async def get_user_followers(username: str):
     """
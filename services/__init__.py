@@ -1 +1 @@
-from .github_scraper import GitHubScraper
+from .github_scraper import GitHubScraper, AsyncGitHubScraper
@@ -0,0 +1,282 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# Returned by the cache tiers on a miss, so that None can be cached as a value
+# (e.g. "this repository has no README").
+MISSING = object()
+
+# Default time-to-live in seconds for each kind of scraped result. Override
+# any of them with CACHE_TTL_<KIND>, e.g. CACHE_TTL_TRENDING=120.
+DEFAULT_TTLS = {
+    'trending': 300,
+    'search': 300,
+    'commits': 300,
+    'issues': 300,
+    'listing': 600,
+    'repository': 600,
+    'readme': 3600,
+    # READMEs keyed by commit SHA never change, so they only expire to free space
+    'readme_commit': 7 * 24 * 3600,
+    'profile': 3600,
+    'organization': 3600,
+}
+
+class MemoryCache:
+    """In-process LRU cache bounded by the total size of the stored values in bytes"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISSING
+
+        value, expires_at = entry
+        if expires_at <= time.time():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return MISSING
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: bytes, expires_at: float):
+        if key in self._entries:
+            self._remove(key)
+        if len(value) > self.max_bytes:
+            return
+
+        self._entries[key] = (value, expires_at)
+        self.bytes += len(value)
+        while self.bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def delete(self, key: str):
+        if key in self._entries:
+            self._remove(key)
+
+    def _remove(self, key: str):
+        value, _ = self._entries.pop(key)
+        self.bytes -= len(value)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'entries': len(self._entries),
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
+
+class SQLiteCache:
+    """On-disk cache tier that survives restarts"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_expires_at ON cache (expires_at)")
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Tuple[Any, float]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ? AND expires_at > ?",
+                (key, time.time())
+            ).fetchone()
+        if row is None:
+            self.misses += 1
+            return MISSING, 0.0
+        self.hits += 1
+        return row[0], row[1]
+
+    def set(self, key: str, value: bytes, expires_at: float):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at)
+            )
+            self._conn.commit()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+            self._conn.commit()
+        return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        return {
+            'path': self.path,
+            'entries': entries,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+class ResponseCache:
+    """
+    Two-tier cache for scraped results.
+
+    Values are stored JSON-encoded, which both gives the memory tier an exact
+    byte size to account against and hands every caller its own copy.
+    Lookups go memory first, then disk; disk hits are promoted to memory.
+
+    Each entry is fresh for its kind's TTL. Every entry is kept for
+    stale_while_revalidate seconds beyond that so it can still be served while
+    it is refreshed in the background, and entries that carry HTTP validators
+    (ETag / Last-Modified) are kept for stale_ttl, so they can be revalidated
+    with a conditional request instead of refetched. Expired entries leave
+    the memory tier as they are read or evicted; the disk tier is purged of
+    them every purge_interval seconds by run().
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        disk_path: Optional[str] = None,
+        ttls: Optional[Dict[str, int]] = None,
+        stale_ttl: int = 24 * 3600,
+        stale_while_revalidate: int = 300,
+        purge_interval: float = 3600.0
+    ):
+        self.memory = MemoryCache(max_bytes)
+        self.disk = SQLiteCache(disk_path) if disk_path else None
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.stale_ttl = stale_ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self.purge_interval = purge_interval
+        self.revalidations = 0
+        self.not_modified = 0
+        self.purged = 0
+
+    @classmethod
+    def from_env(cls) -> "ResponseCache":
+        ttls = {}
+        for kind in DEFAULT_TTLS:
+            value = os.getenv(f'CACHE_TTL_{kind.upper()}')
+            if value:
+                ttls[kind] = int(value)
+        return cls(
+            max_bytes=int(os.getenv('CACHE_MAX_BYTES', 64 * 1024 * 1024)),
+            disk_path=os.getenv('CACHE_DB_PATH') or None,
+            ttls=ttls,
+            stale_ttl=int(os.getenv('CACHE_STALE_TTL', 24 * 3600)),
+            stale_while_revalidate=int(os.getenv('CACHE_STALE_WHILE_REVALIDATE', 300)),
+            purge_interval=float(os.getenv('CACHE_PURGE_INTERVAL', 3600))
+        )
+
+    def ttl_for(self, kind: str) -> int:
+        return self.ttls.get(kind, 300)
+
+    async def get_entry(self, key: str) -> Any:
+        """
+        Return the stored entry for key, fresh or not, or MISSING.
+
+        An entry is a dict with 'value', 'fresh_until' and 'validators'.
+        """
+        encoded = self.memory.get(key)
+        if encoded is MISSING and self.disk:
+            encoded, expires_at = await asyncio.to_thread(self.disk.get, key)
+            if encoded is not MISSING:
+                self.memory.set(key, encoded, expires_at)
+        if encoded is MISSING:
+            return MISSING
+        return json.loads(encoded)
+
+    async def get(self, key: str) -> Any:
+        """Return the value for key if it is still fresh, otherwise MISSING"""
+        entry = await self.get_entry(key)
+        if entry is MISSING or entry['fresh_until'] <= time.time():
+            return MISSING
+        return entry['value']
+
+    async def set(self, key: str, value: Any, kind: str, validators: Optional[Dict[str, Any]] = None):
+        fresh_until = time.time() + self.ttl_for(kind)
+        expires_at = fresh_until + max(self.stale_while_revalidate, self.stale_ttl if validators else 0)
+        entry = {'value': value, 'fresh_until': fresh_until, 'validators': validators or {}}
+        encoded = json.dumps(entry, separators=(',', ':')).encode('utf-8')
+        self.memory.set(key, encoded, expires_at)
+        if self.disk:
+            await asyncio.to_thread(self.disk.set, key, encoded, expires_at)
+
+    async def delete(self, key: str):
+        self.memory.delete(key)
+        if self.disk:
+            await asyncio.to_thread(self.disk.delete, key)
+
+    async def purge_expired(self) -> int:
+        """Delete the expired entries of the disk tier; the number deleted"""
+        if not self.disk:
+            return 0
+        purged = await asyncio.to_thread(self.disk.purge_expired)
+        self.purged += purged
+        return purged
+
+    async def run(self):
+        """Purge loop, started by the lifespan handler in main.py; off without a disk tier or with CACHE_PURGE_INTERVAL=0"""
+        if not self.disk or self.purge_interval <= 0:
+            return
+        while True:
+            await asyncio.sleep(self.purge_interval)
+            try:
+                await self.purge_expired()
+            except Exception as e:
+                print(f"⚠️ Cache purge failed: {e}")
+
+    def record_revalidation(self, not_modified: bool):
+        self.revalidations += 1
+        if not_modified:
+            self.not_modified += 1
+
+    def close(self):
+        if self.disk:
+            self.disk.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'memory': self.memory.stats(),
+            'disk': self.disk.stats() if self.disk else None,
+            'revalidations': self.revalidations,
+            'not_modified': self.not_modified,
+            'purged': self.purged,
+            'stale_while_revalidate': self.stale_while_revalidate,
+            'ttls': self.ttls,
+        }
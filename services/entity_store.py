@@ -0,0 +1,421 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Type
+
+from pydantic import BaseModel
+
+from models.github_models import GitHubCommit, GitHubIssue, GitHubRepository, GitHubUser
+
+# Names are matched case-insensitively, like on GitHub
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS users ("
+    "username TEXT NOT NULL COLLATE NOCASE PRIMARY KEY, updated_at TEXT, synced_version TEXT, "
+    "fetched_at REAL NOT NULL, data TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS repositories ("
+    "full_name TEXT NOT NULL COLLATE NOCASE PRIMARY KEY, owner TEXT NOT NULL COLLATE NOCASE, language TEXT, "
+    "stars INTEGER, updated_at TEXT, synced_version TEXT, fetched_at REAL NOT NULL, data TEXT NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS repositories_owner ON repositories (owner, updated_at)",
+    "CREATE INDEX IF NOT EXISTS repositories_language ON repositories (language, stars)",
+    "CREATE INDEX IF NOT EXISTS repositories_stars ON repositories (stars)",
+    "CREATE TABLE IF NOT EXISTS commits ("
+    "repository TEXT NOT NULL COLLATE NOCASE, sha TEXT NOT NULL, author TEXT COLLATE NOCASE, date TEXT, "
+    "fetched_at REAL NOT NULL, data TEXT NOT NULL, PRIMARY KEY (repository, sha))",
+    "CREATE INDEX IF NOT EXISTS commits_date ON commits (repository, date)",
+    "CREATE INDEX IF NOT EXISTS commits_author ON commits (author, date)",
+    "CREATE TABLE IF NOT EXISTS issues ("
+    "repository TEXT NOT NULL COLLATE NOCASE, number INTEGER NOT NULL, state TEXT NOT NULL, "
+    "author TEXT COLLATE NOCASE, updated_at TEXT, fetched_at REAL NOT NULL, data TEXT NOT NULL, "
+    "PRIMARY KEY (repository, number))",
+    "CREATE INDEX IF NOT EXISTS issues_state ON issues (repository, state, number)",
+    "CREATE INDEX IF NOT EXISTS issues_author ON issues (author)",
+]
+
+TABLES = ['users', 'repositories', 'commits', 'issues']
+
+ISSUE_STATES = ['open', 'closed']
+
+def required_fields(model: Type[BaseModel]) -> List[str]:
+    return [name for name, field in model.model_fields.items() if field.is_required()]
+
+def merge(stored: Dict[str, Any], scraped: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    stored updated with scraped, except where scraped has no value.
+
+    Pages show different parts of an entity (a listing has no topics, a
+    repository page no update time), so each scrape fills in what it knows.
+    """
+    merged = dict(stored)
+    merged.update((name, value) for name, value in scraped.items() if value is not None)
+    return merged
+
+def _encode(data: Dict[str, Any]) -> str:
+    return json.dumps(data, separators=(',', ':'))
+
+class EntityStore:
+    """
+    Users, repositories, commits and issues as last scraped, in SQLite.
+
+    Rows are keyed like the models in models/github_models.py (username,
+    owner/name, repository + SHA, repository + number); items missing a field
+    their model requires are rejected. The full scraped data is kept as JSON
+    next to indexed columns for lookups by owner, language, stars, author and
+    state.
+
+    synced_version records which upstream version the stored details are of:
+    for a repository, the updated_at it had when its page was last fetched;
+    for a user, the newest updated_at among their repositories when their
+    profile was. EntitySync compares them to find what changed upstream.
+    """
+
+    def __init__(self, path: str = ':memory:'):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ':memory:':
+            # Readers do not block the writer, and commits skip the fsync per transaction
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in SCHEMA:
+            self._conn.execute(statement)
+        self._conn.commit()
+        self.writes = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["EntityStore"]:
+        """Store at ENTITY_DB_PATH, or None (no store) when it is unset"""
+        path = os.getenv('ENTITY_DB_PATH')
+        return cls(path) if path else None
+
+    def _valid(self, model: Type[BaseModel], items: List[Dict[str, Any]], *keys: str) -> List[Dict[str, Any]]:
+        fields = required_fields(model) + list(keys)
+        valid = [item for item in items if all(item.get(name) is not None for name in fields)]
+        self.rejected += len(items) - len(valid)
+        return valid
+
+    def _upsert(
+        self,
+        table: str,
+        key: List[str],
+        rows: List[Dict[str, Any]],
+        columns: Callable[[Dict[str, Any]], Dict[str, Any]]
+    ) -> int:
+        """
+        Merge every item into its stored row. rows are {key column: value, ...,
+        'data': item}; columns(merged data), called under the lock, gives the
+        other indexed columns.
+        """
+        if not rows:
+            return 0
+        where = ' AND '.join(f"{name} = ?" for name in key)
+        fetched_at = time.time()
+        with self._lock:
+            records = []
+            for row in rows:
+                keys = [row[name] for name in key]
+                stored = self._conn.execute(f"SELECT data FROM {table} WHERE {where}", keys).fetchone()
+                data = merge(json.loads(stored[0]), row['data']) if stored else row['data']
+                records.append({**{name: row[name] for name in key}, **columns(data), 'fetched_at': fetched_at, 'data': _encode(data)})
+            names = list(records[0])
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})",
+                [[record[name] for name in names] for record in records]
+            )
+            self._conn.commit()
+        self.writes += len(records)
+        return len(records)
+
+    def upsert_users(self, users: List[Dict[str, Any]]) -> int:
+        """Store scraped profiles, marking them in sync with their repositories as stored now"""
+        def columns(user):
+            latest = self._conn.execute(
+                "SELECT MAX(updated_at) FROM repositories WHERE owner = ?", (user['username'],)
+            ).fetchone()[0]
+            return {'updated_at': user.get('updated_at'), 'synced_version': latest or ''}
+
+        users = self._valid(GitHubUser, users)
+        return self._upsert('users', ['username'], [{'username': user['username'], 'data': user} for user in users], columns)
+
+    def upsert_repositories(self, repositories: List[Dict[str, Any]], details: bool = False) -> int:
+        """
+        Store scraped repositories. details marks them as fetched from their
+        own page (or the API) rather than a listing, in sync with their
+        current updated_at.
+        """
+        def columns(repo):
+            if details:
+                synced_version = repo.get('updated_at') or ''
+            else:
+                # Listings do not change which version the stored details are of
+                row = self._conn.execute(
+                    "SELECT synced_version FROM repositories WHERE full_name = ?", (repo['full_name'],)
+                ).fetchone()
+                synced_version = row[0] if row else None
+            return {
+                'owner': repo['full_name'].split('/')[0],
+                'language': repo.get('language'),
+                'stars': repo.get('stargazers_count'),
+                'updated_at': repo.get('updated_at'),
+                'synced_version': synced_version,
+            }
+
+        repositories = self._valid(GitHubRepository, repositories, 'full_name')
+        return self._upsert(
+            'repositories', ['full_name'], [{'full_name': repo['full_name'], 'data': repo} for repo in repositories], columns
+        )
+
+    def set_readme(self, full_name: str, content: Optional[str]) -> int:
+        """Store the README of an already stored repository (READMEs are fetched apart from the repository)"""
+        if not content:
+            return 0
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM repositories WHERE full_name = ?", (full_name,)).fetchone()
+            if not row:
+                return 0
+            data = merge(json.loads(row[0]), {'readme_content': content})
+            self._conn.execute("UPDATE repositories SET data = ? WHERE full_name = ?", (_encode(data), full_name))
+            self._conn.commit()
+        self.writes += 1
+        return 1
+
+    def upsert_commits(self, repository: str, commits: List[Dict[str, Any]]) -> int:
+        commits = self._valid(GitHubCommit, commits)
+        return self._upsert(
+            'commits',
+            ['repository', 'sha'],
+            [{'repository': repository, 'sha': commit['sha'], 'data': commit} for commit in commits],
+            lambda commit: {'author': commit.get('author'), 'date': commit.get('date')}
+        )
+
+    def upsert_issues(self, repository: str, issues: List[Dict[str, Any]]) -> int:
+        # Issues scraped from a state=all listing only know they are in 'all'
+        known = [issue for issue in issues if issue.get('state') in ISSUE_STATES]
+        self.rejected += len(issues) - len(known)
+        issues = self._valid(GitHubIssue, known)
+        return self._upsert(
+            'issues',
+            ['repository', 'number'],
+            [{'repository': repository, 'number': issue['number'], 'data': issue} for issue in issues],
+            lambda issue: {'state': issue['state'], 'author': issue.get('author'), 'updated_at': issue.get('updated_at')}
+        )
+
+    def _select(self, query: str, params: List[Any]) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def get_user(self, username: str) -> Optional[Dict[str, Any]]:
+        users = self._select("SELECT data FROM users WHERE username = ?", [username])
+        return users[0] if users else None
+
+    def get_repository(self, full_name: str) -> Optional[Dict[str, Any]]:
+        repositories = self._select("SELECT data FROM repositories WHERE full_name = ?", [full_name])
+        return repositories[0] if repositories else None
+
+    def repositories(
+        self,
+        owner: Optional[str] = None,
+        language: Optional[str] = None,
+        min_stars: int = 0,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Stored repositories matching every given filter, most starred first"""
+        conditions, params = ["COALESCE(stars, 0) >= ?"], [min_stars]
+        if owner is not None:
+            conditions.append("owner = ?")
+            params.append(owner)
+        if language is not None:
+            conditions.append("language = ? COLLATE NOCASE")
+            params.append(language)
+        return self._select(
+            f"SELECT data FROM repositories WHERE {' AND '.join(conditions)} ORDER BY stars DESC, full_name LIMIT ?",
+            params + [limit]
+        )
+
+    def commits(self, repository: str, author: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """Stored commits of repository (optionally by one author), newest first"""
+        if author is None:
+            return self._select(
+                "SELECT data FROM commits WHERE repository = ? ORDER BY date DESC LIMIT ?", [repository, limit]
+            )
+        return self._select(
+            "SELECT data FROM commits WHERE repository = ? AND author = ? ORDER BY date DESC LIMIT ?",
+            [repository, author, limit]
+        )
+
+    def issues(self, repository: str, state: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """Stored issues of repository (optionally in one state), newest first"""
+        if state is None:
+            return self._select(
+                "SELECT data FROM issues WHERE repository = ? ORDER BY number DESC LIMIT ?", [repository, limit]
+            )
+        return self._select(
+            "SELECT data FROM issues WHERE repository = ? AND state = ? ORDER BY number DESC LIMIT ?",
+            [repository, state, limit]
+        )
+
+    def owners(self) -> List[str]:
+        """Every user or organization with a stored profile or repository"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT owner FROM repositories UNION SELECT username FROM users ORDER BY 1"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def outdated_repositories(self, owner: str) -> List[str]:
+        """Full names of owner's repositories with stored details from before their current updated_at"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT full_name FROM repositories "
+                "WHERE owner = ? AND synced_version IS NOT NULL AND synced_version != COALESCE(updated_at, '')",
+                (owner,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def user_outdated(self, username: str) -> bool:
+        """True if username's profile is stored and one of their repositories changed since it was fetched"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT synced_version != COALESCE((SELECT MAX(updated_at) FROM repositories WHERE owner = ?), '') "
+                "FROM users WHERE username = ?",
+                (username, username)
+            ).fetchone()
+        return bool(row and row[0])
+
+    def commit_shas(self, repository: str) -> Set[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT sha FROM commits WHERE repository = ?", (repository,)).fetchall()
+        return {row[0] for row in rows}
+
+    def issue_numbers(self, repository: str, state: str) -> Set[int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT number FROM issues WHERE repository = ? AND state = ?", (repository, state)
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = {table: self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in TABLES}
+        return {
+            'path': self.path,
+            **counts,
+            'writes': self.writes,
+            'rejected': self.rejected,
+        }
+
+class EntitySync:
+    """
+    Keep the entity store in step with GitHub, fetching only what changed.
+
+    Each run re-reads the repository listing of every stored owner, which
+    updates the stored updated_at of their repositories. Only repositories
+    whose stored details are of an older version are fetched again, along
+    with their new commits (only where commits are stored) and issues (only
+    where issues are stored); a profile is fetched again
+    when one of its owner's repositories changed.
+
+    Listings are read through the response cache, so changes show up at most
+    the listing TTL late.
+    """
+
+    def __init__(self, scraper, store: Optional[EntityStore], interval: float = 3600.0):
+        self.scraper = scraper
+        self.store = store
+        self.interval = interval
+        self.runs = 0
+        self.failures = 0
+        self.refetched = {'users': 0, 'repositories': 0, 'commits': 0, 'issues': 0}
+
+    @classmethod
+    def from_env(cls, scraper) -> "EntitySync":
+        return cls(scraper, scraper.entities, interval=float(os.getenv('ENTITY_SYNC_INTERVAL', 3600)))
+
+    async def sync_repository(self, owner: str, repo_name: str):
+        full_name = f"{owner}/{repo_name}"
+        await self.scraper.forget_repository(owner, repo_name)
+        await self.scraper.get_repository_info(owner, repo_name)
+        self.refetched['repositories'] += 1
+
+        known = await asyncio.to_thread(self.store.commit_shas, full_name)
+        if known:
+            # Newest first: pages are read from upstream until one reaches a stored commit
+            for page in range(1, self.scraper.max_pages + 1):
+                await self.scraper.forget_commits_page(owner, repo_name, page)
+                listing = await self.scraper._repository_commits_page(owner, repo_name, page)
+                if listing is None:
+                    raise RuntimeError(f"Failed to fetch page {page} of the commits of {full_name}")
+                shas = [commit['sha'] for commit in listing['items']]
+                new = [sha for sha in shas if sha not in known]
+                self.refetched['commits'] += len(new)
+                if len(new) < len(shas) or not shas:
+                    break
+
+        stored_open = await asyncio.to_thread(self.store.issue_numbers, full_name, 'open')
+        stored_closed = await asyncio.to_thread(self.store.issue_numbers, full_name, 'closed')
+        if stored_open or stored_closed:
+            issues = await self.scraper.get_repository_issues(owner, repo_name, 'open')
+            self.refetched['issues'] += len(issues)
+            # Issues that are no longer open have to be read from the closed list to update their state
+            if stored_open - {issue['number'] for issue in issues}:
+                closed = await self.scraper.get_repository_issues(owner, repo_name, 'closed')
+                self.refetched['issues'] += len(closed)
+
+    async def sync_owner(self, owner: str):
+        # The listing is read from upstream and stored as it is read, bringing
+        # each repository's updated_at up to date
+        for page in range(1, self.scraper.max_pages + 1):
+            await self.scraper.forget_repositories_page(owner, page)
+        async for _ in self.scraper.iter_user_repositories(owner, 'false'):
+            pass
+
+        outdated = await asyncio.to_thread(self.store.outdated_repositories, owner)
+        for full_name in outdated:
+            await self.sync_repository(owner, full_name.split('/', 1)[1])
+
+        if await asyncio.to_thread(self.store.user_outdated, owner):
+            await self.scraper.forget_user(owner)
+            await self.scraper.get_user_profile(owner)
+            self.refetched['users'] += 1
+
+    async def sync_all(self):
+        owners = await asyncio.to_thread(self.store.owners)
+
+        async def sync(owner):
+            try:
+                await self.sync_owner(owner)
+            except Exception as e:
+                self.failures += 1
+                print(f"Entity sync failed for {owner}: {e}")
+
+        await self.scraper._fan_out(sync, owners)
+        self.runs += 1
+
+    async def run(self):
+        """Sync loop, started by the lifespan handler in main.py; off without a store or with ENTITY_SYNC_INTERVAL=0"""
+        if self.store is None or self.interval <= 0:
+            return
+        while True:
+            try:
+                await self.sync_all()
+            except Exception as e:
+                print(f"Entity sync failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'enabled': self.store is not None,
+            'interval': self.interval,
+            'runs': self.runs,
+            'failures': self.failures,
+            'refetched': dict(self.refetched),
+            'store': self.store.stats() if self.store else None,
+        }
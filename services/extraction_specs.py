@@ -0,0 +1,437 @@
+"""
+Declarative extraction specs for the pages the scraper parses.
+
+A spec says, per page type, which elements to build (strain), which elements
+are the records of a listing (items, and optionally rows within each item),
+and how each output field is read: a CSS selector, what to take from the
+matched element and a chain of named converters. Specs are compiled once -
+selectors with soupsieve, converters looked up by name - and reused for every
+page. They are not faster than the find/find_all chains they replaced (tree
+building dominates; see benchmarks/spec_benchmark.py): what they buy is that
+every page's selectors live in one place that can be changed at runtime.
+
+The defaults below can be overridden per page type by a JSON file of the same
+shape (EXTRACTION_SPECS_PATH). The file is re-read when it changes, so specs
+can be fixed when GitHub changes its markup without a redeploy; a file that
+fails to load or compile leaves the current specs in place.
+
+Field options:
+    select   CSS selector, relative to the row / item (default: the row itself)
+    from     'item' to select relative to the listing item instead of the row
+    value    'text' (default), 'attr:<name>', 'context:<name>' (an argument
+             of the parse call, e.g. the username) or 'match:<regex>' (the
+             first group of the regex in the page source, e.g. the JSON
+             payload GitHub embeds; no select)
+    contains only match elements whose text contains this (case-insensitive)
+    all      a list of every match instead of the first
+    entries  {'key': selector, 'value': selector}: a dict built from every
+             match, keyed by the key element's text, of the value element's
+             text (converted); matches missing either are skipped
+    convert  converter names applied in order; 'name:arg' passes an argument
+    const    a fixed value
+    default  used when nothing matched or a converter failed; without one
+             the field is left out
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urljoin
+
+import soupsieve
+
+from .text_parsing import first_digits, normalize_whitespace, parse_number
+from .html_parser import make_soup, strainer
+
+MISSING = object()
+
+DEFAULT_SPECS: Dict[str, Dict[str, Any]] = {
+    'profile': {
+        'strain': [
+            ['span', 'class', 'p-name'],
+            ['div', 'class', 'p-note'],
+            ['span', 'class', 'p-label'],
+            ['span', 'class', 'p-org'],
+            ['img', 'class', 'avatar'],
+            ['a', 'class', 'Link--secondary'],
+            ['a', 'data-tab-item', 'repositories'],
+        ],
+        'fields': {
+            'username': {'value': 'context:username'},
+            'name': {'select': 'span.p-name'},
+            'bio': {'select': 'div.p-note'},
+            'location': {'select': 'span.p-label'},
+            'company': {'select': 'span.p-org'},
+            'avatar_url': {'select': 'img.avatar', 'value': 'attr:src'},
+            'followers': {'select': 'a.Link--secondary', 'contains': 'followers', 'convert': ['first_word', 'number']},
+            'following': {'select': 'a.Link--secondary', 'contains': 'following', 'convert': ['first_word', 'number']},
+            'public_repos': {'select': 'a[data-tab-item="repositories"]', 'convert': ['first_digits', 'number']},
+        },
+    },
+    'repositories': {
+        'strain': [['div', 'class', 'col-10']],
+        'items': 'div.col-10',
+        'require': ['name'],
+        'fields': {
+            'name': {'select': 'a[itemprop="name codeRepository"]'},
+            'full_name': {'select': 'a[itemprop="name codeRepository"]', 'convert': ['format:{username}/{}']},
+            'description': {'select': 'p[itemprop="about"]', 'convert': ['normalize'], 'default': None},
+            'url': {'select': 'a[itemprop="name codeRepository"]', 'value': 'attr:href', 'convert': ['url']},
+            'language': {'select': 'span[itemprop="programmingLanguage"]', 'default': None},
+            'stargazers_count': {'select': 'a[href*="stargazers"]', 'convert': ['number'], 'default': 0},
+            'forks_count': {'select': 'a[href*="forks"]', 'convert': ['number'], 'default': 0},
+            'updated_at': {'select': 'relative-time', 'value': 'attr:datetime', 'default': None},
+            'readme_content': {'const': None},
+        },
+    },
+    'repository': {
+        'strain': [
+            ['p', 'class', 'f4'],
+            ['div', 'id', 'repo-stats-counter'],
+            ['div', 'class', 'BorderGrid-row'],
+            ['a', 'class', 'topic-tag'],
+        ],
+        'fields': {
+            'description': {'select': 'p.f4'},
+            'stargazers_count': {'select': 'div#repo-stats-counter a[href*="stargazers"]', 'convert': ['number']},
+            'forks_count': {'select': 'div#repo-stats-counter a[href*="forks"]', 'convert': ['number']},
+            # The sidebar's first row lists the languages
+            'language': {'select': 'div.BorderGrid-row:nth-child(1 of div.BorderGrid-row) span.color-fg-default'},
+            'topics': {'select': 'a.topic-tag', 'all': True},
+            'languages': {
+                'select': 'div.BorderGrid-row:nth-child(1 of div.BorderGrid-row) a.d-inline-flex',
+                'entries': {'key': 'span.color-fg-default', 'value': 'span.percent'},
+                'convert': ['percent'],
+            },
+            'default_branch': {'value': 'match:"defaultBranch":"([^"]+)"'},
+            'latest_commit': {'value': 'match:"currentOid":"([0-9a-f]{40})"'},
+        },
+    },
+    'commits': {
+        'strain': [['div', 'class', 'TimelineItem-body']],
+        'items': 'div.TimelineItem-body',
+        'rows': 'a.Link--primary',
+        'require': ['sha'],
+        'fields': {
+            'sha': {'value': 'attr:href', 'convert': ['last_segment']},
+            'message': {},
+            'author': {'select': 'a.commit-author', 'from': 'item', 'default': None},
+            'date': {'select': 'relative-time', 'from': 'item', 'value': 'attr:datetime', 'default': None},
+            'url': {'value': 'attr:href', 'convert': ['url']},
+        },
+    },
+    'issues': {
+        'strain': [['div', 'class', 'Box-row']],
+        'items': 'div.Box-row',
+        'require': ['number'],
+        'fields': {
+            'number': {'select': 'a.Link--primary', 'value': 'attr:href', 'convert': ['last_segment', 'int']},
+            'title': {'select': 'a.Link--primary'},
+            'state': {'value': 'context:state'},
+            'author': {'select': 'a.Link--muted', 'default': None},
+            'labels': {'select': 'a.IssueLabel', 'all': True},
+            'url': {'select': 'a.Link--primary', 'value': 'attr:href', 'convert': ['url']},
+        },
+    },
+    'organization': {
+        'strain': [
+            ['h1', 'class', 'h2'],
+            ['div', 'class', 'f4'],
+            ['span', 'class', 'p-label'],
+            ['a', 'class', 'Link--primary'],
+            ['img', 'class', 'avatar'],
+        ],
+        'fields': {
+            'name': {'value': 'context:org_name'},
+            'display_name': {'select': 'h1.h2'},
+            'description': {'select': 'div.f4'},
+            'location': {'select': 'span.p-label'},
+            'blog': {'select': 'a.Link--primary', 'value': 'attr:href'},
+            'avatar_url': {'select': 'img.avatar', 'value': 'attr:src'},
+        },
+    },
+    'search': {
+        'strain': [['div', 'class', 'f4']],
+        'items': 'div.f4',
+        'require': ['full_name'],
+        'fields': {
+            'name': {'select': 'a', 'value': 'attr:href', 'convert': ['segment:1']},
+            'full_name': {'select': 'a', 'value': 'attr:href', 'convert': ['repo_path']},
+            'url': {'select': 'a', 'value': 'attr:href', 'convert': ['url']},
+            'owner': {'select': 'a', 'value': 'attr:href', 'convert': ['segment:0']},
+        },
+    },
+    'trending': {
+        'strain': [['article', 'class', 'Box-row']],
+        'items': 'article.Box-row',
+        'require': ['full_name'],
+        'fields': {
+            'name': {'select': 'h2 a', 'value': 'attr:href', 'convert': ['segment:1']},
+            'full_name': {'select': 'h2 a', 'value': 'attr:href', 'convert': ['repo_path']},
+            'description': {'select': 'p.col-9', 'convert': ['normalize'], 'default': None},
+            'url': {'select': 'h2 a', 'value': 'attr:href', 'convert': ['url']},
+            'language': {'select': 'span[itemprop="programmingLanguage"]', 'default': None},
+            'stars_today': {'select': 'span.d-inline-block', 'contains': 'stars today', 'convert': ['first_word', 'number'], 'default': 0},
+            'owner': {'select': 'h2 a', 'value': 'attr:href', 'convert': ['segment:0']},
+        },
+    },
+}
+
+def _segments(href: str) -> List[str]:
+    return href.strip('/').split('/')
+
+def _repo_path(href: str) -> str:
+    owner, name = _segments(href)[:2]
+    return f"{owner}/{name}"
+
+# Converters by name: (value, arg, context) -> converted value. Raising
+# ValueError / IndexError / KeyError / TypeError means "no value".
+CONVERTERS: Dict[str, Callable[[Any, Optional[str], Dict[str, Any]], Any]] = {
+    'number': lambda value, arg, context: parse_number(value),
+    'int': lambda value, arg, context: int(value),
+    'percent': lambda value, arg, context: float(value.replace('%', '')),
+    'first_word': lambda value, arg, context: value.split()[0],
+    'first_digits': lambda value, arg, context: first_digits(value),
+    'normalize': lambda value, arg, context: normalize_whitespace(value),
+    'last_segment': lambda value, arg, context: value.split('/')[-1],
+    'segment': lambda value, arg, context: _segments(value)[int(arg)],
+    'repo_path': lambda value, arg, context: _repo_path(value),
+    'url': lambda value, arg, context: urljoin(context['base_url'], value),
+    'format': lambda value, arg, context: arg.format(value, **context),
+}
+
+CONVERSION_ERRORS = (ValueError, IndexError, KeyError, TypeError)
+
+class CompiledField:
+    def __init__(self, name: str, spec: Dict[str, Any]):
+        unknown = set(spec) - {'select', 'from', 'value', 'contains', 'all', 'entries', 'convert', 'const', 'default'}
+        if unknown:
+            raise ValueError(f"Field '{name}' has unknown options: {', '.join(sorted(unknown))}")
+        self.name = name
+        self.selector = soupsieve.compile(spec['select']) if spec.get('select') else None
+        self.from_item = spec.get('from') == 'item'
+        self.value = spec.get('value', 'text')
+        if not (self.value == 'text' or self.value.startswith(('attr:', 'context:', 'match:'))):
+            raise ValueError(f"Field '{name}' has an unknown value '{self.value}'")
+        self.pattern = re.compile(self.value[6:]) if self.value.startswith('match:') else None
+        self.contains = spec['contains'].lower() if spec.get('contains') else None
+        entries = spec.get('entries')
+        self.entries = (soupsieve.compile(entries['key']), soupsieve.compile(entries['value'])) if entries else None
+        self.all = bool(spec.get('all')) or self.entries is not None
+        self.converters = []
+        for converter in spec.get('convert', []):
+            converter_name, _, arg = converter.partition(':')
+            if converter_name not in CONVERTERS:
+                raise ValueError(f"Field '{name}' uses an unknown converter '{converter_name}'")
+            self.converters.append((CONVERTERS[converter_name], arg or None))
+        self.const = spec.get('const', MISSING)
+        self.default = spec.get('default', MISSING)
+        # Fields that match the same elements share one selection per record
+        self.match_key = (spec.get('select'), self.from_item, self.contains, self.all)
+
+    def _read(self, element, context: Dict[str, Any]) -> Any:
+        if self.value == 'text':
+            return element.get_text().strip()
+        if self.value.startswith('attr:'):
+            value = element.get(self.value[5:])
+            return MISSING if value is None else value
+        return context.get(self.value[8:], MISSING)
+
+    def _search(self, source: str) -> Any:
+        match = self.pattern.search(source)
+        return match.group(1) if match else MISSING
+
+    def _convert(self, value: Any, context: Dict[str, Any]) -> Any:
+        try:
+            for converter, arg in self.converters:
+                value = converter(value, arg, context)
+        except CONVERSION_ERRORS:
+            return MISSING
+        return value
+
+    def _elements(self, scope):
+        if self.selector is None:
+            return [scope]
+        if self.contains is None and not self.all:
+            element = self.selector.select_one(scope)
+            return [element] if element is not None else []
+        elements = self.selector.select(scope)
+        if self.contains is not None:
+            elements = [element for element in elements if self.contains in element.get_text().lower()]
+        return elements
+
+    def extract(self, row, item, context: Dict[str, Any], matched: Dict[tuple, list], source: str) -> Any:
+        """
+        This field of the record at row (within item) of the page source;
+        matched holds the record's selections so far
+        """
+        if self.const is not MISSING:
+            return self.const
+        if self.value.startswith(('context:', 'match:')):
+            value = self._read(None, context) if self.pattern is None else self._search(source)
+            value = value if value is MISSING else self._convert(value, context)
+            return self.default if value is MISSING else value
+
+        elements = matched.get(self.match_key)
+        if elements is None:
+            elements = matched[self.match_key] = self._elements(item if self.from_item else row)
+        if self.entries:
+            key_selector, value_selector = self.entries
+            entries = {}
+            for element in elements:
+                key, value = key_selector.select_one(element), value_selector.select_one(element)
+                if key is not None and value is not None:
+                    value = self._convert(value.get_text().strip(), context)
+                    if value is not MISSING:
+                        entries[key.get_text().strip()] = value
+            return entries
+        if self.all:
+            values = (self._convert(self._read(element, context), context) for element in elements)
+            return [value for value in values if value is not MISSING]
+        if not elements:
+            return self.default
+        value = self._convert(self._read(elements[0], context), context)
+        return self.default if value is MISSING else value
+
+class CompiledSpec:
+    def __init__(self, page_type: str, spec: Dict[str, Any]):
+        self.page_type = page_type
+        self.strainer = strainer(*[tuple(target) for target in spec['strain']]) if spec.get('strain') else None
+        self.items = soupsieve.compile(spec['items']) if spec.get('items') else None
+        self.rows = soupsieve.compile(spec['rows']) if spec.get('rows') else None
+        self.require = list(spec.get('require', []))
+        self.fields = [CompiledField(name, field) for name, field in spec['fields'].items()]
+
+    def _record(self, row, item, context: Dict[str, Any], source: str) -> Optional[Dict[str, Any]]:
+        record = {}
+        matched: Dict[tuple, list] = {}
+        for field in self.fields:
+            value = field.extract(row, item, context, matched, source)
+            if value is not MISSING:
+                record[field.name] = value
+        if any(name not in record for name in self.require):
+            return None
+        return record
+
+    def extract(self, html: str, parser: Optional[str] = None, **context) -> Any:
+        """A dict for a single-record page, a list of dicts for a listing"""
+        soup = make_soup(html, parser, self.strainer)
+        if self.items is None:
+            return self._record(soup, soup, context, html) or {}
+
+        records = []
+        for item in self.items.select(soup):
+            for row in (self.rows.select(item) if self.rows else [item]):
+                record = self._record(row, item, context, html)
+                if record is not None:
+                    records.append(record)
+        return records
+
+def compile_specs(specs: Dict[str, Dict[str, Any]]) -> Dict[str, CompiledSpec]:
+    return {page_type: CompiledSpec(page_type, spec) for page_type, spec in specs.items()}
+
+def spec_fingerprint(overrides: Dict[str, Dict[str, Any]]) -> str:
+    """Short content hash of the spec overrides ({} for the defaults)"""
+    return hashlib.sha1(json.dumps(overrides, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+
+class SpecRegistry:
+    """
+    The compiled specs in use, with hot reloading of the override file.
+
+    The file is checked for changes at most every check_interval seconds,
+    from whichever process parses pages, so parse pool workers pick up a
+    new file too. fingerprint identifies the specs in use by content, so it
+    is the same in every process that loaded the same file; the scraper
+    records it with each cached result and hands it to the workers, which
+    reload at once when theirs differs.
+    """
+
+    def __init__(self, path: Optional[str] = None, check_interval: float = 2.0):
+        self.path = path
+        self.check_interval = check_interval
+        self.specs = compile_specs(DEFAULT_SPECS)
+        self.fingerprint = spec_fingerprint({})
+        self.version = 0
+        self.loaded_at = time.time()
+        self.reload_errors = 0
+        self._mtime: Optional[float] = None
+        self._checked_at = time.monotonic()
+        self._lock = threading.Lock()
+        if path:
+            # A broken file at startup is a configuration error, not something to work around
+            self._mtime = os.stat(path).st_mtime
+            self.swap(self._read(path))
+
+    @classmethod
+    def from_env(cls) -> "SpecRegistry":
+        return cls(
+            os.getenv('EXTRACTION_SPECS_PATH') or None,
+            check_interval=float(os.getenv('EXTRACTION_SPECS_CHECK_INTERVAL', 2))
+        )
+
+    @staticmethod
+    def _read(path: str) -> Dict[str, Dict[str, Any]]:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def swap(self, overrides: Dict[str, Dict[str, Any]]):
+        """Use the default specs with these page types replaced; raises if any spec does not compile"""
+        specs = {**DEFAULT_SPECS, **overrides}
+        compiled = compile_specs(specs)
+        self.specs = compiled
+        self.fingerprint = spec_fingerprint(overrides)
+        self.version += 1
+        self.loaded_at = time.time()
+
+    def _reload_if_changed(self, force: bool = False):
+        now = time.monotonic()
+        if not self.path or (not force and now - self._checked_at < self.check_interval):
+            return
+        with self._lock:
+            self._checked_at = now
+            try:
+                mtime = os.stat(self.path).st_mtime
+                if mtime == self._mtime and not force:
+                    return
+                self._mtime = mtime
+                self.swap(self._read(self.path))
+                print(f"🔁 Reloaded extraction specs from {self.path} (version {self.version})")
+            except Exception as e:
+                self.reload_errors += 1
+                print(f"⚠️ Keeping the current extraction specs; {self.path} failed to load: {e}")
+
+    def check(self) -> str:
+        """Reload the file if it changed (at most every check_interval seconds); the fingerprint in use"""
+        self._reload_if_changed()
+        return self.fingerprint
+
+    def ensure(self, fingerprint: str):
+        """Re-read the file now unless the specs in use already have this fingerprint"""
+        if fingerprint != self.fingerprint:
+            self._reload_if_changed(force=True)
+
+    def extract(self, page_type: str, html: str, parser: Optional[str] = None, **context) -> Any:
+        self._reload_if_changed()
+        return self.specs[page_type].extract(html, parser, **context)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'path': self.path,
+            'version': self.version,
+            'fingerprint': self.fingerprint,
+            'loaded_at': self.loaded_at,
+            'page_types': sorted(self.specs),
+            'reload_errors': self.reload_errors,
+        }
+
+_registry: Optional[SpecRegistry] = None
+
+def default_registry() -> SpecRegistry:
+    """The process-wide registry, built from the environment on first use"""
+    global _registry
+    if _registry is None:
+        _registry = SpecRegistry.from_env()
+    return _registry
@@ -0,0 +1,308 @@
+import json
+from typing import Optional, List, Dict, Any
+from .cache import MISSING
+
+# Fields of the repository info GraphQL query, mirroring what the repository
+# page scrape returns plus what only the API knows (dates, flags, sizes).
+REPOSITORY_QUERY = """
+query($owner: String!, $name: String!) {
+  repository(owner: $owner, name: $name) {
+    name
+    nameWithOwner
+    description
+    url
+    homepageUrl
+    sshUrl
+    stargazerCount
+    forkCount
+    watchers { totalCount }
+    issues(states: OPEN) { totalCount }
+    primaryLanguage { name }
+    languages(first: 20, orderBy: {field: SIZE, direction: DESC}) { totalSize edges { size node { name } } }
+    repositoryTopics(first: 20) { nodes { topic { name } } }
+    defaultBranchRef { name target { oid } }
+    diskUsage
+    createdAt
+    updatedAt
+    pushedAt
+    isPrivate
+    isFork
+    isArchived
+  }
+}
+"""
+
+def languages_to_percentages(sizes: Dict[str, int]) -> Dict[str, float]:
+    """Byte counts per language, as returned by the API, to the percentages the scraper reports"""
+    total = sum(sizes.values())
+    if not total:
+        return {}
+    return {name: round(size * 100 / total, 1) for name, size in sizes.items()}
+
+def user_from_rest(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'username': data['login'],
+        'name': data.get('name'),
+        'bio': data.get('bio'),
+        'location': data.get('location'),
+        'company': data.get('company'),
+        'blog': data.get('blog') or None,
+        'email': data.get('email'),
+        'avatar_url': data.get('avatar_url'),
+        'followers': data.get('followers'),
+        'following': data.get('following'),
+        'public_repos': data.get('public_repos'),
+        'public_gists': data.get('public_gists'),
+        'created_at': data.get('created_at'),
+        'updated_at': data.get('updated_at'),
+    }
+
+def repository_from_rest(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'name': data['name'],
+        'full_name': data['full_name'],
+        'description': data.get('description'),
+        'url': data.get('html_url'),
+        'language': data.get('language'),
+        'stargazers_count': data.get('stargazers_count', 0),
+        'forks_count': data.get('forks_count', 0),
+        'updated_at': data.get('updated_at'),
+        'pushed_at': data.get('pushed_at'),
+        'readme_content': None,
+    }
+
+def repository_from_graphql(data: Dict[str, Any]) -> Dict[str, Any]:
+    languages = data['languages']
+    total_size = languages['totalSize']
+    default_branch = data.get('defaultBranchRef') or {}
+    return {
+        'name': data['name'],
+        'full_name': data['nameWithOwner'],
+        'url': data['url'],
+        'description': data.get('description'),
+        'homepage': data.get('homepageUrl') or None,
+        'clone_url': f"{data['url']}.git",
+        'ssh_url': data.get('sshUrl'),
+        'stargazers_count': data['stargazerCount'],
+        'forks_count': data['forkCount'],
+        'watchers_count': data['watchers']['totalCount'],
+        'open_issues_count': data['issues']['totalCount'],
+        'language': (data.get('primaryLanguage') or {}).get('name'),
+        'languages': {
+            edge['node']['name']: round(edge['size'] * 100 / total_size, 1)
+            for edge in languages['edges']
+        } if total_size else {},
+        'topics': [node['topic']['name'] for node in data['repositoryTopics']['nodes']],
+        'default_branch': default_branch.get('name'),
+        'latest_commit': (default_branch.get('target') or {}).get('oid'),
+        'size': data.get('diskUsage'),
+        'created_at': data.get('createdAt'),
+        'updated_at': data.get('updatedAt'),
+        'pushed_at': data.get('pushedAt'),
+        'is_private': data.get('isPrivate'),
+        'is_fork': data.get('isFork'),
+        'is_archived': data.get('isArchived'),
+    }
+
+def commit_from_rest(data: Dict[str, Any]) -> Dict[str, Any]:
+    commit = data['commit']
+    return {
+        'sha': data['sha'],
+        'message': commit['message'].split('\n')[0],
+        'author': (data.get('author') or {}).get('login') or commit['author']['name'],
+        'date': commit['author']['date'],
+        'url': data.get('html_url'),
+    }
+
+def issue_from_rest(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'number': data['number'],
+        'title': data['title'],
+        'state': data['state'],
+        'author': (data.get('user') or {}).get('login'),
+        'labels': [label['name'] for label in data.get('labels', [])],
+        'url': data.get('html_url'),
+        'created_at': data.get('created_at'),
+        'updated_at': data.get('updated_at'),
+        'closed_at': data.get('closed_at'),
+    }
+
+class GitHubAPISource:
+    """
+    REST / GraphQL data source used by AsyncGitHubScraper when tokens are set.
+
+    Requests go through the scraper's own fetch pipeline (cache, single-flight,
+    rate limiting, retries), which also picks the token from its pool. Every
+    method returns None when the API cannot answer, and the scraper then falls
+    back to scraping github.com. Methods taking a persist hook pass it on to
+    the scraper's _cached, which gives it every newly fetched result.
+    """
+
+    def __init__(self, scraper, api_base_url: str, graphql_url: Optional[str] = None):
+        self.scraper = scraper
+        self.api_base_url = api_base_url.rstrip('/')
+        self.graphql_url = graphql_url or f"{self.api_base_url}/graphql"
+
+    def _headers(self, accept: str = 'application/vnd.github+json') -> Dict[str, str]:
+        return {
+            'Accept': accept,
+            'X-GitHub-Api-Version': '2022-11-28',
+        }
+
+    def _rest_key(self, path: str, kind: str) -> str:
+        return f"{kind}:{self.api_base_url}{path}"
+
+    def _repositories_path(self, username: str, page: int) -> str:
+        return f"/users/{username}/repos?sort=pushed&per_page=30&page={page}"
+
+    def _commits_path(self, username: str, repo_name: str, page: int) -> str:
+        return f"/repos/{username}/{repo_name}/commits?per_page=30&page={page}"
+
+    def _issues_path(self, username: str, repo_name: str, state: str) -> str:
+        return f"/repos/{username}/{repo_name}/issues?state={state}&per_page=30"
+
+    def user_keys(self, username: str) -> List[str]:
+        """Cache keys of what get_user_profile stores"""
+        return [self._rest_key(f"/users/{username}", 'profile')]
+
+    def repository_keys(self, username: str, repo_name: str) -> List[str]:
+        """Cache keys of what get_repository_info and get_repository_issues store"""
+        return [f"repository:graphql:{username}/{repo_name}"] + [
+            self._rest_key(self._issues_path(username, repo_name, state), 'issues') for state in ('open', 'closed')
+        ]
+
+    def repositories_page_key(self, username: str, page: int) -> str:
+        return self._rest_key(self._repositories_path(username, page), 'listing')
+
+    def commits_page_key(self, username: str, repo_name: str, page: int) -> str:
+        return self._rest_key(self._commits_path(username, repo_name, page), 'commits')
+
+    async def _rest(self, path: str, kind: str, convert, persist=None) -> Optional[Any]:
+        return await self.scraper._scrape(
+            f"{self.api_base_url}{path}",
+            kind,
+            lambda body: convert(json.loads(body)),
+            headers=self._headers(),
+            key=self._rest_key(path, kind),
+            offload=False,
+            persist=persist
+        )
+
+    async def _graphql(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        response = await self.scraper._make_request(
+            self.graphql_url,
+            method='POST',
+            json={'query': query, 'variables': variables or {}},
+            headers=self._headers()
+        )
+        if not response:
+            return None
+        payload = response.json()
+        if payload.get('errors'):
+            print(f"GraphQL query failed: {payload['errors']}")
+        return payload.get('data')
+
+    async def get_user_profile(self, username: str, persist=None) -> Optional[Dict[str, Any]]:
+        return await self._rest(f"/users/{username}", 'profile', user_from_rest, persist)
+
+    async def get_user_repositories(self, username: str, page: int = 1, persist=None) -> Optional[List[Dict[str, Any]]]:
+        return await self._rest(
+            self._repositories_path(username, page),
+            'listing',
+            lambda items: [repository_from_rest(item) for item in items],
+            persist
+        )
+
+    async def get_readmes(self, username: str, repo_names: List[str], filenames: List[str]) -> Optional[Dict[str, Optional[str]]]:
+        """
+        READMEs for many repositories in one GraphQL round trip.
+
+        Each repository gets one aliased lookup per candidate filename on its
+        default branch; the first candidate that exists wins.
+        """
+        if not repo_names:
+            return {}
+
+        repo_fields = ' '.join(
+            f'f{j}: object(expression: {json.dumps("HEAD:" + filename)}) {{ ... on Blob {{ text }} }}'
+            for j, filename in enumerate(filenames)
+        )
+        query = 'query { ' + ' '.join(
+            f'r{i}: repository(owner: {json.dumps(username)}, name: {json.dumps(name)}) {{ {repo_fields} }}'
+            for i, name in enumerate(repo_names)
+        ) + ' }'
+
+        data = await self._graphql(query)
+        if data is None:
+            return None
+
+        readmes = {}
+        for i, name in enumerate(repo_names):
+            blobs = data.get(f'r{i}') or {}
+            readmes[name] = next(
+                (blobs[f'f{j}']['text'] for j in range(len(filenames)) if blobs.get(f'f{j}')),
+                None
+            )
+        return readmes
+
+    async def get_repository_info(self, username: str, repo_name: str, persist=None) -> Optional[Dict[str, Any]]:
+        async def fetch(stale):
+            data = await self._graphql(REPOSITORY_QUERY, {'owner': username, 'name': repo_name})
+            if not data or not data.get('repository'):
+                return MISSING
+            return repository_from_graphql(data['repository']), {}
+
+        value = await self.scraper._cached(f"repository:graphql:{username}/{repo_name}", 'repository', fetch, persist)
+        return None if value is MISSING else value
+
+    async def get_repository_readme(
+        self,
+        username: str,
+        repo_name: str,
+        ref: Optional[str] = None,
+        persist=None
+    ) -> Optional[Dict[str, Optional[str]]]:
+        """
+        {'content': README text}, or {'content': None} when the repository
+        has no README (the API answers 404, which is cached like any answer).
+        """
+        path = f"/repos/{username}/{repo_name}/readme"
+        if ref:
+            path += f"?ref={ref}"
+        return await self.scraper._scrape(
+            f"{self.api_base_url}{path}",
+            'readme',
+            lambda body: {'content': body},
+            headers=self._headers('application/vnd.github.raw'),
+            # Keyed apart from the raw-text entries cached before 404s were answers
+            key=f"readme:api:{username}/{repo_name}@{ref or ''}",
+            offload=False,
+            not_found={'content': None},
+            persist=persist
+        )
+
+    async def get_repository_languages(self, username: str, repo_name: str) -> Optional[Dict[str, float]]:
+        return await self._rest(f"/repos/{username}/{repo_name}/languages", 'repository', languages_to_percentages)
+
+    async def get_repository_commits(self, username: str, repo_name: str, page: int = 1, persist=None) -> Optional[List[Dict[str, Any]]]:
+        return await self._rest(
+            self._commits_path(username, repo_name, page),
+            'commits',
+            lambda items: [commit_from_rest(item) for item in items],
+            persist
+        )
+
+    async def get_repository_issues(
+        self,
+        username: str,
+        repo_name: str,
+        state: str = 'open',
+        persist=None
+    ) -> Optional[List[Dict[str, Any]]]:
+        # The issues endpoint also lists pull requests
+        return await self._rest(
+            self._issues_path(username, repo_name, state),
+            'issues',
+            lambda items: [issue_from_rest(item) for item in items if 'pull_request' not in item],
+            persist
+        )
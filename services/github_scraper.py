@@ -1,449 +1,1091 @@
 import requests
 import httpx
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import json
 import re
-from typing import Optional, List, Dict, Any
-from urllib.parse import urljoin, quote
+from typing import Optional, List, Dict, Any, AsyncIterator, Awaitable, Callable, Collection, Tuple
+from urllib.parse import quote
 import asyncio
+import copy
+import functools
 from datetime import datetime
+import os
+import time
+from .text_parsing import parse_number
+from .http_client import create_http_client
+from .cache import ResponseCache, MISSING
+from .html_parser import make_soup, resolve_backend
+from .singleflight import SingleFlight
+from .rate_limiter import HostRateLimiter, RetryPolicy
+from .github_api import GitHubAPISource
+from .token_pool import TokenPool
+from .refresh import RefreshScheduler
+from .extraction_specs import SpecRegistry, default_registry
+from .parse_pool import ParsePool
+from .entity_store import EntityStore
+from . import metrics, tracing
 
-class GitHubScraper:
-    def __init__(self):
-        self.base_url = "https://github.com"
+# README candidates, in priority order. Override with README_FILENAMES /
+# README_BRANCHES (comma-separated) or the scraper constructor.
+DEFAULT_README_FILENAMES = ['README.md', 'readme.md', 'README.rst', 'README', 'docs/README.md']
+# Repositories per GraphQL README query when inlining READMEs from the API
+API_README_BATCH = 30
+
+# Items on a full page of the listings walked by _pages: the repositories tab
+# and the API's per_page. The commit history shows 35, so 30 is a safe lower
+# bound there too; a page with fewer items is the last one.
+LISTING_PAGE_SIZE = 30
+
+# <em class="current" data-total-pages="N"> in the pagination widget of listings
+TOTAL_PAGES_RE = re.compile(r'data-total-pages="(\d+)"')
+
+DEFAULT_README_BRANCHES = ['main', 'master']
+
+def _env_list(name: str, default: List[str]) -> List[str]:
+    value = os.getenv(name)
+    if not value:
+        return list(default)
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+# Parsers built per (backend, base URL) in the process that runs them
+_parsers: Dict[Tuple[str, str], "BaseGitHubScraper"] = {}
+
+def run_parser(settings: Tuple[str, str], specs: str, method: str, args: Tuple, html: str) -> Any:
+    """
+    BaseGitHubScraper.<method>(html, *args) for a scraper with settings,
+    using the extraction specs with fingerprint specs.
+
+    Module level, with only picklable arguments, so the parse pool can run it
+    in a worker process.
+    """
+    if settings not in _parsers:
+        parser = BaseGitHubScraper(parser=settings[0])
+        parser.base_url = settings[1]
+        _parsers[settings] = parser
+    _parsers[settings].specs.ensure(specs)
+    return getattr(_parsers[settings], method)(html, *args)
+
+class BaseGitHubScraper:
+    """URL building and HTML parsing shared by the sync and async scrapers"""
+
+    def __init__(
+        self,
+        readme_filenames: Optional[List[str]] = None,
+        readme_branches: Optional[List[str]] = None,
+        parser: Optional[str] = None,
+        specs: Optional[SpecRegistry] = None
+    ):
+        # GITHUB_BASE_URL / GITHUB_RAW_URL point the scraper elsewhere, e.g. at
+        # the benchmarks' stub server
+        self.base_url = os.getenv('GITHUB_BASE_URL', "https://github.com").rstrip('/')
         self.api_base_url = "https://api.github.com"
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.raw_base_url = os.getenv('GITHUB_RAW_URL', "https://raw.githubusercontent.com").rstrip('/')
+        self.readme_filenames = readme_filenames or _env_list('README_FILENAMES', DEFAULT_README_FILENAMES)
+        self.readme_branches = readme_branches or _env_list('README_BRANCHES', DEFAULT_README_BRANCHES)
+        # The one place the HTML parser backend is chosen (HTML_PARSER env var)
+        self.parser = resolve_backend(parser)
+        # Compiled extraction specs, shared by every scraper in the process
+        self.specs = specs or default_registry()
+        self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        }
+
+    def _parse_total_pages(self, html: str) -> Optional[int]:
+        """Page count from a listing's pagination widget, if the page shows one"""
+        match = TOTAL_PAGES_RE.search(html)
+        return int(match.group(1)) if match else None
+
+    def _parse_listing_page(self, html: str, method: str, *args) -> Dict[str, Any]:
+        """One page of a paginated listing: {'items': [...], 'total_pages': n or None}"""
+        return {'items': getattr(self, method)(html, *args), 'total_pages': self._parse_total_pages(html)}
+
+    def _token_hosts(self) -> List[str]:
+        """Hosts GitHub tokens are sent to; never github.com itself"""
+        return [httpx.URL(self.api_base_url).host, httpx.URL(self.raw_base_url).host]
+
+    def _soup(self, html: str, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+        return make_soup(html, self.parser, parse_only)
+
+    def _extract(self, page_type: str, html: str, **context) -> Any:
+        """Run the extraction spec for page_type (see services/extraction_specs.py)"""
+        return self.specs.extract(page_type, html, self.parser, base_url=self.base_url, **context)
+
+    def _parse_number(self, text: str) -> int:
+        """Parse number from text, handling 'k', 'm' suffixes"""
+        return parse_number(text)
+
+    def _user_repositories_url(self, username: str, page: int) -> str:
+        return f"{self.base_url}/{username}?tab=repositories&page={page}"
+
+    def _repository_commits_url(self, username: str, repo_name: str, page: int) -> str:
+        return f"{self.base_url}/{username}/{repo_name}/commits?page={page}"
+
+    def _repository_issues_url(self, username: str, repo_name: str, state: str) -> str:
+        return f"{self.base_url}/{username}/{repo_name}/issues?q=is:issue+is:{state}"
+
+    def _search_url(self, query: str, sort: str, order: str) -> str:
+        return f"{self.base_url}/search?q={quote(query)}&type=Repositories&s={sort}&o={order}"
+
+    def _trending_url(self, language: str, since: str) -> str:
+        url = f"{self.base_url}/trending"
+        if language:
+            url += f"/{quote(language, safe='+')}"
+        url += f"?since={since}"
+        return url
+
+    def _readme_endpoint(self, username: str, repo_name: str) -> str:
+        return f"/api/repos/{username}/{repo_name}/readme"
+
+    def _readme_urls(self, username: str, repo_name: str, default_branch: Optional[str] = None) -> List[str]:
+        """README candidate URLs in priority order; a known default branch replaces the guessed ones"""
+        branches = [default_branch] if default_branch else self.readme_branches
+        return [
+            f"{self.raw_base_url}/{username}/{repo_name}/{branch}/{filename}"
+            for filename in self.readme_filenames
+            for branch in branches
+        ]
+
+    def _parse_user_profile(self, html: str, username: str) -> Dict[str, Any]:
+        return self._extract('profile', html, username=username)
+
+    def _parse_user_repositories(self, html: str, username: str) -> List[Dict[str, Any]]:
+        """Parse a repositories tab page, leaving readme_content unset"""
+        return self._extract('repositories', html, username=username)
+
+    def _parse_repository_info(self, html: str, username: str, repo_name: str, url: str) -> Dict[str, Any]:
+        repo_data = {
+            'name': repo_name,
+            'full_name': f"{username}/{repo_name}",
+            'url': url
+        }
+        repo_data.update(self._parse_repository_page(html))
+        return repo_data
+
+    def _parse_repository_page(self, html: str) -> Dict[str, Any]:
+        """Parse a repository page, without the name, full_name and url it does not show"""
+        return self._extract('repository', html)
+
+    def _parse_repository_languages(self, html: str) -> Dict[str, float]:
+        return self._parse_repository_page(html)['languages']
+
+    def _parse_repository_commits(self, html: str) -> List[Dict[str, Any]]:
+        return self._extract('commits', html)
+
+    def _parse_repository_issues(self, html: str, state: str) -> List[Dict[str, Any]]:
+        return self._extract('issues', html, state=state)
+
+    def _parse_organization_info(self, html: str, org_name: str) -> Dict[str, Any]:
+        return self._extract('organization', html, org_name=org_name)
+
+    def _parse_search_results(self, html: str) -> List[Dict[str, Any]]:
+        return self._extract('search', html)
+
+    def _parse_trending_repositories(self, html: str) -> List[Dict[str, Any]]:
+        return self._extract('trending', html)
+
+class GitHubScraper(BaseGitHubScraper):
+    """Blocking scraper built on requests.Session"""
+
+    def __init__(self, token_pool: Optional[TokenPool] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.token_pool = token_pool or TokenPool.from_env(hosts=self._token_hosts())
 
     def _make_request(self, url: str, timeout: int = 30) -> Optional[requests.Response]:
         """Make HTTP request with error handling"""
+        token = self.token_pool.select(url)
         try:
-            response = self.session.get(url, timeout=timeout)
+            response = self.session.get(url, headers=token.auth_headers() if token else None, timeout=timeout)
+            if token:
+                self.token_pool.record(token, url, response.headers)
             response.raise_for_status()
             return response
         except requests.RequestException as e:
             print(f"Request failed for {url}: {e}")
             return None
 
-    def _parse_number(self, text: str) -> int:
-        """Parse number from text, handling 'k', 'm' suffixes"""
-        if not text:
-            return 0
-        text = text.strip().lower()
-        if 'k' in text:
-            return int(float(text.replace('k', '')) * 1000)
-        elif 'm' in text:
-            return int(float(text.replace('m', '')) * 1000000)
-        else:
-            return int(re.sub(r'[^\d]', '', text) or 0)
-
     def get_user_profile(self, username: str) -> Dict[str, Any]:
         """Scrape GitHub user profile"""
         url = f"{self.base_url}/{username}"
         response = self._make_request(url)
-        
+
         if not response:
             return {"error": "Failed to fetch user profile"}
 
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Extract user information
-        user_data = {"username": username}
-        
-        # Name
-        name_elem = soup.find('span', class_='p-name')
-        if name_elem:
-            user_data['name'] = name_elem.text.strip()
-        
-        # Bio
-        bio_elem = soup.find('div', class_='p-note')
-        if bio_elem:
-            user_data['bio'] = bio_elem.text.strip()
-        
-        # Location
-        location_elem = soup.find('span', class_='p-label')
-        if location_elem:
-            user_data['location'] = location_elem.text.strip()
-        
-        # Company
-        company_elem = soup.find('span', class_='p-org')
-        if company_elem:
-            user_data['company'] = company_elem.text.strip()
-        
-        # Avatar
-        avatar_elem = soup.find('img', class_='avatar')
-        if avatar_elem:
-            user_data['avatar_url'] = avatar_elem.get('src')
-        
-        # Stats
-        stats = soup.find_all('a', class_='Link--secondary')
-        for stat in stats:
-            text = stat.text.strip()
-            if 'followers' in text.lower():
-                user_data['followers'] = self._parse_number(text.split()[0])
-            elif 'following' in text.lower():
-                user_data['following'] = self._parse_number(text.split()[0])
-        
-        # Repository count
-        repo_tab = soup.find('a', {'data-tab-item': 'repositories'})
-        if repo_tab:
-            repo_text = repo_tab.text.strip()
-            user_data['public_repos'] = self._parse_number(re.findall(r'\d+', repo_text)[0] if re.findall(r'\d+', repo_text) else '0')
-        
-        return user_data
+        return self._parse_user_profile(response.text, username)
 
-    def get_user_repositories(self, username: str, page: int = 1) -> List[Dict[str, Any]]:
+    def get_user_repositories(self, username: str, page: int = 1, include_readme: str = 'full') -> List[Dict[str, Any]]:
         """Scrape user repositories"""
-        url = f"{self.base_url}/{username}?tab=repositories&page={page}"
-        response = self._make_request(url)
-        
+        response = self._make_request(self._user_repositories_url(username, page))
+
         if not response:
             return []
 
-        soup = BeautifulSoup(response.text, 'html.parser')
-        repositories = []
-        
-        repo_list = soup.find_all('div', class_='col-10')
-        for repo_div in repo_list:
-            repo_link = repo_div.find('a', {'itemprop': 'name codeRepository'})
-            if not repo_link:
-                continue
-                
-            repo_name = repo_link.text.strip()
-            repo_url = urljoin(self.base_url, repo_link['href'])
-            
-            # Description
-            desc_elem = repo_div.find('p', {'itemprop': 'about'})
-            description = desc_elem.text.strip() if desc_elem else None
-            
-            # Language
-            lang_elem = repo_div.find('span', {'itemprop': 'programmingLanguage'})
-            language = lang_elem.text.strip() if lang_elem else None
-            
-            # Stars, forks, etc.
-            stars = 0
-            forks = 0
-            
-            star_elem = repo_div.find('a', href=lambda x: x and 'stargazers' in x)
-            if star_elem:
-                stars = self._parse_number(star_elem.text.strip())
-            
-            fork_elem = repo_div.find('a', href=lambda x: x and 'forks' in x)
-            if fork_elem:
-                forks = self._parse_number(fork_elem.text.strip())
-            
-            # Get README content
-            readme_content = self.get_repository_readme(username, repo_name)
-            
-            repositories.append({
-                'name': repo_name,
-                'full_name': f"{username}/{repo_name}",
-                'description': description,
-                'url': repo_url,
-                'language': language,
-                'stargazers_count': stars,
-                'forks_count': forks,
-                'readme_content': readme_content
-            })
-        
+        repositories = self._parse_user_repositories(response.text, username)
+        for repo in repositories:
+            if include_readme == 'lazy':
+                repo['readme_url'] = self._readme_endpoint(username, repo['name'])
+            elif include_readme == 'full':
+                # Get README content
+                repo['readme_content'] = self.get_repository_readme(username, repo['name'])
+
         return repositories
 
     def get_repository_info(self, username: str, repo_name: str) -> Dict[str, Any]:
         """Scrape detailed repository information"""
         url = f"{self.base_url}/{username}/{repo_name}"
         response = self._make_request(url)
-        
+
         if not response:
             return {"error": "Repository not found"}
 
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        repo_data = {
-            'name': repo_name,
-            'full_name': f"{username}/{repo_name}",
-            'url': url
-        }
-        
-        # Description
-        desc_elem = soup.find('p', class_='f4')
-        if desc_elem:
-            repo_data['description'] = desc_elem.text.strip()
-        
-        # Stats
-        stats_elem = soup.find('div', id='repo-stats-counter')
-        if stats_elem:
-            # Stars
-            star_elem = stats_elem.find('a', href=lambda x: x and 'stargazers' in x)
-            if star_elem:
-                repo_data['stargazers_count'] = self._parse_number(star_elem.text.strip())
-            
-            # Forks
-            fork_elem = stats_elem.find('a', href=lambda x: x and 'forks' in x)
-            if fork_elem:
-                repo_data['forks_count'] = self._parse_number(fork_elem.text.strip())
-        
-        # Language
-        lang_bar = soup.find('div', class_='BorderGrid-row')
-        if lang_bar:
-            lang_elem = lang_bar.find('span', class_='color-fg-default')
-            if lang_elem:
-                repo_data['language'] = lang_elem.text.strip()
-        
-        # Topics
-        topics = []
-        topic_elems = soup.find_all('a', class_='topic-tag')
-        for topic in topic_elems:
-            topics.append(topic.text.strip())
-        repo_data['topics'] = topics
-        
+        repo_data = self._parse_repository_info(response.text, username, repo_name, url)
+
         # README
-        repo_data['readme_content'] = self.get_repository_readme(username, repo_name)
-        
-        # Languages
-        repo_data['languages'] = self.get_repository_languages(username, repo_name)
-        
+        repo_data['readme_content'] = self.get_repository_readme(username, repo_name, repo_data.get('default_branch'))
+
         return repo_data
 
-    def get_repository_readme(self, username: str, repo_name: str) -> Optional[str]:
+    def get_repository_readme(self, username: str, repo_name: str, default_branch: Optional[str] = None) -> Optional[str]:
         """Get repository README content"""
-        readme_urls = [
-            f"https://raw.githubusercontent.com/{username}/{repo_name}/main/README.md",
-            f"https://raw.githubusercontent.com/{username}/{repo_name}/master/README.md",
-            f"https://raw.githubusercontent.com/{username}/{repo_name}/main/readme.md",
-            f"https://raw.githubusercontent.com/{username}/{repo_name}/master/readme.md"
-        ]
-        
-        for url in readme_urls:
+        for url in self._readme_urls(username, repo_name, default_branch):
             response = self._make_request(url)
             if response and response.status_code == 200:
                 return response.text
-        
+
         return None
 
     def get_repository_languages(self, username: str, repo_name: str) -> Dict[str, int]:
         """Scrape repository languages"""
         url = f"{self.base_url}/{username}/{repo_name}"
         response = self._make_request(url)
-        
+
         if not response:
             return {}
 
-        soup = BeautifulSoup(response.text, 'html.parser')
-        languages = {}
-        
-        # Find language stats
-        lang_section = soup.find('div', class_='BorderGrid-row')
-        if lang_section:
-            lang_links = lang_section.find_all('a', class_='d-inline-flex')
-            for link in lang_links:
-                lang_name = link.find('span', class_='color-fg-default')
-                lang_percent = link.find('span', class_='percent')
-                
-                if lang_name and lang_percent:
-                    name = lang_name.text.strip()
-                    percent = float(lang_percent.text.strip().replace('%', ''))
-                    languages[name] = percent
-        
-        return languages
+        return self._parse_repository_languages(response.text)
 
     def get_repository_commits(self, username: str, repo_name: str, page: int = 1) -> List[Dict[str, Any]]:
         """Scrape repository commits"""
-        url = f"{self.base_url}/{username}/{repo_name}/commits?page={page}"
-        response = self._make_request(url)
-        
+        response = self._make_request(self._repository_commits_url(username, repo_name, page))
+
         if not response:
             return []
 
-        soup = BeautifulSoup(response.text, 'html.parser')
-        commits = []
-        
-        commit_groups = soup.find_all('div', class_='TimelineItem-body')
-        for group in commit_groups:
-            commit_links = group.find_all('a', class_='Link--primary')
-            for link in commit_links:
-                commit_url = urljoin(self.base_url, link['href'])
-                commit_sha = link['href'].split('/')[-1]
-                commit_message = link.text.strip()
-                
-                # Get author and date
-                author_elem = group.find('a', class_='commit-author')
-                author = author_elem.text.strip() if author_elem else None
-                
-                date_elem = group.find('relative-time')
-                date = date_elem.get('datetime') if date_elem else None
-                
-                commits.append({
-                    'sha': commit_sha,
-                    'message': commit_message,
-                    'author': author,
-                    'date': date,
-                    'url': commit_url
-                })
-        
-        return commits
+        return self._parse_repository_commits(response.text)
 
     def get_repository_issues(self, username: str, repo_name: str, state: str = 'open') -> List[Dict[str, Any]]:
         """Scrape repository issues"""
-        url = f"{self.base_url}/{username}/{repo_name}/issues?q=is:issue+is:{state}"
-        response = self._make_request(url)
-        
+        response = self._make_request(self._repository_issues_url(username, repo_name, state))
+
         if not response:
             return []
 
-        soup = BeautifulSoup(response.text, 'html.parser')
-        issues = []
-        
-        issue_items = soup.find_all('div', class_='Box-row')
-        for item in issue_items:
-            title_elem = item.find('a', class_='Link--primary')
-            if not title_elem:
-                continue
-            
-            title = title_elem.text.strip()
-            issue_url = urljoin(self.base_url, title_elem['href'])
-            issue_number = int(title_elem['href'].split('/')[-1])
-            
-            # Get author
-            author_elem = item.find('a', class_='Link--muted')
-            author = author_elem.text.strip() if author_elem else None
-            
-            # Get labels
-            labels = []
-            label_elems = item.find_all('a', class_='IssueLabel')
-            for label in label_elems:
-                labels.append(label.text.strip())
-            
-            issues.append({
-                'number': issue_number,
-                'title': title,
-                'state': state,
-                'author': author,
-                'labels': labels,
-                'url': issue_url
-            })
-        
-        return issues
+        return self._parse_repository_issues(response.text, state)
 
     def get_organization_info(self, org_name: str) -> Dict[str, Any]:
         """Scrape organization information"""
         url = f"{self.base_url}/{org_name}"
         response = self._make_request(url)
-        
+
         if not response:
             return {"error": "Organization not found"}
 
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        org_data = {"name": org_name}
-        
-        # Display name
-        name_elem = soup.find('h1', class_='h2')
-        if name_elem:
-            org_data['display_name'] = name_elem.text.strip()
-        
-        # Description
-        desc_elem = soup.find('div', class_='f4')
-        if desc_elem:
-            org_data['description'] = desc_elem.text.strip()
-        
-        # Location
-        location_elem = soup.find('span', class_='p-label')
-        if location_elem:
-            org_data['location'] = location_elem.text.strip()
-        
-        # Website
-        website_elem = soup.find('a', class_='Link--primary')
-        if website_elem:
-            org_data['blog'] = website_elem.get('href')
-        
-        # Avatar
-        avatar_elem = soup.find('img', class_='avatar')
-        if avatar_elem:
-            org_data['avatar_url'] = avatar_elem.get('src')
-        
-        return org_data
+        return self._parse_organization_info(response.text, org_name)
 
     def search_repositories(self, query: str, sort: str = 'stars', order: str = 'desc') -> List[Dict[str, Any]]:
         """Search GitHub repositories"""
-        url = f"{self.base_url}/search?q={quote(query)}&type=Repositories&s={sort}&o={order}"
-        response = self._make_request(url)
-        
+        response = self._make_request(self._search_url(query, sort, order))
+
         if not response:
             return []
 
-        soup = BeautifulSoup(response.text, 'html.parser')
-        repositories = []
-        
-        repo_items = soup.find_all('div', class_='f4')
-        for item in repo_items:
-            repo_link = item.find('a')
-            if not repo_link:
-                continue
-            
-            repo_url = urljoin(self.base_url, repo_link['href'])
-            repo_parts = repo_link['href'].strip('/').split('/')
-            
-            if len(repo_parts) >= 2:
-                username, repo_name = repo_parts[0], repo_parts[1]
-                
-                repositories.append({
-                    'name': repo_name,
-                    'full_name': f"{username}/{repo_name}",
-                    'url': repo_url,
-                    'owner': username
-                })
-        
-        return repositories
+        return self._parse_search_results(response.text)
 
     def get_trending_repositories(self, language: str = '', since: str = 'daily') -> List[Dict[str, Any]]:
         """Get trending repositories"""
-        url = f"{self.base_url}/trending"
-        if language:
-            url += f"/{language}"
-        url += f"?since={since}"
-        
-        response = self._make_request(url)
-        
+        response = self._make_request(self._trending_url(language, since))
+
         if not response:
             return []
 
-        soup = BeautifulSoup(response.text, 'html.parser')
-        repositories = []
-        
-        repo_items = soup.find_all('article', class_='Box-row')
-        for item in repo_items:
-            repo_link = item.find('h2').find('a')
-            if not repo_link:
-                continue
-            
-            repo_url = urljoin(self.base_url, repo_link['href'])
-            repo_full_name = repo_link['href'].strip('/')
-            username, repo_name = repo_full_name.split('/')
-            
-            # Description
-            desc_elem = item.find('p', class_='col-9')
-            description = desc_elem.text.strip() if desc_elem else None
-            
-            # Language
-            lang_elem = item.find('span', {'itemprop': 'programmingLanguage'})
-            language = lang_elem.text.strip() if lang_elem else None
-            
-            # Stars today
-            stars_today = 0
-            stars_elem = item.find('span', class_='d-inline-block')
-            if stars_elem and 'stars today' in stars_elem.text:
-                stars_today = self._parse_number(stars_elem.text.split()[0])
-            
-            repositories.append({
-                'name': repo_name,
-                'full_name': repo_full_name,
-                'description': description,
-                'url': repo_url,
-                'language': language,
-                'stars_today': stars_today,
-                'owner': username
-            })
-        
+        return self._parse_trending_repositories(response.text)
+
+class AsyncGitHubScraper(BaseGitHubScraper):
+    """Non-blocking scraper built on httpx.AsyncClient, safe to await from route handlers"""
+
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[ResponseCache] = None,
+        max_concurrency: Optional[int] = None,
+        max_per_host: Optional[int] = None,
+        max_pages: Optional[int] = None,
+        rate_limiter: Optional[HostRateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        api_token: Optional[str] = None,
+        token_pool: Optional[TokenPool] = None,
+        parse_pool: Optional[ParsePool] = None,
+        entities: Optional[EntityStore] = None,
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+        # Usually the application-wide client from main.py's lifespan handler
+        self.client = client or create_http_client()
+        self.cache = cache or ResponseCache.from_env()
+        self.single_flight = SingleFlight()
+        self.refresher = RefreshScheduler.from_env(self.cache)
+        # Parses fetched pages off the event loop (PARSE_POOL, PARSE_WORKERS)
+        self.parse_pool = parse_pool or ParsePool.from_env()
+        # Scraped users, repositories, commits and issues are written through
+        # to this store (ENTITY_DB_PATH); None keeps nothing
+        self.entities = entities if entities is not None else EntityStore.from_env()
+        # Fan-out stages (e.g. READMEs for a listing page) run at most
+        # max_concurrency items at once; each upstream host additionally
+        # gets at most max_per_host requests in flight.
+        self.max_concurrency = max_concurrency or int(os.getenv('SCRAPER_MAX_CONCURRENCY', 10))
+        self.max_per_host = max_per_host or int(os.getenv('SCRAPER_MAX_PER_HOST', 20))
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        # Upper bound on pages walked by the multi-page listings
+        self.max_pages = max_pages or int(os.getenv('SCRAPER_MAX_PAGES', 100))
+        self.rate_limiter = rate_limiter or HostRateLimiter.from_env()
+        self.retry_policy = retry_policy or RetryPolicy.from_env()
+        # With tokens, profile / repository / commit / issue data comes from
+        # the REST and GraphQL APIs, and scraping is only the fallback
+        self.api_base_url = os.getenv('GITHUB_API_URL', self.api_base_url)
+        graphql_url = os.getenv('GITHUB_GRAPHQL_URL')
+        self.token_pool = token_pool or TokenPool.from_env([api_token] if api_token else [], self._token_hosts())
+        if graphql_url:
+            self.token_pool.hosts.add(httpx.URL(graphql_url).host)
+        self.api = GitHubAPISource(self, self.api_base_url, graphql_url) if self.token_pool else None
+
+    def collect_metrics(self):
+        """Update the gauges that mirror scraper state, right before /metrics renders them"""
+        memory = self.cache.memory.stats()
+        metrics.CACHE_MEMORY_BYTES.set(memory['bytes'])
+        metrics.CACHE_MEMORY_ENTRIES.set(memory['entries'])
+        metrics.SINGLE_FLIGHT_IN_FLIGHT.set(self.single_flight.in_flight())
+        for token in self.token_pool.stats()['tokens']:
+            for resource, quota in token['quotas'].items():
+                metrics.TOKEN_QUOTA_REMAINING.set(quota['remaining'], token=token['token'], resource=resource)
+
+    async def aclose(self):
+        """Close the underlying HTTP client, cache, parse pool and entity store"""
+        await self.client.aclose()
+        self.cache.close()
+        self.parse_pool.close()
+        if self.entities:
+            self.entities.close()
+
+    def _parser(self, method: str, *args):
+        """Picklable parse step for _scrape: self.<method>(html, *args), run in the parse pool"""
+        # Checking the specs file here, in the serving process, keeps /api/status and
+        # the fingerprint recorded in the cache current; workers follow the fingerprint
+        return functools.partial(run_parser, (self.parser, self.base_url), self.specs.check(), method, args)
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = httpx.URL(url).host
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.max_per_host)
+        return self._host_semaphores[host]
+
+    async def _make_request(
+        self,
+        url: str,
+        timeout: int = 30,
+        headers: Optional[Dict[str, str]] = None,
+        method: str = 'GET',
+        json: Any = None,
+        expected_statuses: Collection[int] = ()
+    ) -> Optional[httpx.Response]:
+        """
+        Make HTTP request with error handling; a 304 Not Modified is returned as-is.
+
+        Responses with a status in expected_statuses (e.g. the 404 of a README
+        candidate that does not exist) are answers rather than failures: they
+        are returned as-is, without being logged or counted as upstream failures.
+
+        Requests wait for the host's rate limiter, and throttling, 5xx and
+        network errors are retried with backoff (honouring Retry-After and
+        X-RateLimit-Reset) up to retry_policy.max_retries times. Requests to
+        the API hosts carry the pooled token with the most quota left, and a
+        throttled token is swapped for another one instead of waiting.
+        """
+        host = httpx.URL(url).host
+        bucket = self.rate_limiter.bucket(url)
+        for attempt in range(self.retry_policy.max_retries + 1):
+            with tracing.span('rate_limit', host=host):
+                acquired = await bucket.acquire(self.rate_limiter.max_wait)
+            if not acquired:
+                print(f"Request skipped for {url}: {host} is rate limited")
+                metrics.UPSTREAM_FAILURES.inc(host=host, reason='rate_limited')
+                return None
+
+            token = self.token_pool.select(url)
+            try:
+                async with self._host_semaphore(url):
+                    with metrics.UPSTREAM_REQUESTS_IN_FLIGHT.track(host=host), \
+                            tracing.span('fetch', method=method, url=url, attempt=attempt) as span:
+                        start = time.perf_counter()
+                        try:
+                            response = await self.client.request(
+                                method,
+                                url,
+                                headers={**self.headers, **(headers or {}), **(token.auth_headers() if token else {})},
+                                json=json,
+                                timeout=timeout
+                            )
+                        except httpx.TransportError as e:
+                            span['error'] = type(e).__name__
+                            metrics.UPSTREAM_REQUEST_DURATION.observe(time.perf_counter() - start, host=host, status='error')
+                            raise
+                        span['status'] = response.status_code
+                        metrics.UPSTREAM_REQUEST_DURATION.observe(time.perf_counter() - start, host=host, status=response.status_code)
+            except httpx.TransportError as e:
+                error = e
+                reason = 'error'
+                delay = self.retry_policy.delay_for(attempt)
+            else:
+                if token:
+                    self.token_pool.record(token, url, response.headers)
+                if response.status_code == 304 or response.is_success or response.status_code in expected_statuses:
+                    bucket.succeeded()
+                    return response
+                if not self.retry_policy.should_retry(response):
+                    print(f"Request failed for {url}: HTTP {response.status_code}")
+                    metrics.UPSTREAM_FAILURES.inc(host=host, reason=response.status_code)
+                    return None
+
+                error = f"HTTP {response.status_code}"
+                reason = response.status_code
+                delay = self.retry_policy.delay_for(attempt, response)
+                if self.retry_policy.is_throttled(response):
+                    if token:
+                        self.token_pool.park(token, url, delay)
+                        if self.token_pool.has_headroom(url):
+                            # Another token still has quota: rotate instead of waiting
+                            continue
+                    bucket.throttled(delay)
+
+            if attempt == self.retry_policy.max_retries or delay > self.retry_policy.max_delay:
+                print(f"Request failed for {url}: {error}")
+                metrics.UPSTREAM_FAILURES.inc(host=host, reason=reason)
+                return None
+            metrics.UPSTREAM_RETRIES.inc(host=host, reason=reason)
+            await asyncio.sleep(delay)
+
+        # The last attempt was throttled and rotated to another token, with no attempt left to use it
+        print(f"Request failed for {url}: {error}")
+        metrics.UPSTREAM_FAILURES.inc(host=host, reason=reason)
+        return None
+
+    def _conditional_headers(self, entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for revalidating a stale cache entry"""
+        headers = {}
+        if entry:
+            validators = entry['validators']
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+        return headers
+
+    def _validators(self, response: httpx.Response, entry: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """ETag / Last-Modified from a response, falling back to the revalidated entry's on a 304"""
+        validators = dict(entry['validators']) if entry else {}
+        if response.headers.get('ETag'):
+            validators['etag'] = response.headers['ETag']
+        if response.headers.get('Last-Modified'):
+            validators['last_modified'] = response.headers['Last-Modified']
+        return validators
+
+    async def _fan_out(self, func, items: List[Any]) -> List[Any]:
+        """Await func(item) for every item, max_concurrency at a time, preserving order"""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(item):
+            async with semaphore:
+                return await func(item)
+
+        return await asyncio.gather(*(run(item) for item in items))
+
+    async def _batch(self, fetch, keys: List[str]) -> Dict[str, Any]:
+        """
+        fetch(key) for every distinct key through _fan_out, keyed by key.
+
+        An exception only fails its own key: it becomes an {'error': ...} result.
+        """
+        unique_keys = list(dict.fromkeys(keys))
+
+        async def run(key):
+            try:
+                return await fetch(key)
+            except Exception as e:
+                return {"error": str(e)}
+
+        return dict(zip(unique_keys, await self._fan_out(run, unique_keys)))
+
+    async def _cached(self, key: str, kind: str, producer, persist: Optional[Callable[[Any], Awaitable[None]]] = None) -> Any:
+        """
+        Return the fresh cached value for key, or produce and cache a new one.
+
+        producer(stale_entry) is given the expired entry (or None) so it can
+        revalidate it, and returns (value, validators) or MISSING on failure.
+        Concurrent misses for the same key share a single producer call.
+
+        An entry that went stale less than cache.stale_while_revalidate
+        seconds ago is returned as-is while it is refreshed in the background,
+        and reads are counted so the refresh scheduler can keep hot keys fresh.
+
+        persist(value) is awaited whenever a new value is produced, including
+        by background refreshes (see _writer).
+        """
+        refresh = lambda: self._produce(key, kind, producer, persist=persist)
+        self.refresher.record(key, refresh)
+
+        with tracing.span('cache', key=key) as span:
+            entry = await self.cache.get_entry(key)
+            now = time.time()
+            if entry is MISSING:
+                span['result'] = 'miss'
+            elif entry['fresh_until'] > now:
+                span['result'] = 'hit'
+            elif now < entry['fresh_until'] + self.cache.stale_while_revalidate:
+                span['result'] = 'stale'
+            else:
+                span['result'] = 'miss'
+        metrics.CACHE_LOOKUPS.inc(kind=kind, result=span['result'])
+
+        if span['result'] == 'hit':
+            return entry['value']
+        if span['result'] == 'stale':
+            self.refresher.spawn(refresh)
+            return entry['value']
+
+        value, _ = await self._produce(key, kind, producer, entry, persist)
+        if value is MISSING:
+            return value
+        # Callers may mutate what they get back (e.g. adding READMEs), so every
+        # caller sharing the result, the one that produced it included, gets
+        # its own copy of it
+        return copy.deepcopy(value)
+
+    async def _produce(self, key: str, kind: str, producer, entry: Any = None, persist=None) -> Tuple[Any, bool]:
+        """
+        Run producer for key through single-flight and cache what it returns.
+
+        Without an entry, the current one (fresh or stale) is looked up and
+        handed to producer for revalidation. A new value, rather than the
+        stale one handed back (after a 304 or an upstream failure), is also
+        passed to persist. Returns (value, shared).
+        """
+        async def produce():
+            stale = entry if entry is not None else await self.cache.get_entry(key)
+            stale = None if stale is MISSING else stale
+            result = await producer(stale)
+            if result is MISSING:
+                return MISSING
+            value, validators = result
+            await self.cache.set(key, value, kind, validators)
+            if persist and not (stale and value is stale['value']):
+                await persist(value)
+            return value
+
+        return await self.single_flight.do(key, produce)
+
+    def _writer(self, write: Callable[[EntityStore, Any], Any]) -> Optional[Callable[[Any], Awaitable[None]]]:
+        """
+        persist hook for _cached that runs write(self.entities, value) in a
+        thread; None without an entity store. A failed write only costs the
+        stored copy.
+        """
+        if self.entities is None:
+            return None
+
+        async def persist(value):
+            try:
+                await asyncio.to_thread(write, self.entities, value)
+            except Exception as e:
+                print(f"⚠️ Entity store write failed: {e}")
+
+        return persist
+
+    async def forget_user(self, username: str):
+        """Drop the cached profile, so the next read fetches it from upstream"""
+        keys = [f"profile:{self.base_url}/{username}"]
+        if self.api:
+            keys += self.api.user_keys(username)
+        for key in keys:
+            await self.cache.delete(key)
+
+    async def forget_repository(self, username: str, repo_name: str):
+        """Drop the cached repository details and issues, so the next reads fetch them from upstream"""
+        keys = [f"repository:{self.base_url}/{username}/{repo_name}"] + [
+            f"issues:{self._repository_issues_url(username, repo_name, state)}" for state in ('open', 'closed')
+        ]
+        if self.api:
+            keys += self.api.repository_keys(username, repo_name)
+        for key in keys:
+            await self.cache.delete(key)
+
+    async def forget_repositories_page(self, username: str, page: int):
+        await self.cache.delete(f"listing:paged:{self._user_repositories_url(username, page)}")
+        if self.api:
+            await self.cache.delete(self.api.repositories_page_key(username, page))
+
+    async def forget_commits_page(self, username: str, repo_name: str, page: int):
+        await self.cache.delete(f"commits:paged:{self._repository_commits_url(username, repo_name, page)}")
+        if self.api:
+            await self.cache.delete(self.api.commits_page_key(username, repo_name, page))
+
+    async def _scrape(
+        self,
+        url: str,
+        kind: str,
+        parse,
+        headers: Optional[Dict[str, str]] = None,
+        key: Optional[str] = None,
+        offload: bool = True,
+        not_found: Any = MISSING,
+        persist=None
+    ) -> Optional[Any]:
+        """
+        Fetch url and parse its body, caching the parsed result; None if the fetch failed.
+
+        A 404 is a failed fetch unless not_found is given: then it is a
+        definitive answer, and not_found is cached and returned as the result.
+
+        With offload, parse runs in the parse pool and must be picklable (see
+        _parser); small bodies such as API JSON are cheaper to parse inline.
+
+        Expired results are revalidated with a conditional request, and a 304
+        reuses the cached result without downloading or parsing the page. If
+        the upstream fails, the expired result is served for another TTL.
+
+        Offloaded results record the fingerprint of the extraction specs they
+        were parsed with; one parsed with other specs is not revalidated but
+        downloaded and parsed again, so a spec fix reaches every expired entry.
+        """
+        expected_statuses = (404,) if not_found is not MISSING else ()
+        specs = {'specs': self.specs.fingerprint} if offload else {}
+
+        async def fetch_and_parse(stale):
+            revalidate = stale if stale and stale['validators'].get('specs') == specs.get('specs') else None
+            response = await self._make_request(
+                url,
+                headers={**(headers or {}), **self._conditional_headers(revalidate)},
+                expected_statuses=expected_statuses
+            )
+            if not response:
+                # Keep serving the last good result while the upstream is failing
+                return (stale['value'], stale['validators']) if stale else MISSING
+            if revalidate:
+                self.cache.record_revalidation(response.status_code == 304)
+            if response.status_code == 304:
+                return revalidate['value'], self._validators(response, revalidate)
+            if response.status_code == 404:
+                return not_found, self._validators(response)
+            with metrics.PARSE_DURATION.time(kind=kind), tracing.span('parse', kind=kind, bytes=len(response.content)):
+                value = await self.parse_pool.run(parse, response.text) if offload else parse(response.text)
+            return value, {**self._validators(response), **specs}
+
+        value = await self._cached(key or f"{kind}:{url}", kind, fetch_and_parse, persist)
+        return None if value is MISSING else value
+
+    async def get_user_profile(self, username: str) -> Dict[str, Any]:
+        """Scrape GitHub user profile"""
+        persist = self._writer(lambda store, user: store.upsert_users([user]))
+        if self.api:
+            user_data = await self.api.get_user_profile(username, persist)
+            if user_data is not None:
+                return user_data
+
+        url = f"{self.base_url}/{username}"
+        user_data = await self._scrape(url, 'profile', self._parser('_parse_user_profile', username), persist=persist)
+
+        if user_data is None:
+            return {"error": "Failed to fetch user profile"}
+
+        return user_data
+
+    async def _scrape_listing_page(self, url: str, kind: str, persist, method: str, *args) -> Optional[Dict[str, Any]]:
+        """
+        _scrape for one page of a paginated listing parsed by self.<method>:
+        {'items': [...], 'total_pages': n or None}. A 404 (past the end, or no
+        such user or repository) is an empty page; None means the fetch failed.
+        """
+        return await self._scrape(
+            url,
+            kind,
+            self._parser('_parse_listing_page', method, *args),
+            key=f"{kind}:paged:{url}",
+            not_found={'items': [], 'total_pages': None},
+            persist=persist
+        )
+
+    async def _pages(self, fetch_page, item_key: str, max_pages: Optional[int] = None) -> AsyncIterator[List[Any]]:
+        """
+        Yield each page of a listing in order, without items already seen.
+
+        fetch_page(page) returns {'items': [...], 'total_pages': n or None},
+        or None if the page could not be fetched, which raises RuntimeError
+        rather than passing for the end of the listing.
+        When the first page shows the page count, every remaining page is
+        fetched concurrently (max_concurrency at a time). Otherwise pages are
+        prefetched in windows that start at one page and double up to
+        max_concurrency, until a page comes back short (fewer than
+        LISTING_PAGE_SIZE items) or empty, so a listing that ends early costs
+        at most as many wasted requests as pages read.
+        """
+        last = min(max_pages or self.max_pages, self.max_pages)
+        first = await fetch_page(1)
+        if first is None:
+            raise RuntimeError("Failed to fetch page 1")
+        if not first['items']:
+            return
+
+        seen = set()
+
+        def unseen(items):
+            fresh = [item for item in items if item[item_key] not in seen]
+            seen.update(item[item_key] for item in fresh)
+            return fresh
+
+        yield unseen(first['items'])
+        if not first['total_pages'] and len(first['items']) < LISTING_PAGE_SIZE:
+            return
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch(page):
+            async with semaphore:
+                result = await fetch_page(page)
+            if result is None:
+                raise RuntimeError(f"Failed to fetch page {page}")
+            return result
+
+        if first['total_pages']:
+            last = min(last, first['total_pages'])
+            window = last
+        else:
+            window = 1
+
+        page = 2
+        tasks = []
+        try:
+            while page <= last:
+                tasks = [asyncio.ensure_future(fetch(n)) for n in range(page, min(last, page + window - 1) + 1)]
+                page += len(tasks)
+                for task in tasks:
+                    result = await task
+                    items = unseen(result['items'])
+                    # Past the end GitHub sends an empty page, a 404 or the last page again
+                    if not items:
+                        return
+                    yield items
+                    if not first['total_pages'] and len(result['items']) < LISTING_PAGE_SIZE:
+                        return
+                window = min(window * 2, self.max_concurrency)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def get_user_profiles(self, usernames: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Profiles for many users, keyed by username"""
+        return await self._batch(self.get_user_profile, usernames)
+
+    async def _user_repositories_page(self, username: str, page: int) -> Optional[Dict[str, Any]]:
+        if self.api:
+            repositories = await self.api.get_user_repositories(
+                username, page, self._writer(lambda store, repositories: store.upsert_repositories(repositories))
+            )
+            if repositories is not None:
+                return {'items': repositories, 'total_pages': None}
+
+        return await self._scrape_listing_page(
+            self._user_repositories_url(username, page),
+            'listing',
+            self._writer(lambda store, listing: store.upsert_repositories(listing['items'])),
+            '_parse_user_repositories',
+            username
+        )
+
+    async def get_user_repositories(self, username: str, page: int = 1, include_readme: str = 'full') -> List[Dict[str, Any]]:
+        """Scrape user repositories"""
+        listing = await self._user_repositories_page(username, page)
+        if not listing or not listing['items']:
+            return []
+
+        return await self._add_readmes(username, listing['items'], include_readme)
+
+    async def get_all_user_repositories(
+        self,
+        username: str,
+        include_readme: str = 'full',
+        max_pages: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Every repository of a user or organization (up to max_pages pages), pages fetched concurrently"""
+        repositories = [
+            repo
+            async for repositories in self._pages(lambda page: self._user_repositories_page(username, page), 'full_name', max_pages)
+            for repo in repositories
+        ]
+        return await self._add_readmes(username, repositories, include_readme)
+
+    async def _add_readmes(self, username: str, repositories: List[Dict[str, Any]], include_readme: str) -> List[Dict[str, Any]]:
+        """Fill in readme_content (full) or readme_url (lazy) on listed repositories"""
+        if not repositories:
+            return repositories
+
+        readmes = None
+        if include_readme == 'full' and self.api:
+            # One GraphQL round trip per listing page's worth of READMEs
+            chunks = [repositories[i:i + API_README_BATCH] for i in range(0, len(repositories), API_README_BATCH)]
+            results = await self._fan_out(
+                lambda chunk: self.api.get_readmes(username, [repo['name'] for repo in chunk], self.readme_filenames),
+                chunks
+            )
+            if all(result is not None for result in results):
+                readmes = {name: content for result in results for name, content in result.items()}
+                for repo in repositories:
+                    repo['readme_content'] = readmes.get(repo['name'])
+
+        if include_readme == 'lazy':
+            for repo in repositories:
+                repo['readme_url'] = self._readme_endpoint(username, repo['name'])
+        elif include_readme == 'full' and readmes is None:
+            # Get README content for the whole page in parallel
+            readmes = await self._fan_out(
+                lambda repo: self.get_repository_readme(username, repo['name']),
+                repositories
+            )
+            for repo, readme_content in zip(repositories, readmes):
+                repo['readme_content'] = readme_content
+
         return repositories
+
+    async def iter_user_repositories(self, username: str, include_readme: str = 'false', max_pages: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Every repository of a user or organization, page by page, as each page is parsed"""
+        async for repositories in self._pages(lambda page: self._user_repositories_page(username, page), 'full_name', max_pages):
+            for repo in await self._add_readmes(username, repositories, include_readme):
+                yield repo
+
+    async def _repository_page(self, username: str, repo_name: str) -> Optional[Dict[str, Any]]:
+        """The parsed repository page, which get_repository_info and get_repository_languages share"""
+        url = f"{self.base_url}/{username}/{repo_name}"
+        identity = {'name': repo_name, 'full_name': f"{username}/{repo_name}", 'url': url}
+        return await self._scrape(
+            url,
+            'repository',
+            self._parser('_parse_repository_page'),
+            persist=self._writer(lambda store, page_data: store.upsert_repositories([{**identity, **page_data}], True))
+        )
+
+    async def get_repository_info(self, username: str, repo_name: str) -> Dict[str, Any]:
+        """Scrape detailed repository information"""
+        if self.api:
+            repo_data = await self.api.get_repository_info(
+                username, repo_name, self._writer(lambda store, repo: store.upsert_repositories([repo], True))
+            )
+            if repo_data is not None:
+                repo_data['readme_content'] = await self.get_repository_readme(
+                    username, repo_name, repo_data.get('default_branch'), repo_data.get('latest_commit')
+                )
+                return repo_data
+
+        page_data = await self._repository_page(username, repo_name)
+
+        if page_data is None:
+            return {"error": "Repository not found"}
+
+        repo_data = {
+            'name': repo_name,
+            'full_name': f"{username}/{repo_name}",
+            'url': f"{self.base_url}/{username}/{repo_name}"
+        }
+        repo_data.update(page_data)
+
+        # README
+        repo_data['readme_content'] = await self.get_repository_readme(
+            username, repo_name, repo_data.get('default_branch'), repo_data.get('latest_commit')
+        )
+
+        return repo_data
+
+    async def get_repositories_info(self, full_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Repository information for many owner/name pairs, keyed by full name"""
+        async def fetch(full_name):
+            username, _, repo_name = full_name.partition('/')
+            if not username or not repo_name or '/' in repo_name:
+                return {"error": f"Invalid repository '{full_name}', expected owner/name"}
+            return await self.get_repository_info(username, repo_name)
+
+        return await self._batch(fetch, full_names)
+
+    async def _first_successful(self, urls: List[str]) -> Tuple[Optional[httpx.Response], bool]:
+        """
+        Request the URLs in priority order and return the highest-priority success.
+
+        URLs are requested concurrently in windows that start at one URL and
+        double, so the usual case (the first candidate exists) costs a single
+        request. Within a window, a response is returned as soon as every URL
+        ahead of it has failed and the remaining requests are cancelled.
+        Candidates are expected to be missing, so their 404s are not upstream
+        failures.
+
+        Returns (response, missing): without a success, missing tells whether
+        every URL answered 404, rather than some failing or being skipped.
+        """
+        missing = True
+        start, window = 0, 1
+        while start < len(urls):
+            tasks = [
+                asyncio.ensure_future(self._make_request(url, expected_statuses=(404,)))
+                for url in urls[start:start + window]
+            ]
+            try:
+                for task in tasks:
+                    response = await task
+                    if response and response.status_code == 200:
+                        return response, False
+                    missing = missing and response is not None and response.status_code == 404
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+            start += window
+            window *= 2
+        return None, missing
+
+    async def get_repository_readme(
+        self,
+        username: str,
+        repo_name: str,
+        default_branch: Optional[str] = None,
+        commit: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Get repository README content
+
+        When the latest commit SHA is known the README is cached under it, so
+        the entry stays valid until the repository changes. "No README" is
+        only cached when every candidate answered 404; if some candidate
+        failed, the last README found (if any) is served and the lookup is
+        tried again on the next request.
+        """
+        full_name = f"{username}/{repo_name}"
+        if self.api:
+            readme = await self.api.get_repository_readme(
+                username, repo_name, default_branch,
+                self._writer(lambda store, readme: store.set_readme(full_name, readme['content']))
+            )
+            if readme is not None:
+                return readme['content']
+
+        async def resolve(stale):
+            # Revalidate the file that was found last time before probing every candidate
+            source = stale['validators'].get('url') if stale else None
+            if source:
+                response = await self._make_request(source, headers=self._conditional_headers(stale))
+                if response:
+                    self.cache.record_revalidation(response.status_code == 304)
+                    if response.status_code == 304:
+                        return stale['value'], self._validators(response, stale)
+                    return response.text, {'url': source, **self._validators(response)}
+
+            response, missing = await self._first_successful(self._readme_urls(username, repo_name, default_branch))
+            if response:
+                return response.text, {'url': str(response.url), **self._validators(response)}
+            if missing:
+                return None, {}
+            return (stale['value'], stale['validators']) if stale else MISSING
+
+        persist = self._writer(lambda store, content: store.set_readme(full_name, content))
+        if commit:
+            readme = await self._cached(f"readme:{full_name}@{commit}", 'readme_commit', resolve, persist)
+        else:
+            readme = await self._cached(f"readme:{full_name}@{default_branch or ''}", 'readme', resolve, persist)
+        return None if readme is MISSING else readme
+
+    async def get_repository_languages(self, username: str, repo_name: str) -> Dict[str, int]:
+        """Scrape repository languages"""
+        if self.api:
+            languages = await self.api.get_repository_languages(username, repo_name)
+            if languages is not None:
+                return languages
+
+        page_data = await self._repository_page(username, repo_name)
+
+        if page_data is None:
+            return {}
+
+        return page_data['languages']
+
+    async def _repository_commits_page(self, username: str, repo_name: str, page: int) -> Optional[Dict[str, Any]]:
+        full_name = f"{username}/{repo_name}"
+        if self.api:
+            commits = await self.api.get_repository_commits(
+                username, repo_name, page, self._writer(lambda store, commits: store.upsert_commits(full_name, commits))
+            )
+            if commits is not None:
+                return {'items': commits, 'total_pages': None}
+
+        return await self._scrape_listing_page(
+            self._repository_commits_url(username, repo_name, page),
+            'commits',
+            self._writer(lambda store, listing: store.upsert_commits(full_name, listing['items'])),
+            '_parse_repository_commits'
+        )
+
+    async def get_repository_commits(self, username: str, repo_name: str, page: int = 1) -> List[Dict[str, Any]]:
+        """Scrape repository commits"""
+        listing = await self._repository_commits_page(username, repo_name, page)
+        return listing['items'] if listing else []
+
+    async def get_all_repository_commits(self, username: str, repo_name: str, max_pages: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Every commit of a repository (up to max_pages pages), pages fetched concurrently"""
+        return [commit async for commit in self.iter_repository_commits(username, repo_name, max_pages)]
+
+    async def iter_repository_commits(self, username: str, repo_name: str, max_pages: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Every commit of a repository, page by page, as each page is parsed"""
+        async for commits in self._pages(lambda page: self._repository_commits_page(username, repo_name, page), 'sha', max_pages):
+            for commit in commits:
+                yield commit
+
+    async def get_repository_issues(self, username: str, repo_name: str, state: str = 'open') -> List[Dict[str, Any]]:
+        """Scrape repository issues"""
+        full_name = f"{username}/{repo_name}"
+        persist = self._writer(lambda store, issues: store.upsert_issues(full_name, issues))
+        if self.api:
+            issues = await self.api.get_repository_issues(username, repo_name, state, persist)
+            if issues is not None:
+                return issues
+
+        issues = await self._scrape(
+            self._repository_issues_url(username, repo_name, state),
+            'issues',
+            self._parser('_parse_repository_issues', state),
+            persist=persist
+        )
+        return issues or []
+
+    async def get_organization_info(self, org_name: str) -> Dict[str, Any]:
+        """Scrape organization information"""
+        url = f"{self.base_url}/{org_name}"
+        org_data = await self._scrape(url, 'organization', self._parser('_parse_organization_info', org_name))
+
+        if org_data is None:
+            return {"error": "Organization not found"}
+
+        return org_data
+
+    async def search_repositories(self, query: str, sort: str = 'stars', order: str = 'desc') -> List[Dict[str, Any]]:
+        """Search GitHub repositories"""
+        repositories = await self._scrape(self._search_url(query, sort, order), 'search', self._parser('_parse_search_results'))
+        return repositories or []
+
+    async def get_trending_repositories(self, language: str = '', since: str = 'daily') -> List[Dict[str, Any]]:
+        """Get trending repositories"""
+        repositories = await self._scrape(self._trending_url(language, since), 'trending', self._parser('_parse_trending_repositories'))
+        return repositories or []
@@ -0,0 +1,55 @@
+import os
+from typing import List, Optional, Tuple
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.builder import builder_registry
+
+# BeautifulSoup tree builders the scraper can run on, in order of preference.
+# lxml is C-backed and several times faster than the pure-Python html.parser.
+PARSER_BACKENDS = ['lxml', 'html.parser', 'html5lib']
+
+def available_backends() -> List[str]:
+    """Parser backends whose libraries are importable here"""
+    return [name for name in PARSER_BACKENDS if builder_registry.lookup(name) is not None]
+
+def resolve_backend(name: Optional[str] = None) -> str:
+    """
+    Pick the parser backend: the explicit name, else HTML_PARSER, else the
+    fastest one installed.
+    """
+    name = name or os.getenv('HTML_PARSER')
+    available = available_backends()
+    if not name:
+        return available[0]
+    if name not in available:
+        raise ValueError(f"HTML parser backend '{name}' is not available (installed: {', '.join(available)})")
+    return name
+
+def strainer(*targets: Tuple[Optional[str], str, Optional[str]]) -> SoupStrainer:
+    """
+    SoupStrainer that only builds elements matching one of the targets.
+
+    A target is (tag, attribute, value): a tag of None matches any tag, a value
+    of None only requires the attribute, and 'class' matches any one of the
+    element's classes. Matching elements keep their whole subtree.
+    """
+    def matches(name, attrs):
+        for tag, attr, value in targets:
+            if tag and tag != name:
+                continue
+            actual = attrs.get(attr)
+            if actual is None:
+                continue
+            if value is None:
+                return True
+            if attr == 'class':
+                classes = actual.split() if isinstance(actual, str) else actual
+                if value in classes:
+                    return True
+            elif actual == value:
+                return True
+        return False
+
+    return SoupStrainer(matches)
+
+def make_soup(html: str, backend: Optional[str] = None, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    return BeautifulSoup(html, backend or resolve_backend(), parse_only=parse_only)
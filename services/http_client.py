@@ -0,0 +1,47 @@
+import os
+import httpx
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def create_http_client(
+    max_connections: int = None,
+    max_keepalive_connections: int = None,
+    keepalive_expiry: float = None,
+    http2: bool = None,
+    timeout: float = 30.0
+) -> httpx.AsyncClient:
+    """
+    Build the application-wide upstream client.
+
+    One client (and so one connection pool) is shared by every router, so
+    TLS sessions to github.com and raw.githubusercontent.com are reused across
+    requests. Limits default to the HTTP_* environment variables.
+    """
+    if max_connections is None:
+        max_connections = int(os.getenv('HTTP_MAX_CONNECTIONS', 100))
+    if max_keepalive_connections is None:
+        max_keepalive_connections = int(os.getenv('HTTP_MAX_KEEPALIVE_CONNECTIONS', 20))
+    if keepalive_expiry is None:
+        keepalive_expiry = float(os.getenv('HTTP_KEEPALIVE_EXPIRY', 30))
+    if http2 is None:
+        http2 = os.getenv('HTTP2', 'true').lower() == 'true'
+
+    if http2 and not _http2_available():
+        print("⚠️ HTTP/2 requested but the 'h2' package is not installed - falling back to HTTP/1.1")
+        http2 = False
+
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        ),
+        follow_redirects=True,
+        timeout=timeout
+    )
@@ -0,0 +1,172 @@
+"""
+Minimal Prometheus-style metrics.
+
+Counters, gauges and histograms with labels, rendered in the Prometheus text
+exposition format by /metrics. The metrics the service records are defined
+at the bottom of this module.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+# Latency buckets in seconds, from a cache hit to a slow upstream with retries
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class Metric:
+    type = ''
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, '')) for name in self.label_names)
+
+    def samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.type}']
+        lines.extend(self.samples())
+        return '\n'.join(lines)
+
+class Counter(Metric):
+    type = 'counter'
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            values = dict(self._values)
+        for key, value in sorted(values.items()):
+            yield f'{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}'
+
+class Gauge(Counter):
+    type = 'gauge'
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track(self, **labels):
+        """Count something as in progress for the duration of the block"""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        # Per label set: [count per bucket..., sum]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            values = self._values.setdefault(key, [0.0] * (len(self.buckets) + 1))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    values[i] += 1
+            values[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> Iterator[str]:
+        with self._lock:
+            values = {key: list(counts) for key, counts in self._values.items()}
+        for key, counts in sorted(values.items()):
+            for bound, count in zip(self.buckets, counts):
+                labels = _format_labels(self.label_names, key, f'le="{_format_value(bound)}"')
+                yield f'{self.name}_bucket{labels} {_format_value(count)}'
+            labels = _format_labels(self.label_names, key)
+            yield f'{self.name}_sum{labels} {_format_value(counts[-1])}'
+            yield f'{self.name}_count{labels} {_format_value(counts[-2])}'
+
+class Registry:
+    def __init__(self):
+        self.metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return '\n'.join(metric.render() for metric in self.metrics) + '\n'
+
+REGISTRY = Registry()
+
+HTTP_REQUEST_DURATION = REGISTRY.register(Histogram(
+    'http_request_duration_seconds', 'End-to-end latency of API requests by route template', ['method', 'route', 'status']
+))
+HTTP_REQUESTS_IN_FLIGHT = REGISTRY.register(Gauge(
+    'http_requests_in_flight', 'API requests being handled'
+))
+UPSTREAM_REQUEST_DURATION = REGISTRY.register(Histogram(
+    'scraper_upstream_request_seconds', 'Latency of upstream fetches by host and status', ['host', 'status']
+))
+UPSTREAM_REQUESTS_IN_FLIGHT = REGISTRY.register(Gauge(
+    'scraper_upstream_requests_in_flight', 'Upstream fetches in flight by host', ['host']
+))
+UPSTREAM_RETRIES = REGISTRY.register(Counter(
+    'scraper_upstream_retries_total', 'Upstream fetches retried, by host and reason', ['host', 'reason']
+))
+UPSTREAM_FAILURES = REGISTRY.register(Counter(
+    'scraper_upstream_failures_total', 'Upstream fetches given up on, by host and reason', ['host', 'reason']
+))
+PARSE_DURATION = REGISTRY.register(Histogram(
+    'scraper_parse_seconds', 'Time spent parsing a fetched page by kind of scrape', ['kind']
+))
+CACHE_LOOKUPS = REGISTRY.register(Counter(
+    'scraper_cache_lookups_total', 'Cache lookups by kind and result (hit, stale, miss)', ['kind', 'result']
+))
+CACHE_MEMORY_BYTES = REGISTRY.register(Gauge(
+    'scraper_cache_memory_bytes', 'Bytes held by the in-memory cache tier'
+))
+CACHE_MEMORY_ENTRIES = REGISTRY.register(Gauge(
+    'scraper_cache_memory_entries', 'Entries held by the in-memory cache tier'
+))
+SINGLE_FLIGHT_IN_FLIGHT = REGISTRY.register(Gauge(
+    'scraper_single_flight_in_flight', 'Distinct cache keys being produced right now'
+))
+TOKEN_QUOTA_REMAINING = REGISTRY.register(Gauge(
+    'scraper_token_quota_remaining', 'Requests left per pooled GitHub token and rate limit resource', ['token', 'resource']
+))
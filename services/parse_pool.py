@@ -0,0 +1,78 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+MODES = ['process', 'thread', 'inline']
+
+class ParsePool:
+    """
+    Run HTML parsing off the event loop.
+
+    Parsing is pure CPU work; run inline it blocks every other request on the
+    event loop while a page is parsed. In 'process' mode pages are parsed in
+    worker processes, so one service process uses several cores; the parse
+    function and its arguments must then be picklable (module-level functions
+    and functools.partial of them) and return plain data. 'thread' mode keeps
+    the loop responsive but still shares the GIL; 'inline' parses on the loop.
+    If worker processes cannot be started, the pool falls back to threads.
+    """
+
+    def __init__(self, mode: str = 'process', workers: Optional[int] = None):
+        if mode not in MODES:
+            raise ValueError(f"Parse pool mode '{mode}' is not one of {', '.join(MODES)}")
+        self.mode = mode
+        self.workers = workers or os.cpu_count() or 1
+        self.executor: Optional[Executor] = None
+        self.tasks = 0
+        self.fallbacks = 0
+        if mode == 'process':
+            try:
+                # spawn, because forking a process that runs an event loop and threads is unsafe
+                self.executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+            except (NotImplementedError, OSError) as e:
+                print(f"⚠️ Process pool unavailable ({e}) - parsing in threads instead")
+                self._fall_back_to_threads()
+        elif mode == 'thread':
+            self.executor = ThreadPoolExecutor(self.workers, thread_name_prefix='parse')
+
+    @classmethod
+    def from_env(cls) -> "ParsePool":
+        workers = os.getenv('PARSE_WORKERS')
+        return cls(os.getenv('PARSE_POOL', 'process'), int(workers) if workers else None)
+
+    def _fall_back_to_threads(self):
+        self.mode = 'thread'
+        self.fallbacks += 1
+        self.executor = ThreadPoolExecutor(self.workers, thread_name_prefix='parse')
+
+    async def run(self, parse: Callable[..., Any], *args) -> Any:
+        """parse(*args), in the pool"""
+        self.tasks += 1
+        if self.executor is None:
+            return parse(*args)
+        loop = asyncio.get_running_loop()
+        executor = self.executor
+        try:
+            return await loop.run_in_executor(executor, parse, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); keep serving from threads
+            if self.executor is executor:
+                print("⚠️ Parse worker process died - parsing in threads from now on")
+                executor.shutdown(wait=False)
+                self._fall_back_to_threads()
+            return await loop.run_in_executor(self.executor, parse, *args)
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'mode': self.mode,
+            'workers': self.workers if self.executor is not None else 0,
+            'tasks': self.tasks,
+            'fallbacks': self.fallbacks,
+        }
@@ -0,0 +1,189 @@
+import asyncio
+import os
+import random
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+import httpx
+
+class TokenBucket:
+    """
+    Token bucket for one upstream host with an adaptive refill rate.
+
+    The rate halves every time the host throttles us and creeps back up by
+    recovery_step per successful request, never leaving [min_rate, max_rate].
+    A throttle also pauses the bucket until the host says we may retry.
+
+    Waiting callers queue in arrival order, and only the head of the queue
+    takes a token. Whenever a caller takes a token or leaves the queue (e.g.
+    a cancelled README probe), the others recompute their waits, so nobody
+    keeps waiting for a token that was never used.
+    """
+
+    def __init__(self, rate: float, burst: int, min_rate: float = 0.1, recovery_step: float = 0.05):
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.recovery_step = recovery_step
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self.throttles = 0
+        self._queue: deque = deque()
+        # Set (and replaced) whenever the queue changes, waking every waiter to recompute its wait
+        self._changed = asyncio.Event()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def wait_time(self, ahead: int = 0) -> float:
+        """Seconds until a token is available for a caller with ahead callers queued in front of it"""
+        now = time.monotonic()
+        self._refill(now)
+        pause = max(0.0, self.paused_until - now)
+        if self.tokens >= ahead + 1:
+            return pause
+        return max(pause, (ahead + 1 - self.tokens) / self.rate)
+
+    async def acquire(self, max_wait: float) -> bool:
+        """
+        Take a token, waiting up to max_wait seconds; False if that is not enough.
+
+        A caller whose estimated wait (behind everyone already queued) is over
+        max_wait gives up before queueing. Waits are estimated again whenever
+        the queue changes, and a throttle that arrives meanwhile extends them,
+        still within max_wait.
+        """
+        deadline = time.monotonic() + max_wait
+        if self.wait_time(len(self._queue)) > max_wait:
+            return False
+
+        ticket = object()
+        self._queue.append(ticket)
+        try:
+            while True:
+                wait = self.wait_time(self._queue.index(ticket))
+                if wait <= 0:
+                    self.tokens -= 1
+                    return True
+                if time.monotonic() + wait > deadline:
+                    return False
+                try:
+                    await asyncio.wait_for(self._changed.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            # No await in here, so a cancelled caller always leaves the queue
+            self._queue.remove(ticket)
+            self._changed.set()
+            self._changed = asyncio.Event()
+
+    def throttled(self, retry_after: float):
+        self.throttles += 1
+        self.rate = max(self.min_rate, self.rate / 2)
+        self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+
+    def succeeded(self):
+        self.rate = min(self.max_rate, self.rate + self.recovery_step)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'rate': round(self.rate, 3),
+            'tokens': round(self.tokens, 2),
+            'queued': len(self._queue),
+            'paused_for': round(max(0.0, self.paused_until - time.monotonic()), 1),
+            'throttles': self.throttles,
+        }
+
+class HostRateLimiter:
+    """Token buckets per upstream host"""
+
+    def __init__(self, rate: float = 10.0, burst: int = 20, max_wait: float = 30.0):
+        self.rate = rate
+        self.burst = burst
+        self.max_wait = max_wait
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    @classmethod
+    def from_env(cls) -> "HostRateLimiter":
+        # REQUEST_DELAY (seconds between requests to a host) is kept as a
+        # shorthand for UPSTREAM_RATE=1/REQUEST_DELAY
+        request_delay = os.getenv('REQUEST_DELAY')
+        rate = 1 / float(request_delay) if request_delay else float(os.getenv('UPSTREAM_RATE', 10))
+        return cls(
+            rate=rate,
+            burst=int(os.getenv('UPSTREAM_BURST', 20)),
+            max_wait=float(os.getenv('UPSTREAM_MAX_WAIT', 30))
+        )
+
+    def bucket(self, url: str) -> TokenBucket:
+        host = httpx.URL(url).host
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.rate, self.burst)
+        return self._buckets[host]
+
+    async def acquire(self, url: str) -> bool:
+        return await self.bucket(url).acquire(self.max_wait)
+
+    def stats(self) -> Dict[str, Any]:
+        return {host: bucket.stats() for host, bucket in self._buckets.items()}
+
+class RetryPolicy:
+    """When and how long to wait before retrying a failed upstream request"""
+
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(self, max_retries: int = 3, base_delay: float = 0.5, max_delay: float = 30.0):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        return cls(
+            max_retries=int(os.getenv('UPSTREAM_MAX_RETRIES', 3)),
+            base_delay=float(os.getenv('UPSTREAM_BACKOFF_BASE', 0.5)),
+            max_delay=float(os.getenv('UPSTREAM_BACKOFF_MAX', 30))
+        )
+
+    def is_throttled(self, response: httpx.Response) -> bool:
+        """Primary (429, or 403 with no quota left) or secondary (403 + Retry-After) rate limit"""
+        if response.status_code == 429:
+            return True
+        if response.status_code == 403:
+            return (
+                response.headers.get('X-RateLimit-Remaining') == '0'
+                or 'Retry-After' in response.headers
+            )
+        return False
+
+    def should_retry(self, response: httpx.Response) -> bool:
+        return response.status_code in self.RETRY_STATUSES or self.is_throttled(response)
+
+    def backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    def delay_for(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        """Delay requested by the upstream (Retry-After, X-RateLimit-Reset), else backoff"""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after:
+                try:
+                    return max(0.0, float(retry_after))
+                except ValueError:
+                    try:
+                        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+                    except (TypeError, ValueError):
+                        pass
+            reset = response.headers.get('X-RateLimit-Reset')
+            if reset and response.headers.get('X-RateLimit-Remaining') == '0':
+                try:
+                    return max(0.0, float(reset) - time.time())
+                except ValueError:
+                    pass
+        return self.backoff(attempt)
@@ -0,0 +1,108 @@
+import asyncio
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Set
+from .cache import MISSING
+from . import tracing
+
+class RefreshScheduler:
+    """
+    Keep frequently read cache keys fresh in the background.
+
+    Every read of a cached key bumps its hit count. Every interval seconds the
+    hottest keys whose entries expire within the next lead seconds are
+    refreshed ahead of time, then all counts are halved so keys that stop
+    being read drop out. It also runs the one-off refreshes started by
+    stale-while-revalidate reads.
+    """
+
+    def __init__(self, cache, interval: float = 30.0, hot_keys: int = 50, min_hits: float = 3.0):
+        self.cache = cache
+        self.interval = interval
+        self.hot_keys = hot_keys
+        self.min_hits = min_hits
+        # Refresh when the entry would expire before the next pass after this one
+        self.lead = 2 * interval
+        self._hits: Dict[str, float] = {}
+        self._refreshers: Dict[str, Callable[[], Awaitable[Any]]] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self.scheduled = 0
+        self.refreshes = 0
+        self.failures = 0
+
+    @classmethod
+    def from_env(cls, cache) -> "RefreshScheduler":
+        return cls(
+            cache,
+            interval=float(os.getenv('REFRESH_INTERVAL', 30)),
+            hot_keys=int(os.getenv('REFRESH_HOT_KEYS', 50)),
+            min_hits=float(os.getenv('REFRESH_MIN_HITS', 3))
+        )
+
+    def record(self, key: str, refresh: Callable[[], Awaitable[Any]]):
+        """Count a read of key; refresh() re-fetches it into the cache"""
+        if self.interval <= 0:
+            # Only scheduler passes decay the counts, so without them nothing is tracked
+            return
+        self._hits[key] = self._hits.get(key, 0) + 1
+        self._refreshers[key] = refresh
+
+    def spawn(self, refresh: Callable[[], Awaitable[Any]]):
+        """Run refresh() in the background, without anyone waiting on it"""
+        task = asyncio.ensure_future(self._run(refresh))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, refresh: Callable[[], Awaitable[Any]]):
+        # Background work is not part of the request that happened to start it
+        tracing.detach()
+        try:
+            await refresh()
+            self.refreshes += 1
+        except Exception as e:
+            self.failures += 1
+            print(f"Background refresh failed: {e}")
+
+    def hottest(self) -> List[str]:
+        hot = [key for key, hits in self._hits.items() if hits >= self.min_hits]
+        return sorted(hot, key=self._hits.get, reverse=True)[:self.hot_keys]
+
+    async def refresh_due(self):
+        """One scheduler pass: refresh hot keys that are about to expire, then decay the counts"""
+        now = time.time()
+        for key in self.hottest():
+            entry = await self.cache.get_entry(key)
+            if entry is MISSING or entry['fresh_until'] - now <= self.lead:
+                self.scheduled += 1
+                self.spawn(self._refreshers[key])
+
+        for key in list(self._hits):
+            self._hits[key] /= 2
+            if self._hits[key] < 0.5:
+                del self._hits[key]
+                del self._refreshers[key]
+
+    async def run(self):
+        """Scheduler loop, started by the lifespan handler in main.py; REFRESH_INTERVAL=0 disables it"""
+        if self.interval <= 0:
+            return
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.refresh_due()
+            except Exception as e:
+                print(f"Refresh pass failed: {e}")
+
+    def close(self):
+        for task in list(self._tasks):
+            task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'tracked_keys': len(self._hits),
+            'hot_keys': len(self.hottest()),
+            'in_flight': len(self._tasks),
+            'scheduled': self.scheduled,
+            'refreshes': self.refreshes,
+            'failures': self.failures,
+        }
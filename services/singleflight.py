@@ -0,0 +1,39 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+class SingleFlight:
+    """
+    Collapse concurrent calls for the same key into one execution.
+
+    The first caller for a key starts func() as a task; callers arriving while
+    it is running await the same task instead of starting their own. The task
+    is shielded so a disconnecting caller does not cancel it for the others.
+    """
+
+    def __init__(self):
+        self._flights: Dict[str, asyncio.Future] = {}
+        self.executions = 0
+        self.shared = 0
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Return (result, shared), where shared is True if another caller's execution was reused"""
+        flight = self._flights.get(key)
+        if flight is not None:
+            self.shared += 1
+            return await asyncio.shield(flight), True
+
+        flight = asyncio.ensure_future(func())
+        self._flights[key] = flight
+        flight.add_done_callback(lambda _: self._flights.pop(key, None))
+        self.executions += 1
+        return await asyncio.shield(flight), False
+
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'in_flight': self.in_flight(),
+            'executions': self.executions,
+            'shared': self.shared,
+        }
@@ -0,0 +1,51 @@
+"""
+Parsing of the humanised numbers and text GitHub pages show.
+
+These run for every count and text field of every parsed page, so the
+patterns are compiled once and the common cases take the shortest path.
+"""
+import re
+from typing import Optional
+
+# The first number in the text: digits with optional thousands separators and
+# decimals, and an optional k / m / b suffix that is not the start of a word
+# ("5 months" is 5, not 5 million)
+NUMBER_RE = re.compile(r'(\d[\d,]*)(?:\.(\d+))?(?:\s?([kmb])(?![a-z]))?', re.IGNORECASE)
+DIGITS_RE = re.compile(r'\d+')
+
+# Decimal places each suffix shifts by
+SUFFIX_DIGITS = {'k': 3, 'm': 6, 'b': 9}
+
+def parse_number(text: Optional[str]) -> int:
+    """
+    The first number in text as an int: '12', '12,345', '1.2k', '3M', '4.35m',
+    '1.2k stars'. Text without a number is 0.
+
+    Suffixed decimals are scaled with integer arithmetic, so '4.35m' is exactly
+    4350000; unsuffixed decimals are truncated.
+    """
+    if not text:
+        return 0
+    if text.isascii() and text.isdigit():
+        return int(text)
+    match = NUMBER_RE.search(text)
+    if not match:
+        return 0
+    whole, fraction, suffix = match.groups()
+    whole = whole.replace(',', '')
+    if not suffix:
+        return int(whole)
+    digits = SUFFIX_DIGITS[suffix.lower()]
+    return int(whole + (fraction or '')[:digits].ljust(digits, '0'))
+
+def first_digits(text: str) -> str:
+    """The first run of digits in text, or '0'"""
+    match = DIGITS_RE.search(text)
+    return match.group() if match else '0'
+
+def normalize_whitespace(text: Optional[str]) -> str:
+    """Collapse every run of whitespace (including newlines) to one space and trim the ends"""
+    if not text:
+        return ''
+    # str.split() with no separator does the collapsing in C, faster than a regex substitution
+    return ' '.join(text.split())
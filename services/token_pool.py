@@ -0,0 +1,148 @@
+import os
+import time
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+import httpx
+
+# Quota GitHub grants an authenticated token per window, until the response
+# headers say otherwise
+DEFAULT_LIMIT = 5000
+WINDOW = 3600
+
+def resource_for(url: str) -> str:
+    """GitHub rate limit resource a request to url is counted against"""
+    url = httpx.URL(url)
+    if url.host.startswith('raw.'):
+        # raw.githubusercontent.com is limited separately and sends no headers
+        return 'raw'
+    path = url.path
+    if path.endswith('/graphql'):
+        return 'graphql'
+    if path.startswith('/search/'):
+        return 'search'
+    return 'core'
+
+class TokenQuota:
+    """What one token has left of one rate limit resource, from X-RateLimit-* headers"""
+
+    def __init__(self, limit: int = DEFAULT_LIMIT):
+        self.limit = limit
+        self.remaining = limit
+        self.reset_at = 0.0
+
+    def headroom(self, now: float) -> int:
+        # Past the reset time the window has refilled, whatever was last seen
+        return self.limit if now >= self.reset_at else self.remaining
+
+    def take(self, now: float):
+        """Count a request before its response (and real numbers) come back"""
+        if now >= self.reset_at:
+            self.remaining = self.limit
+            self.reset_at = now + WINDOW
+        self.remaining -= 1
+
+    def update(self, headers: Mapping[str, str]):
+        try:
+            if 'X-RateLimit-Limit' in headers:
+                self.limit = int(headers['X-RateLimit-Limit'])
+            if 'X-RateLimit-Remaining' in headers:
+                self.remaining = int(headers['X-RateLimit-Remaining'])
+            if 'X-RateLimit-Reset' in headers:
+                self.reset_at = float(headers['X-RateLimit-Reset'])
+        except ValueError:
+            pass
+
+    def park(self, seconds: float):
+        """Treat the quota as used up for the next seconds (secondary rate limits)"""
+        self.remaining = 0
+        self.reset_at = max(self.reset_at, time.time() + seconds)
+
+class PooledToken:
+    def __init__(self, token: str):
+        self.token = token
+        self.quotas: Dict[str, TokenQuota] = {}
+        self.requests = 0
+
+    @property
+    def label(self) -> str:
+        """Token id that is safe to show: just its last four characters"""
+        return f"…{self.token[-4:]}"
+
+    def quota(self, resource: str) -> TokenQuota:
+        if resource not in self.quotas:
+            self.quotas[resource] = TokenQuota()
+        return self.quotas[resource]
+
+    def auth_headers(self) -> Dict[str, str]:
+        return {'Authorization': f"Bearer {self.token}"}
+
+class TokenPool:
+    """
+    GitHub tokens shared by every request to the hosts that accept them.
+
+    Each request goes out with the token that has the most quota left for
+    its resource. A token that runs dry is parked until its reset time; when
+    every token is parked, requests go out anonymously.
+    """
+
+    def __init__(self, tokens: Iterable[str] = (), hosts: Iterable[str] = ()):
+        self.tokens: List[PooledToken] = [PooledToken(token) for token in dict.fromkeys(tokens) if token]
+        self.hosts = set(hosts)
+        self.anonymous = 0
+
+    @classmethod
+    def from_env(cls, tokens: Iterable[str] = (), hosts: Iterable[str] = ()) -> "TokenPool":
+        # GITHUB_TOKENS is a comma-separated list; GITHUB_TOKEN is a pool of one
+        env_tokens = [token.strip() for token in os.getenv('GITHUB_TOKENS', '').split(',')]
+        return cls([*tokens, os.getenv('GITHUB_TOKEN', ''), *env_tokens], hosts)
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def has_headroom(self, url: str) -> bool:
+        """Whether any token has quota left for url"""
+        resource = resource_for(url)
+        now = time.time()
+        return any(token.quota(resource).headroom(now) > 0 for token in self.tokens)
+
+    def select(self, url: str) -> Optional[PooledToken]:
+        """Token with the most headroom for url, or None to send it anonymously"""
+        if not self.tokens or httpx.URL(url).host not in self.hosts:
+            return None
+        resource = resource_for(url)
+        now = time.time()
+        token = max(self.tokens, key=lambda token: token.quota(resource).headroom(now))
+        if token.quota(resource).headroom(now) <= 0:
+            self.anonymous += 1
+            return None
+        token.quota(resource).take(now)
+        token.requests += 1
+        return token
+
+    def record(self, token: PooledToken, url: str, headers: Mapping[str, str]):
+        token.quota(resource_for(url)).update(headers)
+
+    def park(self, token: PooledToken, url: str, seconds: float):
+        token.quota(resource_for(url)).park(seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            'tokens': [
+                {
+                    'token': token.label,
+                    'requests': token.requests,
+                    'quotas': {
+                        resource: {
+                            'limit': quota.limit,
+                            'remaining': quota.headroom(now),
+                            'resets_in': round(max(0.0, quota.reset_at - now)),
+                            'parked': quota.headroom(now) <= 0,
+                        }
+                        for resource, quota in token.quotas.items()
+                    },
+                }
+                for token in self.tokens
+            ],
+            'anonymous_requests': self.anonymous,
+        }
@@ -0,0 +1,80 @@
+"""
+Request-scoped traces of upstream fetches, parsing and cache lookups.
+
+A Trace is started per API request and stored in a context variable, so every
+coroutine and task the request starts records its spans into it without
+passing it around. Outside a request, span() records nothing.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+class Trace:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Total milliseconds and number of spans per span name"""
+        totals: Dict[str, Dict[str, float]] = {}
+        for span in self.spans:
+            total = totals.setdefault(span['name'], {'count': 0, 'duration_ms': 0.0})
+            total['count'] += 1
+            total['duration_ms'] = round(total['duration_ms'] + span['duration_ms'], 2)
+        return totals
+
+    def server_timing(self) -> str:
+        """Server-Timing header value: one metric per span name, plus the total"""
+        metrics = [
+            f'{name};dur={total["duration_ms"]:.1f};desc="{total["count"]}x"'
+            for name, total in self.summary().items()
+        ]
+        metrics.append(f'total;dur={self.elapsed_ms():.1f}')
+        return ', '.join(metrics)
+
+    def breakdown(self) -> Dict[str, Any]:
+        """Every span in start order, for ?debug=timing"""
+        return {
+            'total_ms': round(self.elapsed_ms(), 2),
+            'summary': self.summary(),
+            'spans': sorted(self.spans, key=lambda span: span['start_ms']),
+        }
+
+current_trace: ContextVar[Optional[Trace]] = ContextVar('current_trace', default=None)
+
+def start() -> Trace:
+    trace = Trace()
+    current_trace.set(trace)
+    return trace
+
+def detach():
+    """Stop recording into the current trace, e.g. in background work outliving the request"""
+    current_trace.set(None)
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Dict[str, Any]]:
+    """
+    Record the block as a span of the current trace.
+
+    Yields the span's attributes so the block can add what it learns (e.g. a
+    response status).
+    """
+    trace = current_trace.get()
+    if trace is None:
+        yield attributes
+        return
+
+    start = time.perf_counter()
+    try:
+        yield attributes
+    finally:
+        trace.spans.append({
+            'name': name,
+            'start_ms': round((start - trace.started) * 1000, 2),
+            'duration_ms': round((time.perf_counter() - start) * 1000, 2),
+            **attributes,
+        })
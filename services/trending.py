@@ -0,0 +1,216 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+PERIODS = ['daily', 'weekly', 'monthly']
+
+# Languages snapshotted by default; '' is the all-languages trending page.
+# Override with TRENDING_LANGUAGES (comma-separated GitHub language slugs).
+DEFAULT_LANGUAGES = ['', 'python', 'javascript', 'typescript', 'go', 'rust', 'java', 'c++', 'c', 'c#']
+
+def parse_timestamp(value: str) -> float:
+    """Unix seconds or an ISO 8601 date/time (UTC unless it says otherwise)"""
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    moment = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+class TrendingStore:
+    """Timestamped trending snapshots per language and period, in SQLite"""
+
+    def __init__(self, path: str = ':memory:'):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS trending ("
+            "language TEXT NOT NULL, since TEXT NOT NULL, taken_at REAL NOT NULL, repositories TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS trending_lookup ON trending (language, since, taken_at)")
+        self._conn.commit()
+
+    def add(self, language: str, since: str, repositories: List[Dict[str, Any]], taken_at: float):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO trending (language, since, taken_at, repositories) VALUES (?, ?, ?, ?)",
+                (language, since, taken_at, json.dumps(repositories, separators=(',', ':')))
+            )
+            self._conn.commit()
+
+    def latest(self, language: str, since: str, at: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Newest snapshot taken at or before at (default: now), or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT taken_at, repositories FROM trending WHERE language = ? AND since = ? AND taken_at <= ? "
+                "ORDER BY taken_at DESC LIMIT 1",
+                (language, since, time.time() if at is None else at)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'taken_at': row[0], 'repositories': json.loads(row[1])}
+
+    def between(self, language: str, since: str, start: float, end: float) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT taken_at, repositories FROM trending WHERE language = ? AND since = ? AND taken_at BETWEEN ? AND ? "
+                "ORDER BY taken_at",
+                (language, since, start, end)
+            ).fetchall()
+        return [{'taken_at': taken_at, 'repositories': json.loads(repositories)} for taken_at, repositories in rows]
+
+    def purge_older_than(self, cutoff: float) -> int:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM trending WHERE taken_at < ?", (cutoff,))
+            self._conn.commit()
+        return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshots, oldest, newest = self._conn.execute(
+                "SELECT COUNT(*), MIN(taken_at), MAX(taken_at) FROM trending"
+            ).fetchone()
+        return {
+            'path': self.path,
+            'snapshots': snapshots,
+            'oldest': oldest,
+            'newest': newest,
+        }
+
+class TrendingSnapshots:
+    """
+    Periodically scrape trending for every configured language and period.
+
+    /api/trending/repositories is served from the newest snapshot (or the one
+    in force at a given time), and /api/trending/languages aggregates them.
+    Languages that are not snapshotted are still scraped on demand.
+    """
+
+    def __init__(
+        self,
+        scraper,
+        store: TrendingStore,
+        languages: Optional[List[str]] = None,
+        interval: float = 3600.0,
+        retention: float = 7 * 24 * 3600
+    ):
+        self.scraper = scraper
+        self.store = store
+        self.languages = [language.lower() for language in (DEFAULT_LANGUAGES if languages is None else languages)]
+        self.interval = interval
+        self.retention = retention
+        self.runs = 0
+        self.failures = 0
+
+    @classmethod
+    def from_env(cls, scraper) -> "TrendingSnapshots":
+        languages = os.getenv('TRENDING_LANGUAGES')
+        return cls(
+            scraper,
+            TrendingStore(os.getenv('TRENDING_DB_PATH') or ':memory:'),
+            languages=[language.strip() for language in languages.split(',')] if languages is not None else None,
+            interval=float(os.getenv('TRENDING_SNAPSHOT_INTERVAL', 3600)),
+            retention=float(os.getenv('TRENDING_RETENTION_DAYS', 7)) * 24 * 3600
+        )
+
+    def covers(self, language: str) -> bool:
+        return language.lower() in self.languages
+
+    async def snapshot_all(self):
+        """Scrape and store every language / period combination once"""
+        taken_at = time.time()
+        combinations = [(language, since) for language in self.languages for since in PERIODS]
+
+        async def snapshot(combination):
+            language, since = combination
+            repositories = await self.scraper.get_trending_repositories(language, since)
+            # An empty page is a failed scrape far more often than an empty trending list
+            if repositories:
+                await asyncio.to_thread(self.store.add, language, since, repositories, taken_at)
+            else:
+                self.failures += 1
+
+        await self.scraper._fan_out(snapshot, combinations)
+        await asyncio.to_thread(self.store.purge_older_than, taken_at - self.retention)
+        self.runs += 1
+
+    async def run(self):
+        """Snapshot loop, started by the lifespan handler in main.py; TRENDING_SNAPSHOT_INTERVAL=0 disables it"""
+        if self.interval <= 0:
+            return
+        while True:
+            try:
+                await self.snapshot_all()
+            except Exception as e:
+                print(f"Trending snapshot failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def get(self, language: str, since: str, at: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Snapshot for language / since as of at (default: newest), or None"""
+        return await asyncio.to_thread(self.store.latest, language.lower(), since, at)
+
+    async def languages_report(self, since: str = 'daily', days: float = 7) -> Dict[str, Any]:
+        """
+        Trending languages over the last days, from the all-languages snapshots.
+
+        Each repository counts once per language, with the most stars it
+        gained in any snapshot; languages are ranked by those stars.
+        """
+        end = time.time()
+        snapshots = await asyncio.to_thread(self.store.between, '', since, end - days * 24 * 3600, end)
+
+        best: Dict[str, Dict[str, Any]] = {}
+        for snapshot in snapshots:
+            for repo in snapshot['repositories']:
+                seen = best.get(repo['full_name'])
+                if seen is None or repo['stars_today'] > seen['stars_today']:
+                    best[repo['full_name']] = repo
+
+        languages: Dict[str, Dict[str, Any]] = {}
+        for repo in best.values():
+            entry = languages.setdefault(repo['language'] or 'Unknown', {'repositories': 0, 'stars': 0})
+            entry['repositories'] += 1
+            entry['stars'] += repo['stars_today']
+
+        total = sum(entry['repositories'] for entry in languages.values())
+        ranked = [
+            {
+                'language': language,
+                'repositories': entry['repositories'],
+                'stars': entry['stars'],
+                'share': round(entry['repositories'] * 100 / total, 1),
+            }
+            for language, entry in sorted(languages.items(), key=lambda item: (-item[1]['stars'], item[0]))
+        ]
+        return {
+            'since': since,
+            'days': days,
+            'snapshots': len(snapshots),
+            'from': snapshots[0]['taken_at'] if snapshots else None,
+            'to': snapshots[-1]['taken_at'] if snapshots else None,
+            'languages': ranked,
+        }
+
+    def close(self):
+        self.store.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'languages': self.languages,
+            'interval': self.interval,
+            'runs': self.runs,
+            'failures': self.failures,
+            'store': self.store.stats(),
+        }
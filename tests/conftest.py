@@ -0,0 +1,27 @@
+import httpx
+import pytest
+
+from services.cache import ResponseCache
+from services.github_scraper import AsyncGitHubScraper
+from services.parse_pool import ParsePool
+from services.rate_limiter import HostRateLimiter, RetryPolicy
+from services.token_pool import TokenPool
+
+@pytest.fixture
+def make_scraper():
+    """
+    Build AsyncGitHubScraper instances whose upstream is handler(request),
+    with an in-memory cache, no tokens, no retries and practically no rate
+    limit, whatever the environment says.
+    """
+    def build(handler) -> AsyncGitHubScraper:
+        return AsyncGitHubScraper(
+            httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            cache=ResponseCache(),
+            rate_limiter=HostRateLimiter(rate=1000, burst=1000),
+            retry_policy=RetryPolicy(max_retries=0),
+            token_pool=TokenPool(),
+            parse_pool=ParsePool('thread'),
+            entities=None
+        )
+    return build
@@ -0,0 +1,70 @@
+"""
+The two cache tiers: expiry, purging of the disk tier, and the copies
+handed to every reader.
+"""
+import asyncio
+import time
+
+from services.cache import MISSING, ResponseCache, SQLiteCache
+
+def test_sqlite_purge_expired_deletes_only_expired_entries(tmp_path):
+    disk = SQLiteCache(str(tmp_path / 'cache.sqlite3'))
+    now = time.time()
+    disk.set('expired', b'1', now - 1)
+    disk.set('live', b'2', now + 60)
+
+    assert disk.purge_expired() == 1
+    assert disk.stats()['entries'] == 1
+    assert disk.get('live') == (b'2', now + 60)
+    disk.close()
+
+def test_purge_loop_empties_the_disk_tier_of_expired_entries(tmp_path):
+    cache = ResponseCache(disk_path=str(tmp_path / 'cache.sqlite3'), purge_interval=0.01)
+
+    async def run():
+        await cache.set('a', 'value', 'trending')
+        # Expire it on disk without waiting out the TTL
+        cache.disk.set('a', cache.disk.get('a')[0], time.time() - 1)
+        task = asyncio.create_task(cache.run())
+        await asyncio.sleep(0.1)
+        task.cancel()
+
+    asyncio.run(run())
+    assert cache.disk.stats()['entries'] == 0
+    assert cache.stats()['purged'] == 1
+    cache.close()
+
+def test_purge_loop_is_off_without_a_disk_tier():
+    cache = ResponseCache(purge_interval=0.01)
+    # Returns at once instead of looping forever
+    asyncio.run(asyncio.wait_for(cache.run(), 1))
+
+def test_disk_hits_are_promoted_and_survive_a_restart(tmp_path):
+    path = str(tmp_path / 'cache.sqlite3')
+    first = ResponseCache(disk_path=path)
+    asyncio.run(first.set('a', {'stars': 1}, 'repository', {'etag': '"x"'}))
+    first.close()
+
+    second = ResponseCache(disk_path=path)
+    entry = asyncio.run(second.get_entry('a'))
+    assert entry['value'] == {'stars': 1}
+    assert entry['validators'] == {'etag': '"x"'}
+    assert second.memory.stats()['entries'] == 1
+    second.close()
+
+def test_every_read_gets_its_own_copy():
+    cache = ResponseCache()
+    asyncio.run(cache.set('a', {'items': [1]}, 'listing'))
+    first = asyncio.run(cache.get('a'))
+    first['items'].append(2)
+    assert asyncio.run(cache.get('a')) == {'items': [1]}
+
+def test_stale_entries_are_kept_for_revalidation_only_with_validators():
+    cache = ResponseCache(ttls={'search': 0}, stale_ttl=60, stale_while_revalidate=0)
+    asyncio.run(cache.set('plain', 1, 'search'))
+    asyncio.run(cache.set('validated', 2, 'search', {'etag': '"x"'}))
+    time.sleep(0.01)
+
+    assert asyncio.run(cache.get_entry('plain')) is MISSING
+    assert asyncio.run(cache.get('validated')) is MISSING
+    assert asyncio.run(cache.get_entry('validated'))['value'] == 2
@@ -0,0 +1,104 @@
+"""
+Multi-page listings: where they end, and that a page failing midway is an
+error rather than the end of the listing.
+"""
+import asyncio
+import re
+
+import httpx
+import pytest
+
+from services.github_scraper import LISTING_PAGE_SIZE
+
+def listing(page: int, count: int = LISTING_PAGE_SIZE, total_pages=None) -> dict:
+    return {'items': [{'id': f'{page}-{i}'} for i in range(count)], 'total_pages': total_pages}
+
+@pytest.fixture
+def walk(make_scraper):
+    """What _pages yields over pages (page number -> listing, None for a failed fetch), and the pages it fetched"""
+    def run(pages, max_pages=None):
+        fetched = []
+
+        async def fetch_page(page):
+            fetched.append(page)
+            await asyncio.sleep(0)
+            return pages.get(page, listing(page, 0))
+
+        async def collect():
+            scraper = make_scraper(lambda request: httpx.Response(404))
+            try:
+                return [items async for items in scraper._pages(fetch_page, 'id', max_pages)]
+            finally:
+                await scraper.aclose()
+
+        return asyncio.run(collect()), fetched
+    return run
+
+def test_listing_ends_at_the_first_short_page(walk):
+    yielded, fetched = walk({1: listing(1), 2: listing(2), 3: listing(3, 5), 4: listing(4), 5: listing(5)})
+    assert [len(items) for items in yielded] == [30, 30, 5]
+    # Prefetching may have started page 4, but nothing past the window that held page 3
+    assert max(fetched) <= 4
+
+def test_single_short_page_is_the_whole_listing(walk):
+    yielded, fetched = walk({1: listing(1, 3)})
+    assert [len(items) for items in yielded] == [3]
+    assert fetched == [1]
+
+def test_known_page_count_fetches_exactly_those_pages(walk):
+    yielded, fetched = walk({page: listing(page, total_pages=4) for page in range(1, 6)})
+    assert len(yielded) == 4
+    assert sorted(fetched) == [1, 2, 3, 4]
+
+def test_repeated_last_page_ends_the_listing(walk):
+    yielded, _ = walk({1: listing(1), 2: listing(2), 3: listing(2)})
+    assert [len(items) for items in yielded] == [30, 30]
+
+def test_max_pages_caps_the_walk(walk):
+    yielded, fetched = walk({page: listing(page) for page in range(1, 10)}, max_pages=3)
+    assert len(yielded) == 3
+    assert max(fetched) == 3
+
+def test_failed_first_page_raises(walk):
+    with pytest.raises(RuntimeError, match='page 1'):
+        walk({1: None})
+
+def test_failed_later_page_raises_instead_of_ending_the_listing(walk):
+    with pytest.raises(RuntimeError, match='page 2'):
+        walk({1: listing(1), 2: None, 3: listing(3)})
+
+def repositories_tab(pages: int, failing=()):
+    """Full repositories tab pages of octo up to pages, 503 for the failing ones and 404 past the end"""
+    def handler(request):
+        page = int(re.search(r'page=(\d+)', str(request.url)).group(1))
+        if page in failing:
+            return httpx.Response(503)
+        if page > pages:
+            return httpx.Response(404)
+        rows = ''.join(
+            f'<div class="col-10"><a itemprop="name codeRepository" href="/octo/r{page}-{i}">r{page}-{i}</a></div>'
+            for i in range(LISTING_PAGE_SIZE)
+        )
+        return httpx.Response(200, text=f'<html><body>{rows}</body></html>')
+    return handler
+
+@pytest.fixture
+def all_repositories(make_scraper):
+    def run(handler):
+        async def collect():
+            scraper = make_scraper(handler)
+            try:
+                return await scraper.get_all_user_repositories('octo', 'false')
+            finally:
+                await scraper.aclose()
+        return asyncio.run(collect())
+    return run
+
+def test_404_past_the_last_page_ends_the_listing(all_repositories):
+    repositories = all_repositories(repositories_tab(3))
+    assert len(repositories) == 3 * LISTING_PAGE_SIZE
+    assert len({repo['full_name'] for repo in repositories}) == len(repositories)
+
+def test_upstream_failure_midway_fails_the_listing(all_repositories):
+    with pytest.raises(RuntimeError, match='page 2'):
+        all_repositories(repositories_tab(3, failing={2}))
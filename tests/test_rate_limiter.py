@@ -0,0 +1,109 @@
+"""
+Upstream rate limiting and retries: token buckets per host, their queue of
+waiting callers, and the retry / backoff policy.
+"""
+import asyncio
+import time
+
+import httpx
+
+from services.rate_limiter import HostRateLimiter, RetryPolicy, TokenBucket
+
+def test_bucket_spends_the_burst_then_refills_at_the_rate():
+    bucket = TokenBucket(rate=100, burst=2)
+
+    async def run():
+        start = time.monotonic()
+        for _ in range(6):
+            assert await bucket.acquire(max_wait=1)
+        return time.monotonic() - start
+
+    # Two tokens from the burst, four refilled at 100/s
+    assert asyncio.run(run()) >= 0.035
+
+def test_bucket_rejects_callers_that_would_wait_too_long():
+    bucket = TokenBucket(rate=1, burst=1)
+
+    async def run():
+        assert await bucket.acquire(max_wait=0)
+        start = time.monotonic()
+        assert not await bucket.acquire(max_wait=0.1)
+        return time.monotonic() - start
+
+    # Given up at once rather than after waiting out max_wait
+    assert asyncio.run(run()) < 0.05
+    assert bucket.stats()['queued'] == 0
+
+def test_bucket_serves_at_most_rate_times_max_wait_concurrent_callers():
+    bucket = TokenBucket(rate=10, burst=1)
+
+    async def run():
+        return await asyncio.gather(*[bucket.acquire(max_wait=0.55) for _ in range(20)])
+
+    # One token from the burst and five refilled within max_wait
+    assert sum(asyncio.run(run())) == 6
+
+def test_cancelled_waiters_hand_their_place_to_the_next_caller():
+    bucket = TokenBucket(rate=10, burst=1)
+
+    async def run():
+        assert await bucket.acquire(max_wait=0)
+        waiters = [asyncio.create_task(bucket.acquire(max_wait=5)) for _ in range(5)]
+        await asyncio.sleep(0)
+        start = time.monotonic()
+        for waiter in waiters[:4]:
+            waiter.cancel()
+        assert await waiters[4]
+        return time.monotonic() - start
+
+    # The last caller takes the next token (0.1s) instead of the fifth (0.5s)
+    assert asyncio.run(run()) < 0.3
+
+def test_throttle_halves_the_rate_and_pauses_the_bucket():
+    bucket = TokenBucket(rate=8, burst=5, recovery_step=1)
+    bucket.throttled(retry_after=0.2)
+
+    assert bucket.rate == 4
+    assert bucket.stats()['throttles'] == 1
+    assert bucket.wait_time() > 0.1
+    assert not asyncio.run(bucket.acquire(max_wait=0.05))
+
+    for _ in range(10):
+        bucket.succeeded()
+    assert bucket.rate == 8
+
+def test_throttles_never_go_below_the_minimum_rate():
+    bucket = TokenBucket(rate=1, burst=1, min_rate=0.25)
+    for _ in range(5):
+        bucket.throttled(retry_after=0)
+    assert bucket.rate == 0.25
+
+def test_host_rate_limiter_keeps_a_bucket_per_host():
+    limiter = HostRateLimiter(rate=1, burst=1, max_wait=0)
+
+    async def run():
+        return [
+            await limiter.acquire('https://github.com/a'),
+            await limiter.acquire('https://github.com/b'),
+            await limiter.acquire('https://raw.githubusercontent.com/a/b/main/README.md'),
+        ]
+
+    assert asyncio.run(run()) == [True, False, True]
+    assert set(limiter.stats()) == {'github.com', 'raw.githubusercontent.com'}
+
+def test_retry_policy_retries_server_errors_and_throttles_only():
+    policy = RetryPolicy()
+    assert policy.should_retry(httpx.Response(503))
+    assert policy.should_retry(httpx.Response(429))
+    assert policy.should_retry(httpx.Response(403, headers={'X-RateLimit-Remaining': '0'}))
+    assert policy.should_retry(httpx.Response(403, headers={'Retry-After': '60'}))
+    assert not policy.should_retry(httpx.Response(403))
+    assert not policy.should_retry(httpx.Response(404))
+
+def test_retry_policy_waits_as_long_as_the_upstream_asks():
+    policy = RetryPolicy(base_delay=0.5, max_delay=2)
+    assert policy.delay_for(0, httpx.Response(429, headers={'Retry-After': '7'})) == 7
+    reset = httpx.Response(403, headers={'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': str(time.time() + 30)})
+    assert 28 < policy.delay_for(0, reset) <= 30
+    # Otherwise exponential backoff with jitter, capped at max_delay
+    assert all(0 <= policy.delay_for(attempt, httpx.Response(503)) <= 2 for attempt in range(10))
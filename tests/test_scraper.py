@@ -0,0 +1,72 @@
+"""
+Results the scraper shares between callers and keeps in its cache: every
+caller gets its own copy, and failures are not cached as answers.
+"""
+import asyncio
+
+import httpx
+
+def test_callers_sharing_a_fetch_get_their_own_copies(make_scraper):
+    def handler(request):
+        rows = ''.join(
+            f'<div class="col-10"><a itemprop="name codeRepository" href="/octo/r{i}">r{i}</a></div>'
+            for i in range(3)
+        )
+        return httpx.Response(200, text=f'<html><body>{rows}</body></html>')
+
+    async def run():
+        scraper = make_scraper(handler)
+        try:
+            # Both calls share one fetch; only the lazy one adds readme_url
+            return await asyncio.gather(
+                scraper.get_user_repositories('octo', 1, 'lazy'),
+                scraper.get_user_repositories('octo', 1, 'false')
+            )
+        finally:
+            await scraper.aclose()
+
+    lazy, plain = asyncio.run(run())
+    assert all('readme_url' in repo for repo in lazy)
+    assert not any('readme_url' in repo for repo in plain)
+
+def test_readme_lookup_that_failed_is_tried_again(make_scraper):
+    state = {'down': True}
+
+    def handler(request):
+        if state['down']:
+            return httpx.Response(503)
+        if request.url.path.endswith('/main/README.md'):
+            return httpx.Response(200, text='# octo')
+        return httpx.Response(404)
+
+    async def run():
+        scraper = make_scraper(handler)
+        try:
+            during = await scraper.get_repository_readme('octo', 'r', commit='abc')
+            state['down'] = False
+            return during, await scraper.get_repository_readme('octo', 'r', commit='abc')
+        finally:
+            await scraper.aclose()
+
+    assert asyncio.run(run()) == (None, '# octo')
+
+def test_missing_readme_is_cached(make_scraper):
+    requests = []
+
+    def handler(request):
+        requests.append(request.url)
+        return httpx.Response(404)
+
+    async def run():
+        scraper = make_scraper(handler)
+        try:
+            first = await scraper.get_repository_readme('octo', 'r', commit='abc')
+            probes = len(requests)
+            return first, await scraper.get_repository_readme('octo', 'r', commit='abc'), probes
+        finally:
+            await scraper.aclose()
+
+    first, second, probes = asyncio.run(run())
+    assert first is None and second is None
+    assert probes > 0
+    assert len(requests) == probes
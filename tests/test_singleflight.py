@@ -0,0 +1,86 @@
+"""
+Single-flight: concurrent callers for a key share one execution, and a
+caller going away does not take it away from the others.
+"""
+import asyncio
+
+import pytest
+
+from services.singleflight import SingleFlight
+
+def test_concurrent_calls_share_one_execution():
+    flights = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return 'value'
+
+    async def run():
+        return await asyncio.gather(*[flights.do('key', fetch) for _ in range(5)])
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert [value for value, _ in results] == ['value'] * 5
+    assert [shared for _, shared in results] == [False, True, True, True, True]
+    assert flights.stats() == {'in_flight': 0, 'executions': 1, 'shared': 4}
+
+def test_calls_for_different_keys_run_separately():
+    flights = SingleFlight()
+
+    async def run():
+        return await asyncio.gather(
+            flights.do('a', lambda: asyncio.sleep(0, 'a')),
+            flights.do('b', lambda: asyncio.sleep(0, 'b'))
+        )
+
+    assert asyncio.run(run()) == [('a', False), ('b', False)]
+    assert flights.executions == 2
+
+def test_finished_flight_is_not_reused():
+    flights = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        return len(calls)
+
+    async def run():
+        return await flights.do('key', fetch), await flights.do('key', fetch)
+
+    assert asyncio.run(run()) == ((1, False), (2, False))
+    assert flights.in_flight() == 0
+
+def test_cancelled_caller_does_not_cancel_the_others():
+    flights = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.05)
+        return 'value'
+
+    async def run():
+        first = asyncio.create_task(flights.do('key', fetch))
+        second = asyncio.create_task(flights.do('key', fetch))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(run()) == ('value', True)
+    assert flights.executions == 1
+
+def test_errors_reach_every_caller():
+    flights = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise RuntimeError('upstream down')
+
+    async def run():
+        return await asyncio.gather(*[flights.do('key', fetch) for _ in range(3)], return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert flights.in_flight() == 0
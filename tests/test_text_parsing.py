@@ -0,0 +1,62 @@
+"""
+The humanised numbers and text GitHub pages show, as parse_number,
+first_digits and normalize_whitespace read them.
+"""
+import pytest
+
+from services.text_parsing import first_digits, normalize_whitespace, parse_number
+
+@pytest.mark.parametrize('text, expected', [
+    (None, 0),
+    ('', 0),
+    ('k', 0),
+    ('stars', 0),
+    ('12', 12),
+    ('12,345', 12345),
+    ('1.2k', 1200),
+    ('0.5k', 500),
+    ('4.35m', 4350000),
+    ('3M', 3000000),
+    ('3 M', 3000000),
+    ('2.5b', 2500000000),
+    # Unsuffixed decimals are truncated
+    ('1.5', 1),
+    # A suffix letter that starts a word is not a suffix
+    ('5 months', 5),
+    ('1.2k stars', 1200),
+    ('Used by 1,024 repositories', 1024),
+])
+def test_parse_number(text, expected):
+    assert parse_number(text) == expected
+
+@pytest.mark.parametrize('text, expected', [
+    # Unicode decimal digits are read as their values, with or without a suffix
+    ('١٢٣', 123),
+    ('１２', 12),
+    ('١.٥k', 1500),
+])
+def test_parse_number_non_ascii_digits(text, expected):
+    assert parse_number(text) == expected
+
+def test_parse_number_scales_suffixed_decimals_exactly():
+    # Float scaling would give 4349999 for some of these
+    for whole in range(100):
+        for fraction in range(100):
+            text = f'{whole}.{fraction:02d}m'
+            assert parse_number(text) == whole * 1000000 + fraction * 10000
+
+@pytest.mark.parametrize('text, expected', [
+    ('', '0'),
+    ('no digits', '0'),
+    ('Page 12 of 40', '12'),
+])
+def test_first_digits(text, expected):
+    assert first_digits(text) == expected
+
+@pytest.mark.parametrize('text, expected', [
+    (None, ''),
+    ('', ''),
+    ('  Octo \n\n  Cat\t', 'Octo Cat'),
+])
+def test_normalize_whitespace(text, expected):
+    assert normalize_whitespace(text) == expected
@@ -0,0 +1,64 @@
+"""
+Token pool: which token a request goes out with, and when it goes out
+anonymously.
+"""
+import time
+
+from services.token_pool import TokenPool, resource_for
+
+API = 'https://api.github.com'
+
+def quota_headers(remaining: int, reset_in: float = 3600) -> dict:
+    return {
+        'X-RateLimit-Limit': '5000',
+        'X-RateLimit-Remaining': str(remaining),
+        'X-RateLimit-Reset': str(time.time() + reset_in),
+    }
+
+def test_resource_for_matches_githubs_rate_limit_resources():
+    assert resource_for(f'{API}/users/octocat') == 'core'
+    assert resource_for(f'{API}/search/repositories?q=x') == 'search'
+    assert resource_for(f'{API}/graphql') == 'graphql'
+    assert resource_for('https://raw.githubusercontent.com/o/r/main/README.md') == 'raw'
+
+def test_select_picks_the_token_with_the_most_headroom():
+    pool = TokenPool(['aaaa', 'bbbb'], hosts=['api.github.com'])
+    first, second = pool.tokens
+    pool.record(first, f'{API}/users/a', quota_headers(10))
+    pool.record(second, f'{API}/users/a', quota_headers(100))
+
+    assert pool.select(f'{API}/users/b') is second
+    assert second.quota('core').remaining == 99
+    # Quotas are per resource: search has not been used by either token
+    assert pool.select(f'{API}/search/repositories?q=x') is not None
+
+def test_select_leaves_other_hosts_anonymous():
+    pool = TokenPool(['aaaa'], hosts=['api.github.com'])
+    assert pool.select('https://github.com/octocat') is None
+    assert pool.stats()['anonymous_requests'] == 0
+
+def test_parked_tokens_send_requests_anonymously():
+    pool = TokenPool(['aaaa', 'bbbb'], hosts=['api.github.com'])
+    for token in pool.tokens:
+        pool.park(token, f'{API}/users/a', 60)
+
+    assert not pool.has_headroom(f'{API}/users/a')
+    assert pool.select(f'{API}/users/a') is None
+    assert pool.stats()['anonymous_requests'] == 1
+    # Other resources are unaffected
+    assert pool.has_headroom(f'{API}/graphql')
+
+def test_quota_refills_after_its_reset_time():
+    pool = TokenPool(['aaaa'], hosts=['api.github.com'])
+    token = pool.tokens[0]
+    pool.record(token, f'{API}/users/a', quota_headers(0, reset_in=-1))
+
+    assert pool.select(f'{API}/users/a') is token
+    assert token.quota('core').remaining == 4999
+
+def test_from_env_merges_and_dedupes_tokens(monkeypatch):
+    monkeypatch.setenv('GITHUB_TOKEN', 'aaaa')
+    monkeypatch.setenv('GITHUB_TOKENS', 'bbbb, aaaa,,cccc')
+    pool = TokenPool.from_env(['dddd'])
+    assert [token.token for token in pool.tokens] == ['dddd', 'aaaa', 'bbbb', 'cccc']
+    assert [token['token'] for token in pool.stats()['tokens']] == ['…dddd', '…aaaa', '…bbbb', '…cccc']